@@ -2,13 +2,18 @@
 from __future__ import annotations
 
 import asyncio
-import json
+from collections.abc import Mapping
+from datetime import timedelta
+from functools import partial
+from http import HTTPStatus
 import logging
 import os
+from time import monotonic
 from types import MappingProxyType
 from typing import Any, Callable
 from urllib.parse import urlencode, urljoin
 
+from aiohttp import hdrs
 from aiohttp.web import Request, Response
 from motioneye_client.client import (
     MotionEyeClient,
@@ -61,9 +66,9 @@ from homeassistant.const import (
     ATTR_NAME,
     CONF_URL,
     CONF_WEBHOOK_ID,
-    HTTP_BAD_REQUEST,
+    CONTENT_TYPE_JSON,
 )
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
 from homeassistant.helpers import (
     config_validation as cv,
@@ -76,13 +81,11 @@ from homeassistant.helpers.dispatcher import (
 )
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.network import get_url
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
+from .coalescer import MotionEyeEventCoalescer
 from .const import (
     ATTR_EVENT_TYPE,
     ATTR_WEBHOOK_ID,
@@ -91,16 +94,31 @@ from .const import (
     CONF_ADMIN_USERNAME,
     CONF_CLIENT,
     CONF_COORDINATOR,
+    CONF_EVENT_COALESCER,
+    CONF_EVENT_DURATION,
+    CONF_EVENT_QUEUE,
+    CONF_EVENT_QUEUE_POLICY,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MOTION_EVENT_WINDOW,
+    CONF_OFFLINE_SETUP,
+    CONF_STREAM_URL_TEMPLATE,
     CONF_SURVEILLANCE_PASSWORD,
     CONF_SURVEILLANCE_USERNAME,
+    CONF_WEBHOOK_FILE_STORED_KEYS,
+    CONF_WEBHOOK_MOTION_DETECTED_KEYS,
+    CONF_WEBHOOK_PROVISIONER,
     CONF_WEBHOOK_SET,
     CONF_WEBHOOK_SET_OVERWRITE,
-    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_EVENT_QUEUE_POLICY,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MOTION_EVENT_WINDOW,
+    DEFAULT_OFFLINE_SETUP,
     DEFAULT_WEBHOOK_SET,
     DEFAULT_WEBHOOK_SET_OVERWRITE,
     DOMAIN,
     EVENT_FILE_STORED,
-    EVENT_FILE_STORED_KEYS,
+    EVENT_FILE_STORED_OPTIONAL_KEYS,
+    EVENT_FILE_STORED_REQUIRED_KEYS,
     EVENT_FILE_URL,
     EVENT_MEDIA_CONTENT_ID,
     EVENT_MOTION_DETECTED,
@@ -110,9 +128,26 @@ from .const import (
     SERVICE_SET_TEXT_OVERLAY,
     SERVICE_SNAPSHOT,
     SIGNAL_CAMERA_ADD,
+    SIGNAL_CAMERA_REMOVE,
+    SIGNAL_CREDENTIALS_UPDATE,
+    SIGNAL_ENTRY_UPDATE,
+    SIGNAL_OPTIONS_UPDATE,
+    STORAGE_KEY,
+    STORAGE_VERSION,
     WEB_HOOK_SENTINEL_KEY,
     WEB_HOOK_SENTINEL_VALUE,
 )
+from .coordinator import MotionEyeUpdateCoordinator
+from .event_queue import MotionEyeEventQueue
+from .provisioner import WEBHOOK_CAMERA_KEYS, MotionEyeWebhookProvisioner
+from .routing import MotionEyeWebhookRoute, get_webhook_routes
+from .scheduler import get_poll_scheduler
+from .session import get_client_session
+
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS = [BINARY_SENSOR_DOMAIN, CAMERA_DOMAIN, SENSOR_DOMAIN, SWITCH_DOMAIN]
@@ -126,6 +161,24 @@ def create_motioneye_client(
     return MotionEyeClient(*args, **kwargs)
 
 
+def _create_entry_motioneye_client(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> MotionEyeClient:
+    """Create a MotionEyeClient for the server and credentials of a config entry.
+
+    Clients share the session of the integration, so replacing one (e.g. when the
+    credentials change) opens no new connections.
+    """
+    return create_motioneye_client(
+        entry.data[CONF_URL],
+        admin_username=entry.data.get(CONF_ADMIN_USERNAME),
+        admin_password=entry.data.get(CONF_ADMIN_PASSWORD),
+        surveillance_username=entry.data.get(CONF_SURVEILLANCE_USERNAME),
+        surveillance_password=entry.data.get(CONF_SURVEILLANCE_PASSWORD),
+        session=get_client_session(hass),
+    )
+
+
 def get_motioneye_device_identifier(
     config_entry_id: str, camera_id: int
 ) -> tuple[str, str]:
@@ -154,22 +207,45 @@ def get_motioneye_entity_unique_id(
     return f"{config_entry_id}_{camera_id}_{entity_type}"
 
 
-def get_camera_from_cameras(
-    camera_id: int, data: dict[str, Any] | None
-) -> dict[str, Any] | None:
-    """Get an individual camera dict from a multiple cameras data response."""
-    for camera in data.get(KEY_CAMERAS, []) if data else []:
-        if camera.get(KEY_ID) == camera_id:
-            val: dict[str, Any] = camera
-            return val
-    return None
-
-
 def is_acceptable_camera(camera: dict[str, Any] | None) -> bool:
     """Determine if a camera dict is acceptable."""
     return bool(camera and KEY_ID in camera and KEY_NAME in camera)
 
 
+# Options applied to a loaded entry without reloading it. The offline setup
+# option only takes effect on the next setup.
+WEBHOOK_OPTIONS = frozenset(
+    {
+        CONF_WEBHOOK_SET,
+        CONF_WEBHOOK_SET_OVERWRITE,
+        CONF_WEBHOOK_MOTION_DETECTED_KEYS,
+        CONF_WEBHOOK_FILE_STORED_KEYS,
+    }
+)
+LIVE_OPTIONS = WEBHOOK_OPTIONS | {
+    CONF_EVENT_DURATION,
+    CONF_EVENT_QUEUE_POLICY,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MOTION_EVENT_WINDOW,
+    CONF_OFFLINE_SETUP,
+    CONF_STREAM_URL_TEMPLATE,
+}
+
+# Maximum size in bytes of a web hook request body. motionEye events are well
+# under a kilobyte, larger requests are rejected before being decoded.
+WEBHOOK_MAX_BODY_SIZE = 16384
+
+# Entry data swapped on a loaded entry without reloading it.
+LIVE_DATA = frozenset(
+    {
+        CONF_ADMIN_USERNAME,
+        CONF_ADMIN_PASSWORD,
+        CONF_SURVEILLANCE_USERNAME,
+        CONF_SURVEILLANCE_PASSWORD,
+    }
+)
+
+
 @callback  # type: ignore[misc]
 def listen_for_new_cameras(
     hass: HomeAssistant,
@@ -189,7 +265,7 @@ def listen_for_new_cameras(
 
 async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     """Set up the motionEye component."""
-    hass.data[DOMAIN] = {}
+    hass.data.setdefault(DOMAIN, {})
     MotionEyeServices(hass).async_register()
     return True
 
@@ -207,18 +283,59 @@ def async_generate_motioneye_webhook(hass: HomeAssistant, webhook_id: str) -> st
 def _add_camera(
     hass: HomeAssistant,
     device_registry: dr.DeviceRegistry,
-    client: MotionEyeClient,
+    entry: ConfigEntry,
+    camera: dict[str, Any],
+    device_identifier: tuple[str, str],
+) -> str:
+    """Add the device of a motionEye camera, returning its device id.
+
+    The entities of the camera are added by the platforms, once signalled with
+    SIGNAL_CAMERA_ADD.
+    """
+    device = device_registry.async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={device_identifier},
+        manufacturer=MOTIONEYE_MANUFACTURER,
+        model=MOTIONEYE_MANUFACTURER,
+        name=camera[KEY_NAME],
+    )
+    device_id: str = device.id
+    return device_id
+
+
+def _get_camera_webhooks_hash(camera: dict[str, Any]) -> int:
+    """Get a hash of the web hook configuration of a motionEye camera."""
+    return hash(tuple(camera.get(key) for key in WEBHOOK_CAMERA_KEYS))
+
+
+@callback  # type: ignore[misc]
+def _set_camera_webhooks(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    provisioner: MotionEyeWebhookProvisioner,
     entry: ConfigEntry,
     camera_id: int,
     camera: dict[str, Any],
     device_identifier: tuple[str, str],
 ) -> None:
-    """Add a motionEye camera to hass."""
+    """Point the web hooks of a motionEye camera at this integration."""
+    overwrite = entry.options.get(
+        CONF_WEBHOOK_SET_OVERWRITE,
+        DEFAULT_WEBHOOK_SET_OVERWRITE,
+    )
 
     def _is_recognized_web_hook(url: str) -> bool:
         """Determine whether this integration set a web hook."""
         return f"{WEB_HOOK_SENTINEL_KEY}={WEB_HOOK_SENTINEL_VALUE}" in url
 
+    def _is_unmanaged_web_hook(key_url: str, camera: dict[str, Any]) -> bool:
+        """Determine whether a web hook was set by the user and must be kept."""
+        return (
+            not overwrite
+            and bool(camera.get(key_url))
+            and not _is_recognized_web_hook(camera[key_url])
+        )
+
     def _set_webhook(
         url: str,
         key_url: str,
@@ -227,14 +344,7 @@ def _add_camera(
         camera: dict[str, Any],
     ) -> bool:
         """Set a web hook."""
-        if (
-            entry.options.get(
-                CONF_WEBHOOK_SET_OVERWRITE,
-                DEFAULT_WEBHOOK_SET_OVERWRITE,
-            )
-            or not camera.get(key_url)
-            or _is_recognized_web_hook(camera[key_url])
-        ) and (
+        if not _is_unmanaged_web_hook(key_url, camera) and (
             not camera.get(key_enabled, False)
             or camera.get(key_method) != KEY_HTTP_METHOD_POST_JSON
             or camera.get(key_url) != url
@@ -269,11 +379,7 @@ def _add_camera(
         )
 
     device = device_registry.async_get_or_create(
-        config_entry_id=entry.entry_id,
-        identifiers={device_identifier},
-        manufacturer=MOTIONEYE_MANUFACTURER,
-        model=MOTIONEYE_MANUFACTURER,
-        name=camera[KEY_NAME],
+        config_entry_id=entry.entry_id, identifiers={device_identifier}
     )
     if entry.options.get(CONF_WEBHOOK_SET, DEFAULT_WEBHOOK_SET):
         url = async_generate_motioneye_webhook(hass, entry.data[CONF_WEBHOOK_ID])
@@ -283,7 +389,9 @@ def _add_camera(
                 device,
                 url,
                 EVENT_MOTION_DETECTED,
-                EVENT_MOTION_DETECTED_KEYS,
+                entry.options.get(
+                    CONF_WEBHOOK_MOTION_DETECTED_KEYS, EVENT_MOTION_DETECTED_KEYS
+                ),
             ),
             KEY_WEB_HOOK_NOTIFICATIONS_URL,
             KEY_WEB_HOOK_NOTIFICATIONS_HTTP_METHOD,
@@ -294,47 +402,58 @@ def _add_camera(
                 device,
                 url,
                 EVENT_FILE_STORED,
-                EVENT_FILE_STORED_KEYS,
+                [
+                    *EVENT_FILE_STORED_REQUIRED_KEYS,
+                    *entry.options.get(
+                        CONF_WEBHOOK_FILE_STORED_KEYS, EVENT_FILE_STORED_OPTIONAL_KEYS
+                    ),
+                ],
             ),
             KEY_WEB_HOOK_STORAGE_URL,
             KEY_WEB_HOOK_STORAGE_HTTP_METHOD,
             KEY_WEB_HOOK_STORAGE_ENABLED,
             camera,
         ):
-            hass.async_create_task(client.async_set_camera(camera_id, camera))
+            provisioner.async_queue_camera(camera_id, camera)
+        elif _is_unmanaged_web_hook(
+            KEY_WEB_HOOK_NOTIFICATIONS_URL, camera
+        ) or _is_unmanaged_web_hook(KEY_WEB_HOOK_STORAGE_URL, camera):
+            provisioner.async_set_unmanaged(camera_id)
+        else:
+            provisioner.async_set_provisioned(camera_id)
 
-    async_dispatcher_send(
-        hass,
-        SIGNAL_CAMERA_ADD.format(entry.entry_id),
-        camera,
-    )
+
+def _get_changed_keys(old: Mapping[str, Any], new: Mapping[str, Any]) -> set[str]:
+    """Get the keys whose values differ between two mappings."""
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
 
 
 async def _async_entry_updated(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
     """Handle entry updates."""
-    await hass.config_entries.async_reload(config_entry.entry_id)
+    # Update listeners are only weakly referenced, the update is applied by the
+    # entry itself.
+    async_dispatcher_send(hass, SIGNAL_ENTRY_UPDATE.format(config_entry.entry_id))
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up motionEye from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
-    client = create_motioneye_client(
-        entry.data[CONF_URL],
-        admin_username=entry.data.get(CONF_ADMIN_USERNAME),
-        admin_password=entry.data.get(CONF_ADMIN_PASSWORD),
-        surveillance_username=entry.data.get(CONF_SURVEILLANCE_USERNAME),
-        surveillance_password=entry.data.get(CONF_SURVEILLANCE_PASSWORD),
-    )
+    client = _create_entry_motioneye_client(hass, entry)
 
-    try:
-        await client.async_client_login()
-    except MotionEyeClientInvalidAuthError as exc:
-        await client.async_client_close()
-        raise ConfigEntryAuthFailed from exc
-    except MotionEyeClientError as exc:
-        await client.async_client_close()
-        raise ConfigEntryNotReady from exc
+    # In offline setup, login happens in the background as part of the first
+    # refresh (retried like any other refresh), so an unreachable server does not
+    # hold back setup.
+    offline_setup = entry.options.get(CONF_OFFLINE_SETUP, DEFAULT_OFFLINE_SETUP)
+    if not offline_setup:
+        try:
+            await client.async_client_login()
+        except MotionEyeClientInvalidAuthError as exc:
+            await client.async_client_close()
+            raise ConfigEntryAuthFailed from exc
+        except MotionEyeClientError as exc:
+            await client.async_client_close()
+            raise ConfigEntryNotReady from exc
 
     # Ensure every loaded entry has a registered webhook id.
     if CONF_WEBHOOK_ID not in entry.data:
@@ -345,68 +464,253 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass, DOMAIN, "motionEye", entry.data[CONF_WEBHOOK_ID], handle_webhook
     )
 
-    @callback  # type: ignore[misc]
-    async def async_update_data() -> dict[str, Any] | None:
-        try:
-            return await client.async_get_cameras()
-        except MotionEyeClientError as exc:
-            raise UpdateFailed("Error communicating with API") from exc
-
-    coordinator = DataUpdateCoordinator(
+    coordinator = MotionEyeUpdateCoordinator(
+        hass,
+        entry.entry_id,
+        client,
+        get_poll_scheduler(hass),
+        max_update_interval=timedelta(
+            seconds=entry.options.get(CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL)
+        ),
+        logged_in=not offline_setup,
+    )
+    entry.async_on_unload(
+        coordinator.scheduler.async_add_coordinator(
+            coordinator, coordinator.async_reschedule_refresh
+        )
+    )
+    provisioner = MotionEyeWebhookProvisioner(
+        hass, client, coordinator.circuit_breaker, coordinator.task_tracker
+    )
+    coalescer = MotionEyeEventCoalescer(
         hass,
-        _LOGGER,
-        name=DOMAIN,
-        update_method=async_update_data,
-        update_interval=DEFAULT_SCAN_INTERVAL,
+        entry.options.get(CONF_MOTION_EVENT_WINDOW, DEFAULT_MOTION_EVENT_WINDOW),
+    )
+    event_queue = MotionEyeEventQueue(
+        hass,
+        entry.options.get(CONF_EVENT_QUEUE_POLICY, DEFAULT_EVENT_QUEUE_POLICY),
     )
     hass.data[DOMAIN][entry.entry_id] = {
         CONF_CLIENT: client,
         CONF_COORDINATOR: coordinator,
+        CONF_EVENT_COALESCER: coalescer,
+        CONF_EVENT_QUEUE: event_queue,
+        CONF_WEBHOOK_PROVISIONER: provisioner,
     }
 
+    # Cameras from the last run are added right away, and reconciled once the
+    # cameras are fetched from motionEye.
+    await coordinator.async_load_cache()
+
     current_cameras: set[tuple[str, str]] = set()
+    # The hash of the web hook configuration of each camera once last set.
+    webhook_hashes: dict[tuple[str, str], int] = {}
     device_registry = await dr.async_get_registry(hass)
 
+    # The devices of this entry by identifier, so that cameras are reconciled
+    # without scanning the device registry on every refresh.
+    camera_devices: dict[tuple[str, str], str] = {
+        identifier: device_entry.id
+        for device_entry in dr.async_entries_for_config_entry(
+            device_registry, entry.entry_id
+        )
+        for identifier in device_entry.identifiers
+    }
+    processed_data: dict[str, Any] | None = None
+    webhook_routes = get_webhook_routes(hass)
+
+    @callback  # type: ignore[misc]
+    def _async_device_registry_updated(event: Event) -> None:
+        """Index devices added to this config entry, and update their routes."""
+        device_id = event.data["device_id"]
+        device_entry = (
+            device_registry.async_get(device_id)
+            if event.data["action"] != "remove"
+            else None
+        )
+        if device_entry and entry.entry_id in device_entry.config_entries:
+            for identifier in device_entry.identifiers:
+                camera_devices[identifier] = device_entry.id
+
+        route = webhook_routes.get(device_id)
+        if route is None or route.config_entry_id != entry.entry_id:
+            return
+        if device_entry and (
+            get_motioneye_device_identifier(entry.entry_id, route.camera_id)
+            in device_entry.identifiers
+        ):
+            webhook_routes[device_id] = route._replace(device_name=device_entry.name)
+        else:
+            del webhook_routes[device_id]
+
+    @callback  # type: ignore[misc]
+    def _async_remove_webhook_routes() -> None:
+        """Remove the web hook routes of this config entry."""
+        for device_id, route in list(webhook_routes.items()):
+            if route.config_entry_id == entry.entry_id:
+                del webhook_routes[device_id]
+
+    entry.async_on_unload(_async_remove_webhook_routes)
+
+    entry.async_on_unload(
+        hass.bus.async_listen(
+            dr.EVENT_DEVICE_REGISTRY_UPDATED, _async_device_registry_updated
+        )
+    )
+
     @callback  # type: ignore[misc]
     def _async_process_motioneye_cameras() -> None:
         """Process motionEye camera additions and removals."""
+        nonlocal processed_data
         inbound_camera: set[tuple[str, str]] = set()
-        if coordinator.data is None or KEY_CAMERAS not in coordinator.data:
+        new_cameras: list[dict[str, Any]] = []
+        if (
+            coordinator.data is None
+            or KEY_CAMERAS not in coordinator.data
+            or coordinator.data is processed_data
+        ):
             return
 
+        all_acceptable = True
         for camera in coordinator.data[KEY_CAMERAS]:
             if not is_acceptable_camera(camera):
-                return
+                all_acceptable = False
+                break
             camera_id = camera[KEY_ID]
             device_identifier = get_motioneye_device_identifier(
                 entry.entry_id, camera_id
             )
             inbound_camera.add(device_identifier)
 
-            if device_identifier in current_cameras:
-                continue
-            current_cameras.add(device_identifier)
-            _add_camera(
+            if device_identifier not in current_cameras:
+                current_cameras.add(device_identifier)
+                camera_devices[device_identifier] = _add_camera(
+                    hass, device_registry, entry, camera, device_identifier
+                )
+                new_cameras.append(camera)
+
+            # The route of the camera is rebuilt from every refresh, so that web hook
+            # events see its current root directory.
+            device_id = camera_devices[device_identifier]
+            device_entry = device_registry.async_get(device_id)
+            if device_entry:
+                webhook_routes[device_id] = MotionEyeWebhookRoute(
+                    config_entry_id=entry.entry_id,
+                    device_name=device_entry.name,
+                    client=client,
+                    coordinator=coordinator,
+                    coalescer=coalescer,
+                    event_queue=event_queue,
+                    camera_id=camera_id,
+                    root_directory=camera.get(KEY_ROOT_DIRECTORY),
+                )
+
+            # Cached cameras are redacted, web hooks are only set from (and written
+            # back with) the complete cameras fetched from motionEye. They are
+            # audited on every refresh, but only set again once motionEye reports
+            # a different configuration than last time (e.g. edited in the
+            # motionEye UI, or written by the provisioner).
+            webhooks_hash = _get_camera_webhooks_hash(camera)
+            if (
+                not coordinator.data_is_cached
+                and webhook_hashes.get(device_identifier) != webhooks_hash
+            ):
+                _set_camera_webhooks(
+                    hass,
+                    device_registry,
+                    provisioner,
+                    entry,
+                    camera_id,
+                    dict(camera),
+                    device_identifier,
+                )
+                webhook_hashes[device_identifier] = webhooks_hash
+
+        # All new cameras are signalled at once, for the platforms to add their
+        # entities in a single batch.
+        if new_cameras:
+            async_dispatcher_send(
+                hass, SIGNAL_CAMERA_ADD.format(entry.entry_id), new_cameras
+            )
+
+        # Cameras are only removed once confirmed by a complete list of cameras
+        # from motionEye.
+        if coordinator.data_is_cached or not all_acceptable:
+            return
+        processed_data = coordinator.data
+
+        # Remove the entities and devices of cameras that are no longer in the
+        # list of motionEye cameras. The entities are signalled to remove
+        # themselves directly, rather than through the device registry.
+        if camera_devices.keys() == inbound_camera:
+            return
+        for identifier in camera_devices.keys() - inbound_camera:
+            device_id = camera_devices.pop(identifier)
+            webhook_routes.pop(device_id, None)
+            current_cameras.discard(identifier)
+            webhook_hashes.pop(identifier, None)
+            async_dispatcher_send(hass, SIGNAL_CAMERA_REMOVE.format(identifier[1]))
+            device_entry = device_registry.async_get(device_id)
+            if device_entry and not device_entry.identifiers & inbound_camera:
+                device_registry.async_remove_device(device_id)
+
+    # The entry as set up, to tell which updates require a reload.
+    applied_data = dict(entry.data)
+    applied_options = dict(entry.options)
+
+    async def _async_apply_entry_update() -> None:
+        """Apply updated options in place, reloading the entry only if needed."""
+        nonlocal applied_data, applied_options, client, processed_data
+        changed_data = _get_changed_keys(applied_data, entry.data)
+        changed_options = _get_changed_keys(applied_options, entry.options)
+        if changed_data - LIVE_DATA or changed_options - LIVE_OPTIONS:
+            await hass.config_entries.async_reload(entry.entry_id)
+            return
+        applied_data = dict(entry.data)
+        applied_options = dict(entry.options)
+
+        if changed_data:
+            # Rotated credentials get a new client, swapped in wherever the old one
+            # is used. The old client shares the session, so has nothing to close.
+            client = _create_entry_motioneye_client(hass, entry)
+            hass.data[DOMAIN][entry.entry_id][CONF_CLIENT] = client
+            coordinator.async_set_client(client)
+            provisioner.async_set_client(client)
+            for device_id, route in webhook_routes.items():
+                if route.config_entry_id == entry.entry_id:
+                    webhook_routes[device_id] = route._replace(client=client)
+            async_dispatcher_send(
                 hass,
-                device_registry,
+                SIGNAL_CREDENTIALS_UPDATE.format(entry.entry_id),
                 client,
-                entry,
-                camera_id,
-                camera,
-                device_identifier,
+                entry.data,
             )
-
-        # Ensure every device associated with this config entry is still in the
-        # list of motionEye cameras, otherwise remove the device (and thus
-        # entities).
-        for device_entry in dr.async_entries_for_config_entry(
-            device_registry, entry.entry_id
-        ):
-            for identifier in device_entry.identifiers:
-                if identifier in inbound_camera:
-                    break
-            else:
-                device_registry.async_remove_device(device_entry.id)
+            # Requests rejected with the old credentials must not hold back the
+            # refresh with the new ones.
+            coordinator.circuit_breaker.reset()
+            await coordinator.async_request_refresh()
+
+        coordinator.async_set_max_update_interval(
+            timedelta(
+                seconds=entry.options.get(
+                    CONF_MAX_SCAN_INTERVAL, DEFAULT_MAX_SCAN_INTERVAL
+                )
+            )
+        )
+        coalescer.async_set_window(
+            entry.options.get(CONF_MOTION_EVENT_WINDOW, DEFAULT_MOTION_EVENT_WINDOW)
+        )
+        event_queue.async_set_policy(
+            entry.options.get(CONF_EVENT_QUEUE_POLICY, DEFAULT_EVENT_QUEUE_POLICY)
+        )
+        async_dispatcher_send(
+            hass, SIGNAL_OPTIONS_UPDATE.format(entry.entry_id), entry.options
+        )
+        if changed_options & WEBHOOK_OPTIONS:
+            # Audit the web hooks of every camera against the new options.
+            webhook_hashes.clear()
+            processed_data = None
+            _async_process_motioneye_cameras()
 
     async def setup_then_listen() -> None:
         await asyncio.gather(
@@ -418,7 +722,15 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry.async_on_unload(
             coordinator.async_add_listener(_async_process_motioneye_cameras)
         )
+        _async_process_motioneye_cameras()
         await coordinator.async_refresh()
+        entry.async_on_unload(
+            async_dispatcher_connect(
+                hass,
+                SIGNAL_ENTRY_UPDATE.format(entry.entry_id),
+                _async_apply_entry_update,
+            )
+        )
         entry.async_on_unload(entry.add_update_listener(_async_entry_updated))
 
     hass.async_create_task(setup_then_listen())
@@ -432,41 +744,116 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = bool(await hass.config_entries.async_unload_platforms(entry, PLATFORMS))
     if unload_ok:
         config_data = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = config_data[CONF_COORDINATOR]
+        await config_data[CONF_WEBHOOK_PROVISIONER].async_shutdown()
+        # Queued events are fired before the summaries of coalesced events.
+        await config_data[CONF_EVENT_QUEUE].async_shutdown()
+        config_data[CONF_EVENT_COALESCER].async_shutdown()
+        # Let in-flight writes finish before the client is closed, rather than
+        # leaving cameras half-configured.
+        await coordinator.task_tracker.async_drain()
+        await coordinator.async_shutdown()
         await config_data[CONF_CLIENT].async_client_close()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached cameras of a removed config entry."""
+    await Store(
+        hass, STORAGE_VERSION, STORAGE_KEY.format(entry.entry_id)
+    ).async_remove()
+
+
 async def handle_webhook(
     hass: HomeAssistant, webhook_id: str, request: Request
 ) -> None | Response:
     """Handle webhook callback."""
 
+    content_type = request.headers.get(hdrs.CONTENT_TYPE, "").partition(";")[0]
+    if content_type.strip().lower() != CONTENT_TYPE_JSON:
+        return Response(
+            text=f"Unsupported content type: {content_type}",
+            status=HTTPStatus.UNSUPPORTED_MEDIA_TYPE,
+        )
+
+    body = await _async_read_webhook_body(request)
+    if body is None:
+        return Response(
+            text="Request too large",
+            status=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        )
+
+    start = monotonic()
     try:
-        data = await request.json()
-    except (json.decoder.JSONDecodeError, UnicodeDecodeError):
+        data = json_loads(body)
+    except ValueError:
+        data = None
+    _LOGGER.debug(
+        "Decoded web hook request of %i bytes in %.3f ms",
+        len(body),
+        (monotonic() - start) * 1000,
+    )
+    if not isinstance(data, dict):
         return Response(
             text="Could not decode request",
-            status=HTTP_BAD_REQUEST,
+            status=HTTPStatus.BAD_REQUEST,
         )
 
     for key in (ATTR_DEVICE_ID, ATTR_EVENT_TYPE):
         if key not in data:
             return Response(
                 text=f"Missing webhook parameter: {key}",
-                status=HTTP_BAD_REQUEST,
+                status=HTTPStatus.BAD_REQUEST,
             )
 
-    event_type = data[ATTR_EVENT_TYPE]
-    device_registry = dr.async_get(hass)
     device_id = data[ATTR_DEVICE_ID]
-    device = device_registry.async_get(device_id)
 
-    if not device:
+    # Events of the cameras of loaded config entries are routed with a single
+    # lookup, any other device only gets a plain event.
+    route = get_webhook_routes(hass).get(device_id)
+    if route is None:
+        device = dr.async_get(hass).async_get(device_id)
+        if not device:
+            return Response(
+                text=f"Device not found: {device_id}",
+                status=HTTPStatus.BAD_REQUEST,
+            )
+        hass.bus.async_fire(
+            f"{DOMAIN}.{data[ATTR_EVENT_TYPE]}",
+            {
+                ATTR_DEVICE_ID: device_id,
+                ATTR_NAME: device.name,
+                ATTR_WEBHOOK_ID: webhook_id,
+                **data,
+            },
+        )
+        return None
+
+    # Camera events are processed once motionEye has been answered, as motionEye
+    # waits for the response before going on.
+    if not route.event_queue.async_put(
+        partial(_async_process_camera_event, webhook_id, device_id, route, data)
+    ):
         return Response(
-            text=f"Device not found: {device_id}",
-            status=HTTP_BAD_REQUEST,
+            text="Too many events queued",
+            status=HTTPStatus.SERVICE_UNAVAILABLE,
         )
+    return None
+
+
+@callback  # type: ignore[misc]
+def _async_process_camera_event(
+    webhook_id: str,
+    device_id: str,
+    route: MotionEyeWebhookRoute,
+    data: dict[str, Any],
+) -> None:
+    """Enrich and fire a web hook event of a camera."""
+    # A stored file changes the disk usage of the camera, so refresh it ahead of
+    # the next poll. Motion changes nothing that is polled.
+    if data[ATTR_EVENT_TYPE] == EVENT_FILE_STORED:
+        route.coordinator.async_mark_camera_dirty(route.camera_id)
 
     if KEY_WEB_HOOK_CS_FILE_PATH in data and KEY_WEB_HOOK_CS_FILE_TYPE in data:
         try:
@@ -476,52 +863,53 @@ async def handle_webhook(
         else:
             data.update(
                 _get_media_event_data(
-                    hass,
-                    device,
+                    device_id,
+                    route,
                     data[KEY_WEB_HOOK_CS_FILE_PATH],
                     event_file_type,
                 )
             )
 
-    hass.bus.async_fire(
-        f"{DOMAIN}.{event_type}",
+    # Repeated motion events of a camera may be folded into a summary.
+    route.coalescer.async_fire_event(
+        device_id,
+        data[ATTR_EVENT_TYPE],
         {
-            ATTR_DEVICE_ID: device.id,
-            ATTR_NAME: device.name,
+            ATTR_DEVICE_ID: device_id,
+            ATTR_NAME: route.device_name,
             ATTR_WEBHOOK_ID: webhook_id,
             **data,
         },
     )
+
+
+async def _async_read_webhook_body(request: Request) -> bytes | None:
+    """Read the body of a web hook request, or None if it is too large."""
+    content_length = request.headers.get(hdrs.CONTENT_LENGTH, "")
+    if content_length.isdigit() and int(content_length) > WEBHOOK_MAX_BODY_SIZE:
+        return None
+
+    # The body is read no further than the size limit, whatever its declared length.
+    body = bytearray()
+    while len(body) <= WEBHOOK_MAX_BODY_SIZE:
+        chunk = await request.content.read(WEBHOOK_MAX_BODY_SIZE + 1 - len(body))
+        if not chunk:
+            return bytes(body)
+        body.extend(chunk)
     return None
 
 
 def _get_media_event_data(
-    hass: HomeAssistant,
-    device: dr.DeviceEntry,
+    device_id: str,
+    route: MotionEyeWebhookRoute,
     event_file_path: str,
     event_file_type: int,
 ) -> dict[str, str]:
-    config_entry_id = next(iter(device.config_entries), None)
-    client = hass.data[DOMAIN].get(config_entry_id, {}).get(CONF_CLIENT)
-    coordinator = hass.data[DOMAIN].get(config_entry_id, {}).get(CONF_COORDINATOR)
-
-    if not coordinator or not client:
-        return {}
-
-    for identifier in device.identifiers:
-        data = split_motioneye_device_identifier(identifier)
-        if data is not None:
-            camera_id = data[2]
-            camera = get_camera_from_cameras(camera_id, coordinator.data)
-            break
-    else:
-        return {}
-
-    root_directory = camera.get(KEY_ROOT_DIRECTORY) if camera else None
-    if root_directory is None:
+    if route.root_directory is None:
         return {}
 
-    kind = "images" if client.is_file_type_image(event_file_type) else "movies"
+    root_directory = route.root_directory
+    kind = "images" if route.client.is_file_type_image(event_file_type) else "movies"
 
     # The file_path in the event is the full local filesystem path to the
     # media. To convert that to the media path that motionEye will
@@ -529,11 +917,11 @@ def _get_media_event_data(
     if os.path.commonprefix([root_directory, event_file_path]) == root_directory:
         file_path = "/" + os.path.relpath(event_file_path, root_directory)
         output = {
-            EVENT_MEDIA_CONTENT_ID: f"{URI_SCHEME}{DOMAIN}/{config_entry_id}#{device.id}#{kind}#{file_path}"
+            EVENT_MEDIA_CONTENT_ID: f"{URI_SCHEME}{DOMAIN}/{route.config_entry_id}#{device_id}#{kind}#{file_path}"
         }
         url = get_media_url(
-            client,
-            camera_id,
+            route.client,
+            route.camera_id,
             file_path,
             kind == "images",
         )
@@ -632,10 +1020,10 @@ class MotionEyeServices:
             ),
         )
 
-    async def _get_clients_and_camera_indices_from_request(
+    async def _get_cameras_from_request(
         self, service: ServiceCall
-    ) -> set[tuple[MotionEyeClient, int]]:
-        """Get a tuple of client and camera indices from a service request."""
+    ) -> set[tuple[MotionEyeClient, MotionEyeUpdateCoordinator, int]]:
+        """Get tuples of client, coordinator and camera id from a service request."""
         entity_registry = await er.async_get_registry(self._hass)
         device_registry = await dr.async_get_registry(self._hass)
         devices_ids = service.data.get(ATTR_DEVICE_ID) or []
@@ -645,7 +1033,7 @@ class MotionEyeServices:
             if entry and entry.device_id:
                 devices_ids.append(entry.device_id)
 
-        output: set[tuple[MotionEyeClient, int]] = set()
+        output: set[tuple[MotionEyeClient, MotionEyeUpdateCoordinator, int]] = set()
         for device_id in devices_ids:
             entry = device_registry.async_get(device_id)
             if not entry:
@@ -653,50 +1041,70 @@ class MotionEyeServices:
 
             # A device will always have at least 1 config_entry.
             config_entry_id = next(iter(entry.config_entries), None)
-            client: MotionEyeClient = (
-                self._hass.data[DOMAIN].get(config_entry_id, {}).get(CONF_CLIENT)
-            )
+            config_data = self._hass.data[DOMAIN].get(config_entry_id, {})
+            client: MotionEyeClient = config_data.get(CONF_CLIENT)
+            coordinator: MotionEyeUpdateCoordinator = config_data.get(CONF_COORDINATOR)
 
             for identifier in entry.identifiers:
                 data = split_motioneye_device_identifier(identifier)
                 if data is not None:
-                    output.add((client, data[2]))
+                    output.add((client, coordinator, data[2]))
                 break
         return output
 
     async def _async_set_text_overlay(self, service: ServiceCall) -> None:
         """Set camera text overlay."""
-        cameras = await self._get_clients_and_camera_indices_from_request(service)
-        for client, camera_id in cameras or {}:
-            camera = await client.async_get_camera(camera_id)
-            if not camera:
-                continue
+        cameras = await self._get_cameras_from_request(service)
+        for client, coordinator, camera_id in cameras or {}:
+            if await coordinator.task_tracker.async_run(
+                self._async_write_text_overlay(service, client, coordinator, camera_id),
+                f"set text overlay of camera {camera_id}",
+            ):
+                coordinator.async_reset_update_interval()
+                await coordinator.async_request_refresh()
+
+    async def _async_write_text_overlay(
+        self,
+        service: ServiceCall,
+        client: MotionEyeClient,
+        coordinator: MotionEyeUpdateCoordinator,
+        camera_id: int,
+    ) -> bool:
+        """Write the text overlay to a camera, returning whether it was written."""
+        camera = await coordinator.circuit_breaker.async_call(
+            client.async_get_camera, camera_id
+        )
+        if not camera:
+            return False
 
-            for key in (KEY_TEXT_OVERLAY_LEFT, KEY_TEXT_OVERLAY_RIGHT):
-                if service.data.get(key):
-                    camera[key] = service.data[key]
+        for key in (KEY_TEXT_OVERLAY_LEFT, KEY_TEXT_OVERLAY_RIGHT):
+            if service.data.get(key):
+                camera[key] = service.data[key]
 
-            for key in (
-                KEY_TEXT_OVERLAY_CUSTOM_TEXT_LEFT,
-                KEY_TEXT_OVERLAY_CUSTOM_TEXT_RIGHT,
-            ):
-                if service.data.get(key):
-                    camera[key] = (
-                        service.data[key].encode("unicode_escape").decode("UTF-8")
-                    )
+        for key in (
+            KEY_TEXT_OVERLAY_CUSTOM_TEXT_LEFT,
+            KEY_TEXT_OVERLAY_CUSTOM_TEXT_RIGHT,
+        ):
+            if service.data.get(key):
+                camera[key] = service.data[key].encode("unicode_escape").decode("UTF-8")
 
-            await client.async_set_camera(camera_id, camera)
+        await coordinator.circuit_breaker.async_call(
+            client.async_set_camera, camera_id, camera
+        )
+        return True
 
     async def _async_action(self, service: ServiceCall) -> None:
         """Perform a motionEye action."""
-        cameras = await self._get_clients_and_camera_indices_from_request(service)
-        for client, camera_id in cameras or {}:
-            await client.async_action(
-                camera_id,
-                (
-                    self.SERVICE_TO_ACTION.get(service.service)
-                    or service.data[CONF_ACTION]
+        cameras = await self._get_cameras_from_request(service)
+        action = (
+            self.SERVICE_TO_ACTION.get(service.service) or service.data[CONF_ACTION]
+        )
+        for client, coordinator, camera_id in cameras or {}:
+            await coordinator.task_tracker.async_run(
+                coordinator.circuit_breaker.async_call(
+                    client.async_action, camera_id, action
                 ),
+                f"action {action} of camera {camera_id}",
             )
 
 
@@ -709,10 +1117,11 @@ class MotionEyeEntity(CoordinatorEntity):  # type: ignore[misc]
         type_name: str,
         camera: dict[str, Any],
         client: MotionEyeClient,
-        coordinator: DataUpdateCoordinator,
+        coordinator: MotionEyeUpdateCoordinator,
         options: MappingProxyType[str, Any],
     ) -> None:
         """Initialize a motionEye entity."""
+        self._config_entry_id = config_entry_id
         self._camera_id = camera[KEY_ID]
         self._device_identifier = get_motioneye_device_identifier(
             config_entry_id, self._camera_id
@@ -737,8 +1146,72 @@ class MotionEyeEntity(CoordinatorEntity):  # type: ignore[misc]
         """Return the device information."""
         return {"identifiers": {self._device_identifier}}
 
+    async def async_added_to_hass(self) -> None:
+        """Listen for changes to this camera when added to hass."""
+        # Deliberately skip the CoordinatorEntity listener, which would be woken on
+        # every refresh, in favor of a listener for changes to this camera only.
+        await super(CoordinatorEntity, self).async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_camera_listener(
+                self._camera_id, self._handle_camera_update
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_CAMERA_REMOVE.format(self._device_identifier[1]),
+                self._handle_camera_remove,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_OPTIONS_UPDATE.format(self._config_entry_id),
+                self._handle_options_update,
+            )
+        )
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_CREDENTIALS_UPDATE.format(self._config_entry_id),
+                self._handle_credentials_update,
+            )
+        )
+
+    @callback  # type: ignore[misc]
+    def _handle_options_update(self, options: MappingProxyType[str, Any]) -> None:
+        """Handle updated options of the config entry."""
+        self._options = options
+
+    @callback  # type: ignore[misc]
+    def _handle_credentials_update(
+        self, client: MotionEyeClient, data: MappingProxyType[str, Any]
+    ) -> None:
+        """Handle the client replaced for rotated credentials."""
+        self._client = client
+
+    @callback  # type: ignore[misc]
+    def _handle_camera_remove(self) -> None:
+        """Remove this entity, as its camera was removed from motionEye."""
+        self.hass.async_create_task(self.async_remove(force_remove=True))
+
+    @callback  # type: ignore[misc]
+    def _is_camera_update_relevant(self, changed_keys: set[str]) -> bool:
+        """Determine whether changes to the given camera keys affect this entity."""
+        return True
+
+    @callback  # type: ignore[misc]
+    def _handle_camera_update(self, changed_keys: set[str] | None) -> None:
+        """Handle a change to this camera."""
+        if changed_keys is not None and not self._is_camera_update_relevant(
+            changed_keys
+        ):
+            self._camera = self.coordinator.get_camera(self._camera_id)
+            return
+        self._handle_coordinator_update()
+
     @callback  # type: ignore[misc]
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        self._camera = get_camera_from_cameras(self._camera_id, self.coordinator.data)
+        self._camera = self.coordinator.get_camera(self._camera_id)
         super()._handle_coordinator_update()
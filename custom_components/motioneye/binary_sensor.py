@@ -14,11 +14,10 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_DEVICE_ID
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers import device_registry as dr
-from homeassistant.helpers.event import Event, async_call_later
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.event import async_call_later
 
 from . import MotionEyeEntity, listen_for_new_cameras
 from .const import (
@@ -29,9 +28,11 @@ from .const import (
     DOMAIN,
     EVENT_FILE_STORED,
     EVENT_MOTION_DETECTED,
+    SIGNAL_CAMERA_EVENT,
     TYPE_MOTIONEYE_FILE_STORED_BINARY_SENSOR,
     TYPE_MOTIONEYE_MOTION_BINARY_SENSOR,
 )
+from .coordinator import MotionEyeUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -43,21 +44,24 @@ async def async_setup_entry(
     entry_data = hass.data[DOMAIN][entry.entry_id]
 
     @callback  # type: ignore[misc]
-    def camera_add(camera: dict[str, Any]) -> None:
-        """Add a new motionEye camera."""
-        args = [
-            entry.entry_id,
-            camera,
-            entry_data[CONF_CLIENT],
-            entry_data[CONF_COORDINATOR],
-            entry.options,
-        ]
-        async_add_entities(
-            [
-                MotionEyeMotionBinarySensor(*args),
-                MotionEyeFileStoredBinarySensor(*args),
+    def camera_add(cameras: list[dict[str, Any]]) -> None:
+        """Add new motionEye cameras."""
+        entities: list[MotionEyeEventBinarySensor] = []
+        for camera in cameras:
+            args = [
+                entry.entry_id,
+                camera,
+                entry_data[CONF_CLIENT],
+                entry_data[CONF_COORDINATOR],
+                entry.options,
             ]
-        )
+            entities.extend(
+                [
+                    MotionEyeMotionBinarySensor(*args),
+                    MotionEyeFileStoredBinarySensor(*args),
+                ]
+            )
+        async_add_entities(entities)
 
     listen_for_new_cameras(hass, entry, camera_add)
 
@@ -71,7 +75,7 @@ class MotionEyeEventBinarySensor(MotionEyeEntity, BinarySensorEntity):  # type:
         type_name: str,
         camera: dict[str, Any],
         client: MotionEyeClient,
-        coordinator: DataUpdateCoordinator,
+        coordinator: MotionEyeUpdateCoordinator,
         options: MappingProxyType[str, Any],
         event: str,
         friendly_name: str,
@@ -91,6 +95,12 @@ class MotionEyeEventBinarySensor(MotionEyeEntity, BinarySensorEntity):  # type:
         camera_name = self._camera[KEY_NAME] if self._camera else ""
         return f"{camera_name} {self._friendly_name}"
 
+    @callback  # type: ignore[misc]
+    def _is_camera_update_relevant(self, changed_keys: set[str]) -> bool:
+        """Determine whether changes to the given camera keys affect this sensor."""
+        # The state is driven by events, only the name derives from the camera.
+        return KEY_NAME in changed_keys
+
     @property
     def is_on(self) -> bool:
         """Return true if the binary sensor is on."""
@@ -109,35 +119,37 @@ class MotionEyeEventBinarySensor(MotionEyeEntity, BinarySensorEntity):  # type:
         await super().async_will_remove_from_hass()
 
     async def async_added_to_hass(self) -> None:
-        """Register event listeners when added to hass."""
+        """Listen for the events of this camera when added to hass."""
+        device = dr.async_get(self.hass).async_get_device({self._device_identifier})
+        if device:
+            self.async_on_remove(
+                async_dispatcher_connect(
+                    self.hass,
+                    SIGNAL_CAMERA_EVENT.format(self._event, device.id),
+                    self._handle_event,
+                )
+            )
+        await super().async_added_to_hass()
 
-        device_registry = dr.async_get(self.hass)
+    @callback  # type: ignore[misc]
+    def _handle_event(self, data: dict[str, Any]) -> None:
+        """Handle an event of this camera."""
 
         @callback  # type: ignore[misc]
-        def handle_event(event: Event) -> None:
-            """Handle an event."""
-
-            @callback  # type: ignore[misc]
-            def turn_off(_: datetime.datetime) -> None:
-                """Turn the state off."""
-                self._state = False
-                self.async_write_ha_state()
-                self._timer_unsub = None
-
-            if CONF_DEVICE_ID in event.data:
-                device = device_registry.async_get(event.data[CONF_DEVICE_ID])
-                if device and self._device_identifier in device.identifiers:
-                    self._cancel_timer()
-                    self._timer_unsub = async_call_later(
-                        self.hass,
-                        self._options.get(CONF_EVENT_DURATION, DEFAULT_EVENT_DURATION),
-                        turn_off,
-                    )
-                    self._state = True
-                    self.async_write_ha_state()
-
-        self.hass.bus.async_listen(f"{DOMAIN}.{self._event}", handle_event)
-        await super().async_added_to_hass()
+        def turn_off(_: datetime.datetime) -> None:
+            """Turn the state off."""
+            self._state = False
+            self.async_write_ha_state()
+            self._timer_unsub = None
+
+        self._cancel_timer()
+        self._timer_unsub = async_call_later(
+            self.hass,
+            self._options.get(CONF_EVENT_DURATION, DEFAULT_EVENT_DURATION),
+            turn_off,
+        )
+        self._state = True
+        self.async_write_ha_state()
 
 
 class MotionEyeMotionBinarySensor(MotionEyeEventBinarySensor):
@@ -148,7 +160,7 @@ class MotionEyeMotionBinarySensor(MotionEyeEventBinarySensor):
         config_entry_id: str,
         camera: dict[str, Any],
         client: MotionEyeClient,
-        coordinator: DataUpdateCoordinator,
+        coordinator: MotionEyeUpdateCoordinator,
         options: MappingProxyType[str, Any],
     ) -> None:
         """Initialize the binary sensor."""
@@ -177,7 +189,7 @@ class MotionEyeFileStoredBinarySensor(MotionEyeEventBinarySensor):
         config_entry_id: str,
         camera: dict[str, Any],
         client: MotionEyeClient,
-        coordinator: DataUpdateCoordinator,
+        coordinator: MotionEyeUpdateCoordinator,
         options: MappingProxyType[str, Any],
     ) -> None:
         """Initialize the binary sensor."""
@@ -0,0 +1,122 @@
+"""Circuit breaker for requests to a motionEye server."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable
+import random
+from time import monotonic
+from typing import Any, Callable, TypeVar
+
+from motioneye_client.client import MotionEyeClientConnectionError
+
+# Consecutive failures after which the circuit opens.
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 3
+
+# Seconds the circuit stays open after the first and any later failed probe,
+# before jitter is applied.
+CIRCUIT_BREAKER_BASE_BACKOFF = 30
+CIRCUIT_BREAKER_MAX_BACKOFF = 600
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+T = TypeVar("T")
+
+
+class MotionEyeCircuitOpenError(MotionEyeClientConnectionError):
+    """The motionEye server is considered unreachable."""
+
+
+class MotionEyeCircuitBreaker:
+    """Fail fast while a motionEye server is unreachable.
+
+    The circuit opens after repeated connection errors or timeouts, and requests
+    fail immediately with MotionEyeCircuitOpenError until the backoff expires. A
+    single probe request is then let through: success closes the circuit, failure
+    reopens it with a longer (jittered, exponential) backoff. Error responses
+    (e.g. to a bad request) come from a reachable server and are not counted.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the circuit breaker."""
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._failed_probes = 0
+        self._open_until = 0.0
+
+    @property
+    def state(self) -> str:
+        """Return the state of the circuit."""
+        if self._state == STATE_OPEN and monotonic() >= self._open_until:
+            return STATE_HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Determine whether a request may be sent, claiming the probe if due."""
+        if self._state == STATE_CLOSED:
+            return True
+        if self._state == STATE_OPEN and monotonic() >= self._open_until:
+            # Only the caller that claims the probe gets through.
+            self._state = STATE_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful request, closing the circuit."""
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._failed_probes = 0
+
+    def reset(self) -> None:
+        """Close the circuit, e.g. once the credentials have changed."""
+        self.record_success()
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit if needed."""
+        self._failures += 1
+        if self._state == STATE_HALF_OPEN:
+            self._failed_probes += 1
+        elif self._failures < CIRCUIT_BREAKER_FAILURE_THRESHOLD:
+            return
+
+        backoff = min(
+            CIRCUIT_BREAKER_BASE_BACKOFF * 2 ** self._failed_probes,
+            CIRCUIT_BREAKER_MAX_BACKOFF,
+        )
+        self._state = STATE_OPEN
+        self._open_until = monotonic() + random.uniform(backoff / 2, backoff)
+
+    async def async_call(
+        self, func: Callable[..., Awaitable[T]], *args: Any, **kwargs: Any
+    ) -> T:
+        """Call a motionEye client coroutine through the circuit breaker."""
+        if not self.allow_request():
+            raise MotionEyeCircuitOpenError("motionEye server is unreachable")
+        try:
+            result = await func(*args, **kwargs)
+        except (MotionEyeClientConnectionError, asyncio.TimeoutError):
+            self.record_failure()
+            raise
+        except BaseException:
+            # Other errors (e.g. an error response to a bad request) do not tell
+            # whether the server is reachable, nor does a cancelled request. Let
+            # the next request probe instead.
+            if self._state == STATE_HALF_OPEN:
+                self._state = STATE_OPEN
+            raise
+        self.record_success()
+        return result
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """Get the state of the circuit breaker."""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "failed_probes": self._failed_probes,
+            "seconds_until_probe": (
+                max(self._open_until - monotonic(), 0)
+                if self._state == STATE_OPEN
+                else None
+            ),
+        }
@@ -1,13 +1,21 @@
 """The motionEye integration."""
 from __future__ import annotations
 
+import asyncio
 import logging
 from types import MappingProxyType
 from typing import Any
 
 import aiohttp
+from aiohttp import web
+import async_timeout
 from jinja2 import Template
-from motioneye_client.client import MotionEyeClient, MotionEyeClientURLParseError
+from motioneye_client.client import (
+    MotionEyeClient,
+    MotionEyeClientConnectionError,
+    MotionEyeClientError,
+    MotionEyeClientURLParseError,
+)
 from motioneye_client.const import (
     DEFAULT_SURVEILLANCE_USERNAME,
     KEY_MOTION_DETECTION,
@@ -31,8 +39,11 @@ from homeassistant.const import (
     HTTP_DIGEST_AUTHENTICATION,
 )
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import (
+    async_aiohttp_proxy_web,
+    async_get_clientsession,
+)
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from . import MotionEyeEntity, is_acceptable_camera, listen_for_new_cameras
 from .const import (
@@ -45,11 +56,16 @@ from .const import (
     MOTIONEYE_MANUFACTURER,
     TYPE_MOTIONEYE_MJPEG_CAMERA,
 )
+from .coordinator import MotionEyeUpdateCoordinator
+from .session import get_client_session
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = ["camera"]
 
+# Seconds to wait for a still image from a camera.
+STILL_IMAGE_TIMEOUT = 10
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
@@ -58,8 +74,8 @@ async def async_setup_entry(
     entry_data = hass.data[DOMAIN][entry.entry_id]
 
     @callback  # type: ignore[misc]
-    def camera_add(camera: dict[str, Any]) -> None:
-        """Add a new motionEye camera."""
+    def camera_add(cameras: list[dict[str, Any]]) -> None:
+        """Add new motionEye cameras."""
         async_add_entities(
             [
                 MotionEyeMjpegCamera(
@@ -73,6 +89,7 @@ async def async_setup_entry(
                     entry_data[CONF_COORDINATOR],
                     entry.options,
                 )
+                for camera in cameras
             ]
         )
 
@@ -89,7 +106,7 @@ class MotionEyeMjpegCamera(MotionEyeEntity, MjpegCamera):  # type: ignore[misc]
         password: str,
         camera: dict[str, Any],
         client: MotionEyeClient,
-        coordinator: DataUpdateCoordinator,
+        coordinator: MotionEyeUpdateCoordinator,
         options: MappingProxyType[str, str],
     ) -> None:
         """Initialize a MJPEG camera."""
@@ -167,6 +184,30 @@ class MotionEyeMjpegCamera(MotionEyeEntity, MjpegCamera):  # type: ignore[misc]
         if self._authentication == HTTP_BASIC_AUTHENTICATION:
             self._auth = aiohttp.BasicAuth(self._username, password=self._password)
 
+    @callback  # type: ignore[misc]
+    def _handle_credentials_update(
+        self, client: MotionEyeClient, data: MappingProxyType[str, Any]
+    ) -> None:
+        """Handle rotated surveillance credentials."""
+        super()._handle_credentials_update(client, data)
+        self._surveillance_username = data.get(
+            CONF_SURVEILLANCE_USERNAME, DEFAULT_SURVEILLANCE_USERNAME
+        )
+        self._surveillance_password = data.get(CONF_SURVEILLANCE_PASSWORD, "")
+        self._update_mjpeg_camera_state()
+
+    @callback  # type: ignore[misc]
+    def _handle_options_update(self, options: MappingProxyType[str, Any]) -> None:
+        """Handle updated options, e.g. a changed stream URL template."""
+        super()._handle_options_update(options)
+        self._update_mjpeg_camera_state()
+
+    @callback  # type: ignore[misc]
+    def _update_mjpeg_camera_state(self) -> None:
+        """Update the internal state from the current camera, if usable."""
+        if self._camera and self._is_acceptable_streaming_camera():
+            self._set_mjpeg_camera_state_for_camera(self._camera)
+
     def _is_acceptable_streaming_camera(self) -> bool:
         """Determine if a camera is streaming/usable."""
         return is_acceptable_camera(
@@ -181,13 +222,84 @@ class MotionEyeMjpegCamera(MotionEyeEntity, MjpegCamera):  # type: ignore[misc]
     @callback  # type: ignore[misc]
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
-        super()._handle_coordinator_update()
+        self._camera = self.coordinator.get_camera(self._camera_id)
         if self._camera and self._is_acceptable_streaming_camera():
             self._set_mjpeg_camera_state_for_camera(self._camera)
             self._motion_detection_enabled = self._camera.get(
                 KEY_MOTION_DETECTION, False
             )
-            self.async_write_ha_state()
+        super()._handle_coordinator_update()
+
+    async def async_camera_image(self) -> bytes | None:
+        """Return a still image, failing fast while motionEye is unreachable."""
+        try:
+            image: bytes | None = await self.coordinator.circuit_breaker.async_call(
+                self._async_get_still_image
+            )
+        except MotionEyeClientError:
+            return None
+        return image
+
+    async def _async_get_still_image(self) -> bytes | None:
+        """Fetch a still image from the camera, over the shared connection pool.
+
+        Only a server that cannot be reached raises, an error response concerns
+        this camera alone (e.g. a disabled camera) and returns None, so that it
+        does not open the circuit for the whole server.
+        """
+        # aiohttp does not support digest authentication, MjpegCamera falls back to
+        # requests (and does not tell errors apart).
+        if (
+            self._authentication == HTTP_DIGEST_AUTHENTICATION
+            or self._still_image_url is None
+        ):
+            image: bytes | None = await MjpegCamera.async_camera_image(self)
+            return image
+
+        session = get_client_session(self.hass)
+        try:
+            with async_timeout.timeout(STILL_IMAGE_TIMEOUT):
+                async with session.get(
+                    self._still_image_url, auth=self._auth, ssl=False
+                ) as response:
+                    if response.status >= 400:
+                        _LOGGER.debug(
+                            "Could not fetch still image from %s: HTTP %i",
+                            self.name,
+                            response.status,
+                        )
+                        return None
+                    body: bytes = await response.read()
+                    return body
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            raise MotionEyeClientConnectionError(
+                f"Could not fetch still image from {self.name}: {exc}"
+            ) from exc
+
+    async def handle_async_mjpeg_stream(
+        self, request: web.Request
+    ) -> web.StreamResponse | None:
+        """Proxy the MJPEG stream of the camera.
+
+        A stream holds its connection for as long as it is watched, so streams use
+        the session of Home Assistant rather than the capped connection pool, where
+        they would starve polling.
+        """
+        # aiohttp does not support digest authentication, MjpegCamera falls back to
+        # requests.
+        if self._authentication == HTTP_DIGEST_AUTHENTICATION:
+            response: web.StreamResponse | None = (
+                await MjpegCamera.handle_async_mjpeg_stream(self, request)
+            )
+        else:
+            response = await async_aiohttp_proxy_web(
+                self.hass,
+                request,
+                async_get_clientsession(self.hass, verify_ssl=False).get(
+                    self._mjpeg_url, auth=self._auth
+                ),
+            )
+        return response
 
     @property
     def brand(self) -> str:
@@ -0,0 +1,178 @@
+"""Firing and coalescing of motionEye camera events."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from motioneye_client.const import (
+    KEY_WEB_HOOK_CS_CHANGED_PIXELS,
+    KEY_WEB_HOOK_CS_MOTION_CENTER_X,
+    KEY_WEB_HOOK_CS_MOTION_CENTER_Y,
+    KEY_WEB_HOOK_CS_MOTION_HEIGHT,
+    KEY_WEB_HOOK_CS_MOTION_WIDTH,
+)
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import event
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    ATTR_CHANGED_PIXELS_PEAK,
+    ATTR_COALESCED_EVENTS,
+    ATTR_MOTION_BOUNDING_BOX,
+    DOMAIN,
+    EVENT_MOTION_DETECTED,
+    SIGNAL_CAMERA_EVENT,
+)
+
+
+def _get_changed_pixels(data: dict[str, Any]) -> int | None:
+    """Get the changed pixels reported with an event, if present and valid."""
+    try:
+        return int(data[KEY_WEB_HOOK_CS_CHANGED_PIXELS])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _get_motion_box(data: dict[str, Any]) -> tuple[int, int, int, int] | None:
+    """Get the motion reported with an event as a (left, top, right, bottom) box."""
+    try:
+        center_x = int(data[KEY_WEB_HOOK_CS_MOTION_CENTER_X])
+        center_y = int(data[KEY_WEB_HOOK_CS_MOTION_CENTER_Y])
+        width = int(data[KEY_WEB_HOOK_CS_MOTION_WIDTH])
+        height = int(data[KEY_WEB_HOOK_CS_MOTION_HEIGHT])
+    except (KeyError, TypeError, ValueError):
+        return None
+    left = center_x - width // 2
+    top = center_y - height // 2
+    return (left, top, left + width, top + height)
+
+
+class MotionEyeMotionSummary:
+    """The motion detected events of a camera folded together within a window."""
+
+    def __init__(self) -> None:
+        """Initialize an empty summary."""
+        self.count = 0
+        self.changed_pixels_peak: int | None = None
+        self.bounding_box: tuple[int, int, int, int] | None = None
+        self.data: dict[str, Any] = {}
+        self.unsub_close: CALLBACK_TYPE | None = None
+
+    def add(self, data: dict[str, Any]) -> None:
+        """Fold an event into the summary."""
+        self.count += 1
+        self.data = data
+
+        changed_pixels = _get_changed_pixels(data)
+        if changed_pixels is not None and (
+            self.changed_pixels_peak is None
+            or changed_pixels > self.changed_pixels_peak
+        ):
+            self.changed_pixels_peak = changed_pixels
+
+        box = _get_motion_box(data)
+        if box is None:
+            return
+        if self.bounding_box is not None:
+            box = (
+                min(box[0], self.bounding_box[0]),
+                min(box[1], self.bounding_box[1]),
+                max(box[2], self.bounding_box[2]),
+                max(box[3], self.bounding_box[3]),
+            )
+        self.bounding_box = box
+
+    def get_event_data(self) -> dict[str, Any]:
+        """Get the data of the summary event, based on the last event folded in."""
+        return {
+            **self.data,
+            ATTR_COALESCED_EVENTS: self.count,
+            ATTR_CHANGED_PIXELS_PEAK: self.changed_pixels_peak,
+            ATTR_MOTION_BOUNDING_BOX: (
+                {
+                    "x": self.bounding_box[0],
+                    "y": self.bounding_box[1],
+                    "width": self.bounding_box[2] - self.bounding_box[0],
+                    "height": self.bounding_box[3] - self.bounding_box[1],
+                }
+                if self.bounding_box is not None
+                else None
+            ),
+        }
+
+
+class MotionEyeEventCoalescer:
+    """Fire the events of cameras, coalescing their motion detected events.
+
+    Events are fired on the bus, and signalled to the entities of the camera device
+    only. motionEye may report motion on every frame of a motion event. The first
+    motion detected event of a camera is fired at once and opens a window, further
+    motion detected events within the window are folded into a summary that is
+    fired when the window closes. A window of 0 seconds fires every event as
+    received.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float) -> None:
+        """Initialize the coalescer."""
+        self._hass = hass
+        self._window = window
+        self._summaries: dict[str, MotionEyeMotionSummary] = {}
+
+    @callback  # type: ignore[misc]
+    def async_set_window(self, window: float) -> None:
+        """Change the window, applied from the next window opened."""
+        self._window = window
+
+    @callback  # type: ignore[misc]
+    def async_fire_event(
+        self, device_id: str, event_type: str, data: dict[str, Any]
+    ) -> None:
+        """Fire an event of a camera device, or fold it into a summary."""
+        if event_type != EVENT_MOTION_DETECTED:
+            self._async_fire(device_id, event_type, data)
+            return
+
+        summary = self._summaries.get(device_id)
+        if summary is not None:
+            summary.add(data)
+            return
+
+        self._async_fire(device_id, event_type, data)
+        if self._window <= 0:
+            return
+
+        @callback  # type: ignore[misc]
+        def _async_close_window(_now: datetime) -> None:
+            """Fire the summary of the events folded in, if any."""
+            self._async_close(device_id)
+
+        summary = self._summaries[device_id] = MotionEyeMotionSummary()
+        summary.unsub_close = event.async_call_later(
+            self._hass, self._window, HassJob(_async_close_window)
+        )
+
+    @callback  # type: ignore[misc]
+    def _async_close(self, device_id: str) -> None:
+        """Close the window of a camera device."""
+        summary = self._summaries.pop(device_id)
+        if summary.count:
+            self._async_fire(device_id, EVENT_MOTION_DETECTED, summary.get_event_data())
+
+    @callback  # type: ignore[misc]
+    def _async_fire(
+        self, device_id: str, event_type: str, data: dict[str, Any]
+    ) -> None:
+        """Fire an event on the bus and to the entities of the camera device."""
+        self._hass.bus.async_fire(f"{DOMAIN}.{event_type}", data)
+        async_dispatcher_send(
+            self._hass, SIGNAL_CAMERA_EVENT.format(event_type, device_id), data
+        )
+
+    @callback  # type: ignore[misc]
+    def async_shutdown(self) -> None:
+        """Close every open window, e.g. on unload."""
+        for device_id, summary in list(self._summaries.items()):
+            if summary.unsub_close is not None:
+                summary.unsub_close()
+            self._async_close(device_id)
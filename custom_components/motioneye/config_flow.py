@@ -14,6 +14,7 @@ import voluptuous as vol
 from homeassistant.config_entries import (
     SOURCE_REAUTH,
     ConfigEntry,
+    ConfigEntryState,
     ConfigFlow,
     OptionsFlow,
 )
@@ -27,16 +28,31 @@ from .const import (
     CONF_ADMIN_PASSWORD,
     CONF_ADMIN_USERNAME,
     CONF_EVENT_DURATION,
+    CONF_EVENT_QUEUE_POLICY,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MOTION_EVENT_WINDOW,
+    CONF_OFFLINE_SETUP,
     CONF_STREAM_URL_TEMPLATE,
     CONF_SURVEILLANCE_PASSWORD,
     CONF_SURVEILLANCE_USERNAME,
+    CONF_WEBHOOK_FILE_STORED_KEYS,
+    CONF_WEBHOOK_MOTION_DETECTED_KEYS,
     CONF_WEBHOOK_SET,
     CONF_WEBHOOK_SET_OVERWRITE,
     DEFAULT_EVENT_DURATION,
+    DEFAULT_EVENT_QUEUE_POLICY,
+    DEFAULT_MAX_SCAN_INTERVAL,
+    DEFAULT_MOTION_EVENT_WINDOW,
+    DEFAULT_OFFLINE_SETUP,
     DEFAULT_WEBHOOK_SET,
     DEFAULT_WEBHOOK_SET_OVERWRITE,
     DOMAIN,
+    EVENT_FILE_STORED_OPTIONAL_KEYS,
+    EVENT_MOTION_DETECTED_KEYS,
+    EVENT_QUEUE_POLICY_DROP_OLDEST,
+    EVENT_QUEUE_POLICY_REJECT,
 )
+from .session import get_client_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -117,6 +133,7 @@ class MotionEyeConfigFlow(ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg,
             admin_password=user_input.get(CONF_ADMIN_PASSWORD),
             surveillance_username=user_input.get(CONF_SURVEILLANCE_USERNAME),
             surveillance_password=user_input.get(CONF_SURVEILLANCE_PASSWORD),
+            session=get_client_session(self.hass),
         )
 
         errors = {}
@@ -139,10 +156,11 @@ class MotionEyeConfigFlow(ConfigFlow, domain=DOMAIN):  # type: ignore[call-arg,
             if CONF_WEBHOOK_ID in reauth_entry.data:
                 user_input[CONF_WEBHOOK_ID] = reauth_entry.data[CONF_WEBHOOK_ID]
             self.hass.config_entries.async_update_entry(reauth_entry, data=user_input)
-            # Need to manually reload, as the listener won't have been
-            # installed because the initial load did not succeed (the reauth
-            # flow will not be initiated if the load succeeds).
-            await self.hass.config_entries.async_reload(reauth_entry.entry_id)
+            # A loaded entry (whose credentials were rejected after setup) swaps
+            # the credentials in place. Otherwise, reload manually, as the listener
+            # won't have been installed because the initial load did not succeed.
+            if reauth_entry.state != ConfigEntryState.LOADED:
+                await self.hass.config_entries.async_reload(reauth_entry.entry_id)
             return self.async_abort(reason="reauth_successful")
 
         # Search for duplicates: there isn't a useful unique_id, but
@@ -202,20 +220,30 @@ class MotionEyeOptionsFlow(OptionsFlow):  # type: ignore[misc]
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
-
-        schema: dict[vol.Marker, type] = {
+            # Motion events coalesced for longer than the event binary sensor stays
+            # on would leave the sensor flapping between the summaries.
+            if user_input.get(
+                CONF_MOTION_EVENT_WINDOW, DEFAULT_MOTION_EVENT_WINDOW
+            ) > user_input.get(CONF_EVENT_DURATION, DEFAULT_EVENT_DURATION):
+                errors[CONF_MOTION_EVENT_WINDOW] = "motion_event_window_too_long"
+            else:
+                return self.async_create_entry(title="", data=user_input)
+
+        # Rejected input is shown again, for the user to correct.
+        options = {**self._config_entry.options, **(user_input or {})}
+        schema: dict[vol.Marker, Any] = {
             vol.Required(
                 CONF_WEBHOOK_SET,
-                default=self._config_entry.options.get(
+                default=options.get(
                     CONF_WEBHOOK_SET,
                     DEFAULT_WEBHOOK_SET,
                 ),
             ): bool,
             vol.Required(
                 CONF_WEBHOOK_SET_OVERWRITE,
-                default=self._config_entry.options.get(
+                default=options.get(
                     CONF_WEBHOOK_SET_OVERWRITE,
                     DEFAULT_WEBHOOK_SET_OVERWRITE,
                 ),
@@ -229,19 +257,69 @@ class MotionEyeOptionsFlow(OptionsFlow):  # type: ignore[misc]
                 {
                     vol.Required(
                         CONF_STREAM_URL_TEMPLATE,
-                        default=self._config_entry.options.get(
+                        default=options.get(
                             CONF_STREAM_URL_TEMPLATE,
                             "",
                         ),
                     ): str,
                     vol.Required(
                         CONF_EVENT_DURATION,
-                        default=self._config_entry.options.get(
+                        default=options.get(
                             CONF_EVENT_DURATION,
                             DEFAULT_EVENT_DURATION,
                         ),
                     ): int,
+                    vol.Required(
+                        CONF_MOTION_EVENT_WINDOW,
+                        default=options.get(
+                            CONF_MOTION_EVENT_WINDOW,
+                            DEFAULT_MOTION_EVENT_WINDOW,
+                        ),
+                    ): int,
+                    vol.Required(
+                        CONF_EVENT_QUEUE_POLICY,
+                        default=options.get(
+                            CONF_EVENT_QUEUE_POLICY,
+                            DEFAULT_EVENT_QUEUE_POLICY,
+                        ),
+                    ): vol.In(
+                        [EVENT_QUEUE_POLICY_DROP_OLDEST, EVENT_QUEUE_POLICY_REJECT]
+                    ),
+                    vol.Required(
+                        CONF_MAX_SCAN_INTERVAL,
+                        default=options.get(
+                            CONF_MAX_SCAN_INTERVAL,
+                            DEFAULT_MAX_SCAN_INTERVAL,
+                        ),
+                    ): int,
+                    vol.Required(
+                        CONF_OFFLINE_SETUP,
+                        default=options.get(
+                            CONF_OFFLINE_SETUP,
+                            DEFAULT_OFFLINE_SETUP,
+                        ),
+                    ): bool,
+                    vol.Required(
+                        CONF_WEBHOOK_MOTION_DETECTED_KEYS,
+                        default=options.get(
+                            CONF_WEBHOOK_MOTION_DETECTED_KEYS,
+                            EVENT_MOTION_DETECTED_KEYS,
+                        ),
+                    ): cv.multi_select(
+                        {key: key for key in EVENT_MOTION_DETECTED_KEYS}
+                    ),
+                    vol.Required(
+                        CONF_WEBHOOK_FILE_STORED_KEYS,
+                        default=options.get(
+                            CONF_WEBHOOK_FILE_STORED_KEYS,
+                            EVENT_FILE_STORED_OPTIONAL_KEYS,
+                        ),
+                    ): cv.multi_select(
+                        {key: key for key in EVENT_FILE_STORED_OPTIONAL_KEYS}
+                    ),
                 }
             )
 
-        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
+        return self.async_show_form(
+            step_id="init", data_schema=vol.Schema(schema), errors=errors
+        )
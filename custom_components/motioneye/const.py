@@ -25,25 +25,50 @@ from motioneye_client.const import (
 
 DOMAIN: Final = "motioneye"
 
+ATTR_CHANGED_PIXELS_PEAK: Final = "changed_pixels_peak"
+ATTR_COALESCED_EVENTS: Final = "coalesced_events"
 ATTR_EVENT_TYPE: Final = "event_type"
+ATTR_MOTION_BOUNDING_BOX: Final = "motion_bounding_box"
 ATTR_WEBHOOK_ID: Final = "webhook_id"
 
 CONF_ACTION: Final = "action"
 CONF_CLIENT: Final = "client"
+CONF_CLIENT_SESSION: Final = "client_session"
 CONF_COORDINATOR: Final = "coordinator"
 CONF_ADMIN_PASSWORD: Final = "admin_password"
 CONF_ADMIN_USERNAME: Final = "admin_username"
+CONF_EVENT_COALESCER: Final = "event_coalescer"
 CONF_EVENT_DURATION: Final = "event_duration"
+CONF_EVENT_QUEUE: Final = "event_queue"
+CONF_EVENT_QUEUE_POLICY: Final = "event_queue_policy"
+CONF_MAX_SCAN_INTERVAL: Final = "max_scan_interval"
+CONF_MOTION_EVENT_WINDOW: Final = "motion_event_window"
+CONF_OFFLINE_SETUP: Final = "offline_setup"
+CONF_POLL_SCHEDULER: Final = "poll_scheduler"
 CONF_STREAM_URL_TEMPLATE: Final = "stream_url_template"
 CONF_SURVEILLANCE_USERNAME: Final = "surveillance_username"
 CONF_SURVEILLANCE_PASSWORD: Final = "surveillance_password"
+CONF_WEBHOOK_FILE_STORED_KEYS: Final = "webhook_file_stored_keys"
+CONF_WEBHOOK_MOTION_DETECTED_KEYS: Final = "webhook_motion_detected_keys"
 CONF_WEBHOOK_SET: Final = "webhook_set"
 CONF_WEBHOOK_SET_OVERWRITE: Final = "webhook_set_overwrite"
+CONF_WEBHOOK_PROVISIONER: Final = "webhook_provisioner"
+CONF_WEBHOOK_ROUTES: Final = "webhook_routes"
+
+STORAGE_KEY: Final = f"{DOMAIN}.{{}}"
+STORAGE_VERSION: Final = 1
+
+EVENT_QUEUE_POLICY_DROP_OLDEST: Final = "drop_oldest"
+EVENT_QUEUE_POLICY_REJECT: Final = "reject"
 
 DEFAULT_EVENT_DURATION: Final = 30
+DEFAULT_EVENT_QUEUE_POLICY: Final = EVENT_QUEUE_POLICY_DROP_OLDEST
 DEFAULT_WEBHOOK_SET: Final = True
 DEFAULT_WEBHOOK_SET_OVERWRITE: Final = False
 DEFAULT_SCAN_INTERVAL: Final = timedelta(seconds=30)
+DEFAULT_MAX_SCAN_INTERVAL: Final = 30
+DEFAULT_MOTION_EVENT_WINDOW: Final = 0
+DEFAULT_OFFLINE_SETUP: Final = False
 
 EVENT_MOTION_DETECTED: Final = "motion_detected"
 EVENT_FILE_STORED: Final = "file_stored"
@@ -82,6 +107,16 @@ EVENT_FILE_STORED_KEYS: Final = [
     KEY_WEB_HOOK_CS_MOTION_VERSION,
 ]
 
+# Keys always requested for file stored events, as the media of the event is
+# derived from them.
+EVENT_FILE_STORED_REQUIRED_KEYS: Final = [
+    KEY_WEB_HOOK_CS_FILE_PATH,
+    KEY_WEB_HOOK_CS_FILE_TYPE,
+]
+EVENT_FILE_STORED_OPTIONAL_KEYS: Final = [
+    key for key in EVENT_FILE_STORED_KEYS if key not in EVENT_FILE_STORED_REQUIRED_KEYS
+]
+
 EVENT_FILE_URL: Final = "file_url"
 EVENT_MEDIA_CONTENT_ID: Final = "media_content_id"
 
@@ -92,9 +127,14 @@ SERVICE_ACTION: Final = "action"
 SERVICE_SNAPSHOT: Final = "snapshot"
 
 SIGNAL_CAMERA_ADD: Final = f"{DOMAIN}_camera_add_signal." "{}"
+SIGNAL_CAMERA_EVENT: Final = f"{DOMAIN}_camera_event_signal." "{}.{}"
 SIGNAL_CAMERA_REMOVE: Final = f"{DOMAIN}_camera_remove_signal." "{}"
+SIGNAL_CREDENTIALS_UPDATE: Final = f"{DOMAIN}_credentials_update_signal." "{}"
+SIGNAL_ENTRY_UPDATE: Final = f"{DOMAIN}_entry_update_signal." "{}"
+SIGNAL_OPTIONS_UPDATE: Final = f"{DOMAIN}_options_update_signal." "{}"
 
 TYPE_MOTIONEYE_ACTION_SENSOR = f"{DOMAIN}_action_sensor"
+TYPE_MOTIONEYE_STATUS_SENSOR: Final = f"{DOMAIN}_status_sensor"
 TYPE_MOTIONEYE_MJPEG_CAMERA: Final = f"{DOMAIN}_mjpeg_camera"
 TYPE_MOTIONEYE_SWITCH_BASE: Final = f"{DOMAIN}_switch"
 TYPE_MOTIONEYE_MOTION_BINARY_SENSOR: Final = f"{DOMAIN}_motion_binary_sensor"
@@ -0,0 +1,436 @@
+"""Data update coordinator for the motionEye integration."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+import logging
+from time import monotonic
+from typing import Any, Callable
+
+from motioneye_client.client import (
+    MotionEyeClient,
+    MotionEyeClientError,
+    MotionEyeClientInvalidAuthError,
+)
+from motioneye_client.const import KEY_CAMERAS, KEY_ID
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryAuthFailed
+from homeassistant.helpers import event
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .breaker import MotionEyeCircuitBreaker
+from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, STORAGE_KEY, STORAGE_VERSION
+from .scheduler import MotionEyePollScheduler
+from .tasks import MotionEyeTaskTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+# Factor by which the update interval grows while motionEye reports no changes.
+SCAN_INTERVAL_BACKOFF_FACTOR = 2
+
+# Seconds to gather cameras marked dirty before refreshing them.
+DIRTY_CAMERA_REFRESH_COOLDOWN = 5
+
+# Seconds without further requests before a requested refresh runs, and the
+# longest a requested refresh is delayed by a steady stream of requests.
+REQUEST_REFRESH_QUIET_PERIOD = 1
+REQUEST_REFRESH_MAX_DELAY = 5
+
+# Seconds to gather changes before saving the cameras to the cache.
+CACHE_SAVE_DELAY = 60
+
+# Camera keys containing any of these are never written to the cache, as they
+# may hold credentials (e.g. upload passwords, device URLs or the web hook URLs
+# that embed the Home Assistant webhook id).
+CACHE_REDACTED_KEY_PARTS = (
+    "password",
+    "username",
+    "key",
+    "token",
+    "secret",
+    "api",
+    "url",
+)
+
+
+def index_cameras(data: dict[str, Any] | None) -> dict[int, dict[str, Any]]:
+    """Index the cameras in a multiple cameras data response by camera id."""
+    cameras: dict[int, dict[str, Any]] = {}
+    for camera in data.get(KEY_CAMERAS, []) if data else []:
+        if KEY_ID in camera:
+            cameras.setdefault(camera[KEY_ID], camera)
+    return cameras
+
+
+def redact_camera(camera: dict[str, Any]) -> dict[str, Any]:
+    """Remove any keys that may hold secrets from a camera."""
+    return {
+        key: value
+        for key, value in camera.items()
+        if not any(part in key.lower() for part in CACHE_REDACTED_KEY_PARTS)
+    }
+
+
+def get_changed_camera_keys(
+    old_camera: dict[str, Any] | None, new_camera: dict[str, Any] | None
+) -> set[str]:
+    """Get the keys whose values differ between two versions of a camera."""
+    old_camera = old_camera or {}
+    new_camera = new_camera or {}
+    return {
+        key
+        for key in old_camera.keys() | new_camera.keys()
+        if key not in old_camera
+        or key not in new_camera
+        or old_camera[key] != new_camera[key]
+    }
+
+
+class MotionEyeUpdateCoordinator(DataUpdateCoordinator):  # type: ignore[misc]
+    """Coordinator that fetches all cameras from a motionEye server."""
+
+    data: dict[str, Any] | None
+    update_interval: timedelta
+    _unsub_refresh: CALLBACK_TYPE | None
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry_id: str,
+        client: MotionEyeClient,
+        scheduler: MotionEyePollScheduler,
+        max_update_interval: timedelta = DEFAULT_SCAN_INTERVAL,
+        logged_in: bool = True,
+    ) -> None:
+        """Initialize the coordinator.
+
+        If the client is not logged_in yet, it logs in as part of the first
+        successful refresh.
+        """
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=DEFAULT_SCAN_INTERVAL,
+        )
+        self._client = client
+        self._logged_in = logged_in
+        self.scheduler = scheduler
+        self.circuit_breaker = MotionEyeCircuitBreaker()
+        self.task_tracker = MotionEyeTaskTracker(hass)
+        self.max_update_interval = max(max_update_interval, DEFAULT_SCAN_INTERVAL)
+        self._indexed_data: dict[str, Any] | None = None
+        self._cameras: dict[int, dict[str, Any]] = {}
+
+        self._camera_listeners: dict[int, list[Callable[[set[str] | None], None]]] = {}
+        self._unsub_camera_listeners: CALLBACK_TYPE | None = None
+        self._dispatched_cameras: dict[int, dict[str, Any]] = {}
+        self._dispatched_update_success = True
+
+        self._dirty_camera_ids: set[int] = set()
+        self._unsub_dirty_refresh: CALLBACK_TYPE | None = None
+        self._dirty_refresh_job = HassJob(self._async_handle_dirty_refresh)
+
+        # Whether the data was loaded from the cache, rather than fetched from
+        # motionEye. Cached data is redacted and must never be written back.
+        self.data_is_cached = False
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(config_entry_id))
+        self._cache_save_pending = False
+
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_requested_at: float | None = None
+        self._unsub_requested_refresh: CALLBACK_TYPE | None = None
+        self._requested_refresh_job = HassJob(self._async_handle_requested_refresh)
+
+    async def _async_update_data(self) -> dict[str, Any] | None:
+        """Fetch the latest cameras from motionEye."""
+        # Fetches are serialized so that they complete in the order they started,
+        # and older data never replaces newer data.
+        async with self._refresh_lock:
+            # This fetch covers any cameras marked dirty and any refresh requested
+            # until now.
+            self._async_cancel_dirty_refresh()
+            self._async_cancel_requested_refresh()
+            try:
+                async with self.scheduler.async_limit_refresh(self):
+                    if not self._logged_in:
+                        await self.circuit_breaker.async_call(
+                            self._client.async_client_login
+                        )
+                        self._logged_in = True
+                    data = await self.circuit_breaker.async_call(
+                        self._client.async_get_cameras
+                    )
+            except MotionEyeClientInvalidAuthError as exc:
+                if not self._logged_in:
+                    raise ConfigEntryAuthFailed from exc
+                raise UpdateFailed("Error communicating with API") from exc
+            except MotionEyeClientError as exc:
+                raise UpdateFailed("Error communicating with API") from exc
+
+        self.data_is_cached = False
+
+        # Back off while motionEye keeps returning the same cameras, the next
+        # refresh is scheduled with the updated interval.
+        if data is not None and data == self.data:
+            self.update_interval = min(
+                self.update_interval * SCAN_INTERVAL_BACKOFF_FACTOR,
+                self.max_update_interval,
+            )
+        else:
+            self.update_interval = DEFAULT_SCAN_INTERVAL
+            if data is not None:
+                self._async_schedule_cache_save()
+        return data
+
+    @callback  # type: ignore[misc]
+    def async_set_max_update_interval(self, max_update_interval: timedelta) -> None:
+        """Change the ceiling of the polling interval, e.g. when options change."""
+        self.max_update_interval = max(max_update_interval, DEFAULT_SCAN_INTERVAL)
+        if self.update_interval > self.max_update_interval:
+            self.update_interval = self.max_update_interval
+            self.async_reschedule_refresh()
+
+    @callback  # type: ignore[misc]
+    def async_set_client(self, client: MotionEyeClient) -> None:
+        """Replace the client, e.g. when the credentials change.
+
+        The new client logs in as part of the next refresh.
+        """
+        self._client = client
+        self._logged_in = False
+
+    async def async_load_cache(self) -> None:
+        """Load the cameras last fetched from motionEye, if none were fetched yet."""
+        cached = await self._store.async_load()
+        if self.data is None and isinstance(cached, dict) and KEY_CAMERAS in cached:
+            self.data = cached
+            self.data_is_cached = True
+
+    @callback  # type: ignore[misc]
+    def _async_schedule_cache_save(self) -> None:
+        """Save the current cameras to the cache shortly."""
+        self._cache_save_pending = True
+        self._store.async_delay_save(self._get_cache_data, CACHE_SAVE_DELAY)
+
+    @callback  # type: ignore[misc]
+    def _get_cache_data(self) -> dict[str, Any]:
+        """Get the redacted cameras to save to the cache."""
+        self._cache_save_pending = False
+        data = self.data or {}
+        return {
+            **data,
+            KEY_CAMERAS: [
+                redact_camera(camera) for camera in data.get(KEY_CAMERAS, [])
+            ],
+        }
+
+    @callback  # type: ignore[misc]
+    def _schedule_refresh(self) -> None:
+        """Schedule the next refresh in the slot given by the scheduler."""
+        if self.config_entry and self.config_entry.pref_disable_polling:
+            return
+
+        if self._unsub_refresh:
+            self._unsub_refresh()
+            self._unsub_refresh = None
+
+        self._unsub_refresh = event.async_track_point_in_utc_time(
+            self.hass,
+            self._job,
+            self.scheduler.get_next_refresh(self, self.update_interval),
+        )
+
+    @callback  # type: ignore[misc]
+    def async_reschedule_refresh(self) -> None:
+        """Move a pending refresh to the current slot of this coordinator."""
+        if self._unsub_refresh:
+            self._schedule_refresh()
+
+    async def async_request_refresh(self) -> None:
+        """Request a refresh, e.g. after a camera write.
+
+        Bursts of requests result in a single refresh, run once no request has
+        arrived for a quiet period (or after a maximum delay). Every request is
+        followed by a fetch that starts after it, so the coordinator converges on
+        whatever was written before the request.
+        """
+        now = monotonic()
+        if self._refresh_requested_at is None:
+            self._refresh_requested_at = now
+        if self._unsub_requested_refresh:
+            self._unsub_requested_refresh()
+
+        delay = min(
+            REQUEST_REFRESH_QUIET_PERIOD,
+            self._refresh_requested_at + REQUEST_REFRESH_MAX_DELAY - now,
+        )
+        self._unsub_requested_refresh = event.async_call_later(
+            self.hass, max(delay, 0), self._requested_refresh_job
+        )
+
+    async def _async_handle_requested_refresh(self, _now: datetime) -> None:
+        """Run a requested refresh."""
+        self._unsub_requested_refresh = None
+        await self.async_refresh()
+
+    @callback  # type: ignore[misc]
+    def _async_cancel_requested_refresh(self) -> None:
+        """Cancel a pending requested refresh."""
+        self._refresh_requested_at = None
+        if self._unsub_requested_refresh:
+            self._unsub_requested_refresh()
+            self._unsub_requested_refresh = None
+
+    async def async_shutdown(self) -> None:
+        """Cancel pending refreshes and save the cache, e.g. on unload."""
+        self._async_cancel_requested_refresh()
+        self._async_cancel_dirty_refresh()
+        if self._cache_save_pending:
+            await self._store.async_save(self._get_cache_data())
+
+    @callback  # type: ignore[misc]
+    def async_mark_camera_dirty(self, camera_id: int) -> None:
+        """Mark a camera as changed, to be refreshed shortly."""
+        self._dirty_camera_ids.add(camera_id)
+        if self._unsub_dirty_refresh is None:
+            self._unsub_dirty_refresh = event.async_call_later(
+                self.hass, DIRTY_CAMERA_REFRESH_COOLDOWN, self._dirty_refresh_job
+            )
+
+    async def _async_handle_dirty_refresh(self, _now: datetime) -> None:
+        """Refresh the cameras marked dirty since the last refresh."""
+        self._unsub_dirty_refresh = None
+
+        # Leave failed or missing data to the regular refresh.
+        if not self.last_update_success:
+            self._dirty_camera_ids.clear()
+        self._dirty_camera_ids.intersection_update(self.cameras)
+
+        # Several dirty cameras are fetched with a single request for all cameras.
+        if len(self._dirty_camera_ids) > 1:
+            await self.async_refresh()
+        elif self._dirty_camera_ids:
+            await self._async_refresh_dirty_camera(next(iter(self._dirty_camera_ids)))
+
+    async def _async_refresh_dirty_camera(self, camera_id: int) -> None:
+        """Fetch a dirty camera and merge it into the current data."""
+        # The fetch is serialized with full refreshes, so that it never replaces
+        # newer data (and is dropped if a full refresh has covered the camera).
+        async with self._refresh_lock:
+            if camera_id not in self._dirty_camera_ids:
+                return
+            self._dirty_camera_ids.discard(camera_id)
+            try:
+                async with self.scheduler.async_limit_refresh(self):
+                    camera = await self.circuit_breaker.async_call(
+                        self._client.async_get_camera, camera_id
+                    )
+            except MotionEyeClientError as exc:
+                _LOGGER.debug(
+                    "Could not refresh motionEye camera %i: %s", camera_id, exc
+                )
+                return
+
+            if not camera or camera.get(KEY_ID) != camera_id or not self.data:
+                return
+
+            if not self.data_is_cached:
+                self._async_schedule_cache_save()
+            self.async_set_updated_data(
+                {
+                    **self.data,
+                    KEY_CAMERAS: [
+                        camera if existing.get(KEY_ID) == camera_id else existing
+                        for existing in self.data.get(KEY_CAMERAS, [])
+                    ],
+                }
+            )
+
+    @callback  # type: ignore[misc]
+    def _async_cancel_dirty_refresh(self) -> None:
+        """Cancel a pending refresh of the dirty cameras."""
+        self._dirty_camera_ids.clear()
+        if self._unsub_dirty_refresh:
+            self._unsub_dirty_refresh()
+            self._unsub_dirty_refresh = None
+
+    @callback  # type: ignore[misc]
+    def async_reset_update_interval(self) -> None:
+        """Return to polling at the fastest interval, e.g. after a camera write."""
+        if self.update_interval <= DEFAULT_SCAN_INTERVAL:
+            return
+        self.update_interval = DEFAULT_SCAN_INTERVAL
+        if self._listeners:
+            self._schedule_refresh()
+
+    @property
+    def cameras(self) -> dict[int, dict[str, Any]]:
+        """Return the latest cameras keyed by camera id.
+
+        The index is built at most once per coordinator payload, so entities
+        looking up their camera on every update do not rescan the camera list.
+        """
+        if self.data is not self._indexed_data:
+            self._cameras = index_cameras(self.data)
+            self._indexed_data = self.data
+        return self._cameras
+
+    @callback  # type: ignore[misc]
+    def get_camera(self, camera_id: int) -> dict[str, Any] | None:
+        """Get an individual camera dict by camera id."""
+        return self.cameras.get(camera_id)
+
+    @callback  # type: ignore[misc]
+    def async_add_camera_listener(
+        self, camera_id: int, update_callback: Callable[[set[str] | None], None]
+    ) -> Callable[[], None]:
+        """Listen for changes to a single camera.
+
+        The callback is only called when the camera has changed since the last
+        update, and is passed the set of changed keys (or None if every key should
+        be considered changed, e.g. when the coordinator availability changes).
+        """
+        if not self._camera_listeners:
+            self._dispatched_cameras = self.cameras
+            self._dispatched_update_success = self.last_update_success
+            self._unsub_camera_listeners = self.async_add_listener(
+                self._async_dispatch_camera_updates
+            )
+        self._camera_listeners.setdefault(camera_id, []).append(update_callback)
+
+        def remove_listener() -> None:
+            """Remove the camera listener."""
+            listeners = self._camera_listeners[camera_id]
+            listeners.remove(update_callback)
+            if not listeners:
+                del self._camera_listeners[camera_id]
+            if not self._camera_listeners and self._unsub_camera_listeners:
+                self._unsub_camera_listeners()
+                self._unsub_camera_listeners = None
+
+        return remove_listener
+
+    @callback  # type: ignore[misc]
+    def _async_dispatch_camera_updates(self) -> None:
+        """Notify the listeners of cameras that changed since the last update."""
+        cameras = self.cameras
+        availability_changed = (
+            self.last_update_success != self._dispatched_update_success
+        )
+        dispatched_cameras = self._dispatched_cameras
+        self._dispatched_cameras = cameras
+        self._dispatched_update_success = self.last_update_success
+
+        for camera_id, listeners in list(self._camera_listeners.items()):
+            changed_keys: set[str] | None = None
+            if not availability_changed:
+                old_camera = dispatched_cameras.get(camera_id)
+                new_camera = cameras.get(camera_id)
+                if old_camera == new_camera:
+                    continue
+                changed_keys = get_changed_camera_keys(old_camera, new_camera)
+            for update_callback in list(listeners):
+                update_callback(changed_keys)
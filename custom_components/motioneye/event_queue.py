@@ -0,0 +1,94 @@
+"""Queueing of motionEye web hook events."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+import logging
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import EVENT_QUEUE_POLICY_REJECT
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum number of web hook events waiting to be processed for a config entry.
+EVENT_QUEUE_MAX_SIZE = 100
+
+
+class MotionEyeEventQueue:
+    """Process web hook events after motionEye has been answered.
+
+    Web hook requests are only validated before being answered, the events are
+    queued and processed (enriched and fired) by a single worker. The queue is
+    bounded: once full, either the oldest queued event is dropped to make room,
+    or the new event is rejected, depending on the policy.
+    """
+
+    def __init__(self, hass: HomeAssistant, policy: str) -> None:
+        """Initialize the event queue."""
+        self._hass = hass
+        self._policy = policy
+        self._jobs: deque[Callable[[], None]] = deque()
+        self._worker: asyncio.Task | None = None
+        self._max_depth = 0
+        self._processed = 0
+        self._dropped = 0
+        self._rejected = 0
+
+    @callback  # type: ignore[misc]
+    def async_set_policy(self, policy: str) -> None:
+        """Change the policy applied once the queue is full."""
+        self._policy = policy
+
+    @callback  # type: ignore[misc]
+    def async_put(self, job: Callable[[], None]) -> bool:
+        """Queue the processing of an event, returning False if rejected."""
+        if len(self._jobs) >= EVENT_QUEUE_MAX_SIZE:
+            if self._policy == EVENT_QUEUE_POLICY_REJECT:
+                self._rejected += 1
+                return False
+            self._jobs.popleft()
+            self._dropped += 1
+
+        self._jobs.append(job)
+        self._max_depth = max(self._max_depth, len(self._jobs))
+        # A worker that has emptied the queue is done, even if not yet reaped.
+        if self._worker is None or self._worker.done():
+            self._worker = self._hass.async_create_task(self._async_worker())
+        return True
+
+    async def _async_worker(self) -> None:
+        """Process queued events until the queue is empty."""
+        while self._jobs:
+            self._async_process(self._jobs.popleft())
+            # Answer the web hook requests received meanwhile before going on.
+            await asyncio.sleep(0)
+
+    @callback  # type: ignore[misc]
+    def _async_process(self, job: Callable[[], None]) -> None:
+        """Process a queued event."""
+        try:
+            job()
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error processing motionEye web hook event")
+        self._processed += 1
+
+    async def async_shutdown(self) -> None:
+        """Process the queued events and stop, e.g. on unload."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+        while self._jobs:
+            self._async_process(self._jobs.popleft())
+
+    def get_diagnostics(self) -> dict[str, Any]:
+        """Get the depth of the queue and the number of events handled."""
+        return {
+            "policy": self._policy,
+            "depth": len(self._jobs),
+            "max_depth": self._max_depth,
+            "processed": self._processed,
+            "dropped": self._dropped,
+            "rejected": self._rejected,
+        }
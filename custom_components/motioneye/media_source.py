@@ -26,7 +26,7 @@ from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.typing import HomeAssistantType
 
 from . import get_media_url, split_motioneye_device_identifier
-from .const import CONF_CLIENT, DOMAIN
+from .const import CONF_CLIENT, CONF_COORDINATOR, DOMAIN
 
 MIME_TYPE_MAP = {
     "movies": "video/mp4",
@@ -268,13 +268,15 @@ class MotionEyeMediaSource(MediaSource):  # type: ignore[misc]
 
         base.children = []
 
-        client = self.hass.data[DOMAIN][config.entry_id][CONF_CLIENT]
+        config_data = self.hass.data[DOMAIN][config.entry_id]
+        client = config_data[CONF_CLIENT]
+        circuit_breaker = config_data[CONF_COORDINATOR].circuit_breaker
         camera_id = self._get_camera_id_or_raise(config, device)
 
         if kind == "movies":
-            resp = await client.async_get_movies(camera_id)
+            resp = await circuit_breaker.async_call(client.async_get_movies, camera_id)
         else:
-            resp = await client.async_get_images(camera_id)
+            resp = await circuit_breaker.async_call(client.async_get_images, camera_id)
 
         sub_dirs: set[str] = set()
         parts = parsed_path.parts
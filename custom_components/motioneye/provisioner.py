@@ -0,0 +1,237 @@
+"""Web hook provisioning for motionEye cameras."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+import logging
+from typing import Any
+
+from motioneye_client.client import MotionEyeClient, MotionEyeClientError
+from motioneye_client.const import (
+    KEY_WEB_HOOK_NOTIFICATIONS_ENABLED,
+    KEY_WEB_HOOK_NOTIFICATIONS_HTTP_METHOD,
+    KEY_WEB_HOOK_NOTIFICATIONS_URL,
+    KEY_WEB_HOOK_STORAGE_ENABLED,
+    KEY_WEB_HOOK_STORAGE_HTTP_METHOD,
+    KEY_WEB_HOOK_STORAGE_URL,
+)
+
+from homeassistant.core import CALLBACK_TYPE, HassJob, HomeAssistant, callback
+from homeassistant.helpers import event
+
+from .breaker import MotionEyeCircuitBreaker
+from .tasks import MotionEyeTaskTracker
+
+_LOGGER = logging.getLogger(__name__)
+
+# Maximum number of cameras written to a motionEye server at the same time.
+MAX_CONCURRENT_PROVISIONS = 2
+
+# Attempts to write a camera before giving up, and seconds to wait before the
+# first retry (doubling with every further attempt).
+PROVISION_MAX_ATTEMPTS = 5
+PROVISION_RETRY_BASE_DELAY = 30
+
+# The camera keys making up the web hook configuration of a camera.
+WEBHOOK_CAMERA_KEYS = (
+    KEY_WEB_HOOK_NOTIFICATIONS_ENABLED,
+    KEY_WEB_HOOK_NOTIFICATIONS_HTTP_METHOD,
+    KEY_WEB_HOOK_NOTIFICATIONS_URL,
+    KEY_WEB_HOOK_STORAGE_ENABLED,
+    KEY_WEB_HOOK_STORAGE_HTTP_METHOD,
+    KEY_WEB_HOOK_STORAGE_URL,
+)
+
+STATUS_PENDING = "pending"
+STATUS_PROVISIONED = "provisioned"
+STATUS_UNMANAGED = "unmanaged"
+STATUS_FAILED = "failed"
+
+
+class MotionEyeWebhookProvisioner:
+    """Write cameras with updated web hooks back to a motionEye server.
+
+    Cameras are queued and written by a bounded number of workers, failed writes
+    are retried with an exponential backoff. Retries re-read the camera and only
+    write its web hooks over it, so changes made meanwhile are not reverted. The
+    status of every camera is kept for diagnostics.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        client: MotionEyeClient,
+        circuit_breaker: MotionEyeCircuitBreaker,
+        task_tracker: MotionEyeTaskTracker,
+    ) -> None:
+        """Initialize the provisioner."""
+        self._hass = hass
+        self._client = client
+        self._circuit_breaker = circuit_breaker
+        self._task_tracker = task_tracker
+        self._queue: dict[int, dict[str, Any]] = {}
+        self._writing: set[int] = set()
+        self._workers: set[asyncio.Task] = set()
+        self._unsub_retries: dict[int, CALLBACK_TYPE] = {}
+        self._retry_cameras: dict[int, dict[str, Any]] = {}
+        # Cameras queued by a retry, whose configuration may be stale by now.
+        self._stale_camera_ids: set[int] = set()
+        self._status: dict[int, dict[str, Any]] = {}
+
+    @callback  # type: ignore[misc]
+    def async_queue_camera(self, camera_id: int, camera: dict[str, Any]) -> None:
+        """Queue a camera to be written, replacing any queued version of it.
+
+        A camera still pending keeps its attempts and backoff, its next attempt
+        writes the newer version. A camera given up on is not queued again.
+        """
+        status = self._status.get(camera_id)
+        if status and status["status"] == STATUS_FAILED:
+            return
+        if camera_id in self._retry_cameras:
+            self._retry_cameras[camera_id] = camera
+            return
+        if not status or status["status"] != STATUS_PENDING:
+            self._status[camera_id] = {
+                "status": STATUS_PENDING,
+                "attempts": 0,
+                "last_error": None,
+            }
+        self._stale_camera_ids.discard(camera_id)
+        self._async_enqueue(camera_id, camera)
+
+    @callback  # type: ignore[misc]
+    def async_set_client(self, client: MotionEyeClient) -> None:
+        """Replace the client, e.g. when the credentials change."""
+        self._client = client
+
+    @callback  # type: ignore[misc]
+    def async_set_provisioned(self, camera_id: int) -> None:
+        """Record a camera whose web hooks are already set."""
+        self._async_set_status(camera_id, STATUS_PROVISIONED)
+
+    @callback  # type: ignore[misc]
+    def async_set_unmanaged(self, camera_id: int) -> None:
+        """Record a camera whose web hooks were set by the user and are kept."""
+        self._async_set_status(camera_id, STATUS_UNMANAGED)
+
+    @callback  # type: ignore[misc]
+    def _async_set_status(self, camera_id: int, status: str) -> None:
+        """Record the status of a camera that is not being written."""
+        if (
+            camera_id not in self._queue
+            and camera_id not in self._writing
+            and camera_id not in self._unsub_retries
+        ):
+            self._status[camera_id] = {
+                "status": status,
+                "attempts": 0,
+                "last_error": None,
+            }
+
+    @callback  # type: ignore[misc]
+    def _async_enqueue(self, camera_id: int, camera: dict[str, Any]) -> None:
+        """Add a camera to the queue, starting a worker if needed."""
+        self._queue[camera_id] = camera
+        if len(self._workers) < MAX_CONCURRENT_PROVISIONS:
+            worker = self._hass.async_create_task(self._async_worker())
+            self._workers.add(worker)
+            worker.add_done_callback(self._workers.discard)
+
+    async def _async_worker(self) -> None:
+        """Write queued cameras until the queue is empty."""
+        while True:
+            # A camera is never written by two workers at once, the worker writing
+            # it picks up any newer version afterwards.
+            camera_id = next(
+                (key for key in self._queue if key not in self._writing), None
+            )
+            if camera_id is None:
+                return
+            self._writing.add(camera_id)
+            try:
+                await self._async_provision(camera_id, self._queue.pop(camera_id))
+            finally:
+                self._writing.discard(camera_id)
+
+    async def _async_provision(self, camera_id: int, camera: dict[str, Any]) -> None:
+        """Write a camera, scheduling a retry if that fails."""
+        status = self._status[camera_id]
+        status["attempts"] += 1
+        try:
+            if camera_id in self._stale_camera_ids:
+                self._stale_camera_ids.discard(camera_id)
+                camera = await self._async_get_current_camera(camera_id, camera)
+            await self._task_tracker.async_run(
+                self._circuit_breaker.async_call(
+                    self._client.async_set_camera, camera_id, camera
+                ),
+                f"set web hooks of camera {camera_id}",
+            )
+        except MotionEyeClientError as exc:
+            status["last_error"] = str(exc)
+            # A newer version of the camera may have been queued meanwhile.
+            if camera_id in self._queue:
+                return
+            if status["attempts"] >= PROVISION_MAX_ATTEMPTS:
+                _LOGGER.warning(
+                    "Could not set the web hooks of motionEye camera %i: %s",
+                    camera_id,
+                    exc,
+                )
+                status["status"] = STATUS_FAILED
+                return
+
+            @callback  # type: ignore[misc]
+            def _async_retry(_now: datetime) -> None:
+                """Queue the latest version of the camera again."""
+                del self._unsub_retries[camera_id]
+                self._stale_camera_ids.add(camera_id)
+                self._async_enqueue(camera_id, self._retry_cameras.pop(camera_id))
+
+            self._retry_cameras[camera_id] = camera
+            self._unsub_retries[camera_id] = event.async_call_later(
+                self._hass,
+                PROVISION_RETRY_BASE_DELAY * 2 ** (status["attempts"] - 1),
+                HassJob(_async_retry),
+            )
+            return
+
+        # A newer version of the camera may have been queued meanwhile.
+        if camera_id not in self._queue:
+            status["status"] = STATUS_PROVISIONED
+            status["last_error"] = None
+
+    async def _async_get_current_camera(
+        self, camera_id: int, camera: dict[str, Any]
+    ) -> dict[str, Any]:
+        """Get the current configuration of a camera with its web hooks set."""
+        current_camera = await self._task_tracker.async_run(
+            self._circuit_breaker.async_call(self._client.async_get_camera, camera_id),
+            f"get camera {camera_id}",
+        )
+        if not current_camera:
+            raise MotionEyeClientError(f"Camera {camera_id} not found")
+        return {
+            **current_camera,
+            **{key: camera[key] for key in WEBHOOK_CAMERA_KEYS if key in camera},
+        }
+
+    async def async_shutdown(self) -> None:
+        """Stop provisioning, e.g. on unload.
+
+        Writes already in flight are left to the task tracker to drain.
+        """
+        self._queue.clear()
+        for unsub_retry in self._unsub_retries.values():
+            unsub_retry()
+        self._unsub_retries.clear()
+        self._retry_cameras.clear()
+        self._stale_camera_ids.clear()
+        for worker in list(self._workers):
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+
+    def get_diagnostics(self) -> dict[int, dict[str, Any]]:
+        """Get the provisioning status of every camera."""
+        return {camera_id: dict(status) for camera_id, status in self._status.items()}
@@ -0,0 +1,41 @@
+"""Web hook routing shared by all motionEye config entries."""
+from __future__ import annotations
+
+from typing import NamedTuple
+
+from motioneye_client.client import MotionEyeClient
+
+from homeassistant.core import HomeAssistant, callback
+
+from .coalescer import MotionEyeEventCoalescer
+from .const import CONF_WEBHOOK_ROUTES, DOMAIN
+from .coordinator import MotionEyeUpdateCoordinator
+from .event_queue import MotionEyeEventQueue
+
+
+class MotionEyeWebhookRoute(NamedTuple):
+    """Everything needed to handle a web hook event of a camera device."""
+
+    config_entry_id: str
+    device_name: str | None
+    client: MotionEyeClient
+    coordinator: MotionEyeUpdateCoordinator
+    coalescer: MotionEyeEventCoalescer
+    event_queue: MotionEyeEventQueue
+    camera_id: int
+    root_directory: str | None
+
+
+@callback  # type: ignore[misc]
+def get_webhook_routes(hass: HomeAssistant) -> dict[str, MotionEyeWebhookRoute]:
+    """Get the web hook routes of all config entries, keyed by device id.
+
+    The routes are kept up to date by each config entry as its cameras are added,
+    changed or removed, so that handling a web hook event needs no device registry
+    or camera lookups.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    routes: dict[str, MotionEyeWebhookRoute] = domain_data.setdefault(
+        CONF_WEBHOOK_ROUTES, {}
+    )
+    return routes
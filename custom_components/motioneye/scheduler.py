@@ -0,0 +1,120 @@
+"""Polling scheduler shared by all motionEye config entries."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+import math
+from time import monotonic
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+import homeassistant.util.dt as dt_util
+
+from .const import CONF_POLL_SCHEDULER, DEFAULT_SCAN_INTERVAL, DOMAIN
+
+# Maximum number of motionEye servers fetched at the same time.
+MAX_CONCURRENT_REFRESHES = 4
+
+
+class MotionEyePollScheduler:
+    """Spread the refreshes of all motionEye servers across the scan interval.
+
+    Every registered coordinator owns a slot, slots are evenly spaced across the
+    scan interval and coordinators always refresh on a multiple of the scan
+    interval from their slot. This avoids every server being polled at the same
+    instant when many entries are set up together.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._coordinators: list[DataUpdateCoordinator] = []
+        self._reschedule_callbacks: dict[DataUpdateCoordinator, Callable[[], None]] = {}
+        self._last_refresh_durations: dict[DataUpdateCoordinator, float] = {}
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REFRESHES)
+
+    @callback  # type: ignore[misc]
+    def async_add_coordinator(
+        self,
+        coordinator: DataUpdateCoordinator,
+        reschedule_callback: Callable[[], None],
+    ) -> Callable[[], None]:
+        """Give a coordinator a slot, re-spreading the slots of all coordinators."""
+        self._coordinators.append(coordinator)
+        self._reschedule_callbacks[coordinator] = reschedule_callback
+        self._async_reschedule()
+
+        def remove_coordinator() -> None:
+            """Remove the coordinator from the scheduler."""
+            self._coordinators.remove(coordinator)
+            del self._reschedule_callbacks[coordinator]
+            self._last_refresh_durations.pop(coordinator, None)
+            self._async_reschedule()
+
+        return remove_coordinator
+
+    @callback  # type: ignore[misc]
+    def _async_reschedule(self) -> None:
+        """Move pending refreshes to the current slots."""
+        for reschedule_callback in list(self._reschedule_callbacks.values()):
+            reschedule_callback()
+
+    def get_slot_offset(self, coordinator: DataUpdateCoordinator) -> float:
+        """Get the offset of the slot of a coordinator in seconds."""
+        if coordinator not in self._coordinators:
+            return 0.0
+        return (
+            self._coordinators.index(coordinator)
+            * DEFAULT_SCAN_INTERVAL.total_seconds()
+            / len(self._coordinators)
+        )
+
+    def get_next_refresh(
+        self, coordinator: DataUpdateCoordinator, update_interval: timedelta
+    ) -> datetime:
+        """Get the last slot time no later than update_interval from now."""
+        period = DEFAULT_SCAN_INTERVAL.total_seconds()
+        offset = self.get_slot_offset(coordinator)
+        target = dt_util.utcnow().timestamp() + update_interval.total_seconds()
+        next_refresh: datetime = dt_util.utc_from_timestamp(
+            math.floor((target - offset) / period) * period + offset
+        )
+        return next_refresh
+
+    @asynccontextmanager
+    async def async_limit_refresh(
+        self, coordinator: DataUpdateCoordinator
+    ) -> AsyncIterator[None]:
+        """Limit concurrent refreshes and record how long the refresh takes."""
+        async with self._semaphore:
+            start = monotonic()
+            try:
+                yield
+            finally:
+                if coordinator in self._coordinators:
+                    self._last_refresh_durations[coordinator] = monotonic() - start
+
+    def get_diagnostics(self, coordinator: DataUpdateCoordinator) -> dict[str, Any]:
+        """Get the schedule of a coordinator."""
+        return {
+            "slot": (
+                self._coordinators.index(coordinator)
+                if coordinator in self._coordinators
+                else None
+            ),
+            "slots": len(self._coordinators),
+            "slot_offset": self.get_slot_offset(coordinator),
+            "last_refresh_duration": self._last_refresh_durations.get(coordinator),
+        }
+
+
+@callback  # type: ignore[misc]
+def get_poll_scheduler(hass: HomeAssistant) -> MotionEyePollScheduler:
+    """Get the poll scheduler shared by all config entries."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if CONF_POLL_SCHEDULER not in domain_data:
+        domain_data[CONF_POLL_SCHEDULER] = MotionEyePollScheduler()
+    scheduler: MotionEyePollScheduler = domain_data[CONF_POLL_SCHEDULER]
+    return scheduler
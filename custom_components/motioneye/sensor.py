@@ -11,10 +11,21 @@ from motioneye_client.const import KEY_ACTIONS, KEY_NAME
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import MotionEyeEntity, listen_for_new_cameras
-from .const import CONF_CLIENT, CONF_COORDINATOR, DOMAIN, TYPE_MOTIONEYE_ACTION_SENSOR
+from .const import (
+    CONF_CLIENT,
+    CONF_COORDINATOR,
+    CONF_EVENT_QUEUE,
+    CONF_WEBHOOK_PROVISIONER,
+    DOMAIN,
+    TYPE_MOTIONEYE_ACTION_SENSOR,
+    TYPE_MOTIONEYE_STATUS_SENSOR,
+)
+from .coordinator import MotionEyeUpdateCoordinator
+from .event_queue import MotionEyeEventQueue
+from .provisioner import MotionEyeWebhookProvisioner
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,10 +37,20 @@ async def async_setup_entry(
 ) -> None:
     """Set up motionEye from a config entry."""
     entry_data = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        [
+            MotionEyeStatusSensor(
+                entry,
+                entry_data[CONF_COORDINATOR],
+                entry_data[CONF_WEBHOOK_PROVISIONER],
+                entry_data[CONF_EVENT_QUEUE],
+            )
+        ]
+    )
 
     @callback  # type: ignore[misc]
-    def camera_add(camera: dict[str, Any]) -> None:
-        """Add a new motionEye camera."""
+    def camera_add(cameras: list[dict[str, Any]]) -> None:
+        """Add new motionEye cameras."""
         async_add_entities(
             [
                 MotionEyeActionSensor(
@@ -39,6 +60,7 @@ async def async_setup_entry(
                     entry_data[CONF_COORDINATOR],
                     entry.options,
                 )
+                for camera in cameras
             ]
         )
 
@@ -53,7 +75,7 @@ class MotionEyeActionSensor(MotionEyeEntity, SensorEntity):  # type: ignore[misc
         config_entry_id: str,
         camera: dict[str, Any],
         client: MotionEyeClient,
-        coordinator: DataUpdateCoordinator,
+        coordinator: MotionEyeUpdateCoordinator,
         options: MappingProxyType[str, str],
     ) -> None:
         """Initialize an action sensor."""
@@ -73,6 +95,11 @@ class MotionEyeActionSensor(MotionEyeEntity, SensorEntity):  # type: ignore[misc
         camera_name = self._camera[KEY_NAME] if self._camera else ""
         return f"{camera_name} Actions"
 
+    @callback  # type: ignore[misc]
+    def _is_camera_update_relevant(self, changed_keys: set[str]) -> bool:
+        """Determine whether changes to the given camera keys affect this sensor."""
+        return bool(changed_keys & {KEY_ACTIONS, KEY_NAME})
+
     @property
     def state(self) -> int:
         """Return the state of the sensor."""
@@ -87,3 +114,88 @@ class MotionEyeActionSensor(MotionEyeEntity, SensorEntity):  # type: ignore[misc
     def entity_registry_enabled_default(self) -> bool:
         """Whether or not the entity is enabled by default."""
         return False
+
+
+class MotionEyeStatusSensor(CoordinatorEntity, SensorEntity):  # type: ignore[misc]
+    """motionEye server status sensor.
+
+    The state is the state of the circuit breaker of the server, the attributes
+    report how the server is polled and how its web hooks are handled. It is
+    checked on every refresh, successful or not, but only written when the status
+    changes: timings that differ on every poll are left out, and the web hooks are
+    counted per status rather than listed per camera.
+    """
+
+    def __init__(
+        self,
+        config_entry: ConfigEntry,
+        coordinator: MotionEyeUpdateCoordinator,
+        provisioner: MotionEyeWebhookProvisioner,
+        event_queue: MotionEyeEventQueue,
+    ) -> None:
+        """Initialize a status sensor."""
+        super().__init__(coordinator)
+        self._title = config_entry.title
+        self._unique_id = f"{config_entry.entry_id}_{TYPE_MOTIONEYE_STATUS_SENSOR}"
+        self._provisioner = provisioner
+        self._event_queue = event_queue
+        self._written_status: tuple[str, dict[str, Any]] | None = None
+
+    @property
+    def unique_id(self) -> str:
+        """Return a unique id for this instance."""
+        return self._unique_id
+
+    @property
+    def name(self) -> str:
+        """Return the name of the sensor."""
+        return f"{self._title} Status"
+
+    @property
+    def available(self) -> bool:
+        """Return True, the status is reported even if the server is unreachable."""
+        return True
+
+    @property
+    def state(self) -> str:
+        """Return the state of the sensor."""
+        state: str = self.coordinator.circuit_breaker.state
+        return state
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Add the polling, request and web hook status as attributes."""
+        coordinator: MotionEyeUpdateCoordinator = self.coordinator
+        poll_schedule = coordinator.scheduler.get_diagnostics(coordinator)
+        circuit_breaker = coordinator.circuit_breaker.get_diagnostics()
+        event_queue = self._event_queue.get_diagnostics()
+        webhooks: dict[str, int] = {}
+        for camera_status in self._provisioner.get_diagnostics().values():
+            webhooks[camera_status["status"]] = (
+                webhooks.get(camera_status["status"], 0) + 1
+            )
+        return {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "poll_schedule": {
+                key: poll_schedule[key] for key in ("slot", "slots", "slot_offset")
+            },
+            "circuit_breaker": {
+                key: circuit_breaker[key]
+                for key in ("consecutive_failures", "failed_probes")
+            },
+            "requests_in_flight": len(coordinator.task_tracker.get_diagnostics()),
+            "webhooks": webhooks,
+            "event_queue": {
+                key: event_queue[key]
+                for key in ("policy", "max_depth", "dropped", "rejected")
+            },
+        }
+
+    @callback  # type: ignore[misc]
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, only if the status changed since last written."""
+        status = (self.state, self.extra_state_attributes)
+        if status != self._written_status:
+            self._written_status = status
+            self.async_write_ha_state()
@@ -0,0 +1,45 @@
+"""HTTP connection pool shared by all motionEye config entries."""
+from __future__ import annotations
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+
+from .const import CONF_CLIENT_SESSION, DOMAIN
+
+# Maximum number of connections open to a single motionEye server, shared by the
+# API requests and the camera still image fetches. MJPEG streams are long-lived
+# and are kept off this pool.
+CONNECTION_LIMIT_PER_HOST = 10
+
+# Seconds an idle connection is kept open, longer than the scan interval so that
+# polling reuses the same connection.
+KEEPALIVE_TIMEOUT = 120
+
+
+@callback  # type: ignore[misc]
+def get_client_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Get the client session shared by all config entries.
+
+    The session is created on first use and closed when Home Assistant stops. It
+    keeps no cookies, as it is shared between motionEye servers.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if CONF_CLIENT_SESSION not in domain_data:
+        new_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit_per_host=CONNECTION_LIMIT_PER_HOST,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ),
+            cookie_jar=aiohttp.DummyCookieJar(),
+        )
+
+        async def _async_close_session(_event: Event) -> None:
+            """Close the shared session."""
+            await new_session.close()
+
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+        domain_data[CONF_CLIENT_SESSION] = new_session
+    session: aiohttp.ClientSession = domain_data[CONF_CLIENT_SESSION]
+    return session
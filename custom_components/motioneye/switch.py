@@ -18,11 +18,11 @@ from motioneye_client.const import (
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 from homeassistant.util import slugify
 
 from . import MotionEyeEntity, listen_for_new_cameras
 from .const import CONF_CLIENT, CONF_COORDINATOR, DOMAIN, TYPE_MOTIONEYE_SWITCH_BASE
+from .coordinator import MotionEyeUpdateCoordinator
 
 MOTIONEYE_SWITCHES = [
     KEY_MOTION_DETECTION,
@@ -41,8 +41,8 @@ async def async_setup_entry(
     entry_data = hass.data[DOMAIN][entry.entry_id]
 
     @callback  # type: ignore[misc]
-    def camera_add(camera: dict[str, Any]) -> None:
-        """Add a new motionEye camera."""
+    def camera_add(cameras: list[dict[str, Any]]) -> None:
+        """Add new motionEye cameras."""
         async_add_entities(
             [
                 MotionEyeSwitch(
@@ -53,6 +53,7 @@ async def async_setup_entry(
                     entry_data[CONF_COORDINATOR],
                     entry.options,
                 )
+                for camera in cameras
                 for switch_key in MOTIONEYE_SWITCHES
             ]
         )
@@ -70,7 +71,7 @@ class MotionEyeSwitch(MotionEyeEntity, SwitchEntity):  # type: ignore[misc]
         camera: dict[str, Any],
         switch_key: str,
         client: MotionEyeClient,
-        coordinator: DataUpdateCoordinator,
+        coordinator: MotionEyeUpdateCoordinator,
         options: MappingProxyType[str, str],
     ) -> None:
         """Initialize the switch."""
@@ -95,6 +96,11 @@ class MotionEyeSwitch(MotionEyeEntity, SwitchEntity):  # type: ignore[misc]
         camera_name = self._camera[KEY_NAME] if self._camera else ""
         return f"{camera_name} {self._switch_key_friendly_name}"
 
+    @callback  # type: ignore[misc]
+    def _is_camera_update_relevant(self, changed_keys: set[str]) -> bool:
+        """Determine whether changes to the given camera keys affect this switch."""
+        return bool(changed_keys & {self._switch_key, KEY_NAME})
+
     @property
     def is_on(self) -> bool:
         """Return true if the switch is on."""
@@ -102,14 +108,29 @@ class MotionEyeSwitch(MotionEyeEntity, SwitchEntity):  # type: ignore[misc]
 
     async def _async_send_set_camera(self, value: bool) -> None:
         """Set a switch value."""
+        if await self.coordinator.task_tracker.async_run(
+            self._async_write_camera(value),
+            f"set {self._switch_key} of camera {self._camera_id}",
+        ):
+            self.coordinator.async_reset_update_interval()
+            await self.coordinator.async_request_refresh()
+
+    async def _async_write_camera(self, value: bool) -> bool:
+        """Write a switch value to the camera, returning whether it was written."""
 
         # Fetch the very latest camera config to reduce the risk of updating with a
         # stale configuration.
-        camera = await self._client.async_get_camera(self._camera_id)
-        if camera:
-            camera[self._switch_key] = value
-            await self._client.async_set_camera(self._camera_id, camera)
-            await self.coordinator.async_refresh()
+        circuit_breaker = self.coordinator.circuit_breaker
+        camera = await circuit_breaker.async_call(
+            self._client.async_get_camera, self._camera_id
+        )
+        if not camera:
+            return False
+        camera[self._switch_key] = value
+        await circuit_breaker.async_call(
+            self._client.async_set_camera, self._camera_id, camera
+        )
+        return True
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""
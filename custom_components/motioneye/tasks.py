@@ -0,0 +1,69 @@
+"""Tracking of in-flight requests to a motionEye server."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Coroutine
+import logging
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds to wait on unload for in-flight requests, before cancelling them.
+TASK_DRAIN_TIMEOUT = 10
+
+T = TypeVar("T")
+
+
+class MotionEyeTaskTracker:
+    """Track the requests in flight to a motionEye server.
+
+    Requests that change a camera run as tracked tasks, shielded from the
+    cancellation of their caller, so that a read-modify-write of a camera is not
+    cut off halfway. On unload the tracked tasks are drained: they are given a
+    timeout to finish, and any still running are cancelled and reported.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the task tracker."""
+        self._hass = hass
+        self._tasks: dict[asyncio.Future, str] = {}
+
+    async def async_run(self, coro: Coroutine[Any, Any, T], description: str) -> T:
+        """Run a coroutine as a tracked task, returning its result."""
+        task = self._hass.async_create_task(coro)
+        self._tasks[task] = description
+        task.add_done_callback(self._async_task_done)
+        return await asyncio.shield(task)
+
+    @callback  # type: ignore[misc]
+    def _async_task_done(self, task: asyncio.Future) -> None:
+        """Stop tracking a finished task."""
+        self._tasks.pop(task, None)
+
+    async def async_drain(self, timeout: float = TASK_DRAIN_TIMEOUT) -> list[str]:
+        """Wait for the tracked tasks, cancelling those still running after a timeout.
+
+        Returns the descriptions of the cancelled tasks.
+        """
+        if not self._tasks:
+            return []
+        _, pending = await asyncio.wait(list(self._tasks), timeout=timeout)
+        if not pending:
+            return []
+
+        dropped = [self._tasks[task] for task in pending]
+        for task in pending:
+            task.cancel()
+        await asyncio.wait(pending)
+        _LOGGER.warning(
+            "Cancelled motionEye requests still running after %s seconds: %s",
+            timeout,
+            ", ".join(dropped),
+        )
+        return dropped
+
+    def get_diagnostics(self) -> list[str]:
+        """Get the descriptions of the tasks in flight."""
+        return list(self._tasks.values())
@@ -1,6 +1,7 @@
 """Tests for the motionEye integration."""
 from __future__ import annotations
 
+import copy
 from typing import Any
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -148,6 +149,7 @@ def create_mock_motioneye_client() -> AsyncMock:
     mock_client = AsyncMock()
     mock_client.async_client_login = AsyncMock(return_value={})
     mock_client.async_get_cameras = AsyncMock(return_value=TEST_CAMERAS)
+    mock_client.async_get_camera = AsyncMock(return_value=copy.deepcopy(TEST_CAMERA))
     mock_client.async_client_close = AsyncMock(return_value=True)
     mock_client.get_camera_snapshot_url = Mock(return_value="")
     mock_client.get_camera_stream_url = Mock(return_value="")
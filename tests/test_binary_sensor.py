@@ -10,10 +10,12 @@ from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.motioneye import get_motioneye_device_identifier
 from custom_components.motioneye.const import (
+    CONF_EVENT_COALESCER,
     CONF_EVENT_DURATION,
     DOMAIN,
     EVENT_FILE_STORED,
     EVENT_MOTION_DETECTED,
+    SIGNAL_CAMERA_EVENT,
     TYPE_MOTIONEYE_MOTION_BINARY_SENSOR,
 )
 from homeassistant.components.binary_sensor import (
@@ -23,6 +25,7 @@ from homeassistant.components.binary_sensor import (
 from homeassistant.const import CONF_DEVICE_ID
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.dispatcher import DATA_DISPATCHER
 import homeassistant.util.dt as dt_util
 
 from . import (
@@ -41,14 +44,13 @@ async def test_binary_sensor_events(hass: HomeAssistant) -> None:
     """Test the actions sensor."""
 
     async def fire_event(
-        now: datetime.datetime, event_type: str, device_id: str | None = None
+        now: datetime.datetime, event_type: str, device_id: str
     ) -> None:
-        """Fire an event."""
+        """Fire an event as received from motionEye."""
         with patch("homeassistant.helpers.event.dt_util.utcnow", return_value=now):
-            hass.bus.async_fire(
-                f"{DOMAIN}.{event_type}",
-                {CONF_DEVICE_ID: device_id} if device_id else {},
-            )
+            hass.data[DOMAIN][config_entry.entry_id][
+                CONF_EVENT_COALESCER
+            ].async_fire_event(device_id, event_type, {CONF_DEVICE_ID: device_id})
             await hass.async_block_till_done()
 
     register_test_entity(
@@ -140,8 +142,9 @@ async def test_binary_sensor_events(hass: HomeAssistant) -> None:
     assert entity_state
     assert entity_state.state == "off"
 
-    # Test missing device id.
-    await fire_event(now, EVENT_FILE_STORED)
+    # Events fired on the bus by others are not motionEye events.
+    hass.bus.async_fire(f"{DOMAIN}.{EVENT_FILE_STORED}", {CONF_DEVICE_ID: device.id})
+    await hass.async_block_till_done()
 
     entity_state = hass.states.get(TEST_BINARY_SENSOR_MOTION_ENTITY_ID)
     assert entity_state
@@ -151,7 +154,7 @@ async def test_binary_sensor_events(hass: HomeAssistant) -> None:
     assert entity_state
     assert entity_state.state == "off"
 
-    # Reload with a larger event duration.
+    # Apply a larger event duration.
     with patch(
         "custom_components.motioneye.MotionEyeClient",
         return_value=client,
@@ -170,6 +173,14 @@ async def test_binary_sensor_events(hass: HomeAssistant) -> None:
     assert entity_state
     assert entity_state.state == "on"
 
+    # The sensors stop listening once removed.
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    for event_type in (EVENT_MOTION_DETECTED, EVENT_FILE_STORED):
+        assert not hass.data[DATA_DISPATCHER].get(
+            SIGNAL_CAMERA_EVENT.format(event_type, device.id)
+        )
+
 
 async def test_binary_sensor_device_info(hass: HomeAssistant) -> None:
     """Verify device information includes expected details."""
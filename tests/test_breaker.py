@@ -0,0 +1,149 @@
+"""Test the motionEye circuit breaker."""
+import asyncio
+import logging
+from unittest.mock import AsyncMock, patch
+
+from motioneye_client.client import (
+    MotionEyeClientConnectionError,
+    MotionEyeClientInvalidAuthError,
+    MotionEyeClientRequestError,
+)
+import pytest
+
+from custom_components.motioneye.breaker import (
+    CIRCUIT_BREAKER_BASE_BACKOFF,
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    CIRCUIT_BREAKER_MAX_BACKOFF,
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    MotionEyeCircuitBreaker,
+    MotionEyeCircuitOpenError,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def test_circuit_breaker() -> None:
+    """Test the circuit opens, probes with backoff and closes again."""
+    breaker = MotionEyeCircuitBreaker()
+    failing = AsyncMock(side_effect=MotionEyeClientConnectionError)
+    succeeding = AsyncMock(return_value="result")
+
+    with patch(
+        "custom_components.motioneye.breaker.monotonic", return_value=1000
+    ) as mock_monotonic, patch(
+        "custom_components.motioneye.breaker.random.uniform",
+        side_effect=lambda low, high: high,
+    ):
+        assert await breaker.async_call(succeeding, 1, key="value") == "result"
+        assert succeeding.call_args == ((1,), {"key": "value"})
+
+        # Failures below the threshold leave the circuit closed.
+        for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD - 1):
+            with pytest.raises(MotionEyeClientConnectionError):
+                await breaker.async_call(failing)
+        assert breaker.state == STATE_CLOSED
+
+        with pytest.raises(MotionEyeClientConnectionError):
+            await breaker.async_call(failing)
+        assert breaker.state == STATE_OPEN
+        assert breaker.get_diagnostics() == {
+            "state": STATE_OPEN,
+            "consecutive_failures": CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            "failed_probes": 0,
+            "seconds_until_probe": CIRCUIT_BREAKER_BASE_BACKOFF,
+        }
+
+        # Requests fail fast while open.
+        failing.reset_mock()
+        with pytest.raises(MotionEyeCircuitOpenError):
+            await breaker.async_call(failing)
+        assert not failing.called
+
+        # Once the backoff expires a failed probe doubles the backoff.
+        mock_monotonic.return_value += CIRCUIT_BREAKER_BASE_BACKOFF
+        assert breaker.state == STATE_HALF_OPEN
+        with pytest.raises(MotionEyeClientConnectionError):
+            await breaker.async_call(failing)
+        assert failing.called
+        assert breaker.get_diagnostics()["seconds_until_probe"] == (
+            2 * CIRCUIT_BREAKER_BASE_BACKOFF
+        )
+
+        # The backoff is capped.
+        for _ in range(10):
+            mock_monotonic.return_value += CIRCUIT_BREAKER_MAX_BACKOFF
+            with pytest.raises(MotionEyeClientConnectionError):
+                await breaker.async_call(failing)
+        assert breaker.get_diagnostics()["seconds_until_probe"] == (
+            CIRCUIT_BREAKER_MAX_BACKOFF
+        )
+
+        # Only a single probe is let through at a time.
+        mock_monotonic.return_value += CIRCUIT_BREAKER_MAX_BACKOFF
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+        breaker.record_success()
+
+        # A successful probe closes the circuit.
+        assert await breaker.async_call(succeeding) == "result"
+        assert breaker.get_diagnostics() == {
+            "state": STATE_CLOSED,
+            "consecutive_failures": 0,
+            "failed_probes": 0,
+            "seconds_until_probe": None,
+        }
+
+
+async def test_circuit_breaker_cancelled_probe() -> None:
+    """Test a cancelled probe lets the next request probe."""
+    breaker = MotionEyeCircuitBreaker()
+    failing = AsyncMock(side_effect=MotionEyeClientConnectionError)
+
+    with patch(
+        "custom_components.motioneye.breaker.monotonic", return_value=1000
+    ) as mock_monotonic:
+        for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+            with pytest.raises(MotionEyeClientConnectionError):
+                await breaker.async_call(failing)
+
+        mock_monotonic.return_value += CIRCUIT_BREAKER_MAX_BACKOFF
+        with pytest.raises(asyncio.CancelledError):
+            await breaker.async_call(AsyncMock(side_effect=asyncio.CancelledError))
+        assert breaker.state == STATE_HALF_OPEN
+        assert breaker.allow_request()
+
+
+async def test_circuit_breaker_error_responses() -> None:
+    """Test error responses from a reachable server do not open the circuit."""
+    breaker = MotionEyeCircuitBreaker()
+    failing = AsyncMock(side_effect=asyncio.TimeoutError)
+
+    with patch(
+        "custom_components.motioneye.breaker.monotonic", return_value=1000
+    ) as mock_monotonic:
+        for error in (MotionEyeClientRequestError, MotionEyeClientInvalidAuthError):
+            for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+                with pytest.raises(error):
+                    await breaker.async_call(AsyncMock(side_effect=error))
+        assert breaker.get_diagnostics()["consecutive_failures"] == 0
+        assert breaker.state == STATE_CLOSED
+
+        # Nor do they reset the failures of timeouts.
+        with pytest.raises(asyncio.TimeoutError):
+            await breaker.async_call(failing)
+        with pytest.raises(MotionEyeClientRequestError):
+            await breaker.async_call(AsyncMock(side_effect=MotionEyeClientRequestError))
+        assert breaker.get_diagnostics()["consecutive_failures"] == 1
+
+        # An error response to a probe lets the next request probe.
+        for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD - 1):
+            with pytest.raises(asyncio.TimeoutError):
+                await breaker.async_call(failing)
+        assert breaker.state == STATE_OPEN
+        mock_monotonic.return_value += CIRCUIT_BREAKER_MAX_BACKOFF
+        with pytest.raises(MotionEyeClientRequestError):
+            await breaker.async_call(AsyncMock(side_effect=MotionEyeClientRequestError))
+        assert breaker.state == STATE_HALF_OPEN
+        assert breaker.allow_request()
@@ -2,7 +2,7 @@
 import copy
 import logging
 from typing import Any, cast
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 from aiohttp import web
 from aiohttp.web_exceptions import HTTPBadGateway
@@ -13,23 +13,36 @@ from motioneye_client.client import (
 )
 from motioneye_client.const import (
     KEY_CAMERAS,
+    KEY_ID,
     KEY_MOTION_DETECTION,
     KEY_NAME,
+    KEY_STREAMING_AUTH_MODE,
     KEY_VIDEO_STREAMING,
 )
 import pytest
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.motioneye import get_motioneye_device_identifier
+from custom_components.motioneye.breaker import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    STATE_CLOSED,
+    STATE_OPEN,
+)
 from custom_components.motioneye.const import (
+    CONF_COORDINATOR,
     CONF_STREAM_URL_TEMPLATE,
     CONF_SURVEILLANCE_USERNAME,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     MOTIONEYE_MANUFACTURER,
 )
-from homeassistant.components.camera import async_get_image, async_get_mjpeg_stream
-from homeassistant.const import CONF_URL
+from custom_components.motioneye.sensor import MotionEyeStatusSensor
+from homeassistant.components.camera import (
+    DOMAIN as CAMERA_DOMAIN,
+    async_get_image,
+    async_get_mjpeg_stream,
+)
+from homeassistant.const import CONF_URL, HTTP_DIGEST_AUTHENTICATION
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr, entity_registry as er
@@ -37,6 +50,8 @@ from homeassistant.helpers.device_registry import async_get_registry
 import homeassistant.util.dt as dt_util
 
 from . import (
+    TEST_BINARY_SENSOR_MOTION_ENTITY_ID,
+    TEST_CAMERA,
     TEST_CAMERA_DEVICE_IDENTIFIER,
     TEST_CAMERA_ENTITY_ID,
     TEST_CAMERA_ID,
@@ -44,6 +59,7 @@ from . import (
     TEST_CAMERAS,
     TEST_CONFIG_ENTRY_ID,
     TEST_SURVEILLANCE_USERNAME,
+    TEST_SWITCH_MOTION_DETECTION_ENTITY_ID,
     create_mock_motioneye_client,
     create_mock_motioneye_config_entry,
     setup_mock_motioneye_config_entry,
@@ -98,6 +114,49 @@ async def test_setup_camera_bad_data(hass: HomeAssistant) -> None:
     assert not hass.states.get(TEST_CAMERA_ENTITY_ID)
 
 
+async def test_setup_cameras_batched(hass: HomeAssistant) -> None:
+    """Test new cameras are added in a single batch."""
+    client = create_mock_motioneye_client()
+    other_camera = copy.deepcopy(TEST_CAMERA)
+    other_camera[KEY_ID] = TEST_CAMERA_ID + 1
+    other_camera[KEY_NAME] = "Other Camera"
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    cameras[KEY_CAMERAS].append(other_camera)
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+
+    with patch(
+        "homeassistant.helpers.entity_platform.EntityPlatform.async_add_entities",
+        autospec=True,
+    ) as mock_add_entities:
+        await setup_mock_motioneye_config_entry(hass, client=client)
+
+    # The status sensor of the server is added on its own.
+    camera_calls = [
+        mock_call
+        for mock_call in mock_add_entities.mock_calls
+        if not isinstance(mock_call.args[1][0], MotionEyeStatusSensor)
+    ]
+    entities_by_domain = {
+        mock_call.args[0].domain: mock_call.args[1] for mock_call in camera_calls
+    }
+    assert len(camera_calls) == len(entities_by_domain) == 4
+    assert {entity.name for entity in entities_by_domain["camera"]} == {
+        TEST_CAMERA_NAME,
+        "Other Camera",
+    }
+
+
+async def test_setup_camera_bad_data_after_good(hass: HomeAssistant) -> None:
+    """Test cameras before bad camera data are still added."""
+    client = create_mock_motioneye_client()
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    cameras[KEY_CAMERAS].append({KEY_ID: TEST_CAMERA_ID + 1})
+
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    await setup_mock_motioneye_config_entry(hass, client=client)
+    assert hass.states.get(TEST_CAMERA_ENTITY_ID)
+
+
 async def test_setup_camera_without_streaming(hass: HomeAssistant) -> None:
     """Test a camera without streaming enabled."""
     client = create_mock_motioneye_client()
@@ -157,6 +216,65 @@ async def test_setup_camera_new_data_camera_removed(hass: HomeAssistant) -> None
     )
 
 
+async def test_setup_camera_reconciliation(hass: HomeAssistant) -> None:
+    """Test devices are only reconciled when the cameras change."""
+    client = create_mock_motioneye_client()
+    await setup_mock_motioneye_config_entry(hass, client=client)
+    device_registry = dr.async_get(hass)
+
+    with patch(
+        "custom_components.motioneye.dr.async_entries_for_config_entry"
+    ) as mock_entries, patch.object(
+        device_registry, "async_remove_device"
+    ) as mock_remove:
+        cameras = copy.deepcopy(TEST_CAMERAS)
+        cameras[KEY_CAMERAS][0]["disk_used"] += 1
+        client.async_get_cameras = AsyncMock(return_value=cameras)
+        async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+        await hass.async_block_till_done()
+    assert not mock_entries.called
+    assert not mock_remove.called
+
+    # A removed camera that reappears is added again.
+    client.async_get_cameras = AsyncMock(return_value={KEY_CAMERAS: []})
+    async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    await hass.async_block_till_done()
+    assert not device_registry.async_get_device({TEST_CAMERA_DEVICE_IDENTIFIER})
+    assert not hass.states.get(TEST_CAMERA_ENTITY_ID)
+
+    client.async_get_cameras = AsyncMock(return_value=copy.deepcopy(TEST_CAMERAS))
+    async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    assert device_registry.async_get_device({TEST_CAMERA_DEVICE_IDENTIFIER})
+    assert hass.states.get(TEST_CAMERA_ENTITY_ID)
+
+
+async def test_setup_camera_removed_signal(hass: HomeAssistant) -> None:
+    """Test entities of a removed camera are removed without the device registry."""
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+    device_registry = dr.async_get(hass)
+    entity_ids = (
+        TEST_CAMERA_ENTITY_ID,
+        TEST_BINARY_SENSOR_MOTION_ENTITY_ID,
+        TEST_SWITCH_MOTION_DETECTION_ENTITY_ID,
+    )
+    for entity_id in entity_ids:
+        assert hass.states.get(entity_id)
+    assert TEST_CAMERA_ID in coordinator._camera_listeners
+
+    with patch.object(device_registry, "async_remove_device") as mock_remove:
+        client.async_get_cameras = AsyncMock(return_value={KEY_CAMERAS: []})
+        async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+        await hass.async_block_till_done()
+    assert mock_remove.called
+    for entity_id in entity_ids:
+        assert not hass.states.get(entity_id)
+    assert TEST_CAMERA_ID not in coordinator._camera_listeners
+
+
 async def test_setup_camera_new_data_error(hass: HomeAssistant) -> None:
     """Test a data refresh that fails."""
     client = create_mock_motioneye_client()
@@ -240,6 +358,79 @@ async def test_get_still_image_from_camera(
     assert image_handler.called
 
 
+async def test_get_still_image_circuit_breaker(
+    aiohttp_server: Any, hass: HomeAssistant
+) -> None:
+    """Test still images fail fast while motionEye is unreachable."""
+    image_handler = Mock(return_value=web.Response(body=b"image"))
+    app = web.Application()
+    app.add_routes([web.get("/foo", image_handler)])
+    server = await aiohttp_server(app)
+
+    client = create_mock_motioneye_client()
+    client.get_camera_snapshot_url = Mock(
+        return_value=f"http://localhost:{server.port}/foo"
+    )
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+
+    image = await async_get_image(hass, TEST_CAMERA_ENTITY_ID, timeout=1)
+    assert image.content == b"image"
+
+    # Error responses concern the camera alone, and leave the circuit closed.
+    image_handler.reset_mock()
+    image_handler.side_effect = lambda request: web.Response(status=500)
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(HomeAssistantError):
+            await async_get_image(hass, TEST_CAMERA_ENTITY_ID, timeout=1)
+    assert image_handler.call_count == CIRCUIT_BREAKER_FAILURE_THRESHOLD
+    assert coordinator.circuit_breaker.state == STATE_CLOSED
+
+    # An unreachable server opens the circuit.
+    await server.close()
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(HomeAssistantError):
+            await async_get_image(hass, TEST_CAMERA_ENTITY_ID, timeout=1)
+    assert coordinator.circuit_breaker.state == STATE_OPEN
+
+    with patch(
+        "custom_components.motioneye.camera.get_client_session"
+    ) as mock_get_client_session, pytest.raises(HomeAssistantError):
+        await async_get_image(hass, TEST_CAMERA_ENTITY_ID, timeout=1)
+    assert not mock_get_client_session.called
+
+
+async def test_get_still_image_and_stream_digest_auth(hass: HomeAssistant) -> None:
+    """Test digest authentication falls back to the MjpegCamera implementation."""
+    client = create_mock_motioneye_client()
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    cameras[KEY_CAMERAS][0][KEY_STREAMING_AUTH_MODE] = HTTP_DIGEST_AUTHENTICATION
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    await setup_mock_motioneye_config_entry(hass, client=client)
+
+    with patch(
+        "custom_components.motioneye.camera.MjpegCamera.async_camera_image",
+        return_value=b"image",
+    ):
+        image = await async_get_image(hass, TEST_CAMERA_ENTITY_ID, timeout=1)
+        assert image.content == b"image"
+
+    with patch(
+        "custom_components.motioneye.camera.MjpegCamera.async_camera_image",
+        return_value=None,
+    ), pytest.raises(HomeAssistantError):
+        await async_get_image(hass, TEST_CAMERA_ENTITY_ID, timeout=1)
+
+    with patch(
+        "custom_components.motioneye.camera.MjpegCamera.handle_async_mjpeg_stream",
+        return_value=None,
+    ) as mock_handle_stream:
+        await async_get_mjpeg_stream(
+            hass, cast(web.Request, None), TEST_CAMERA_ENTITY_ID
+        )
+    assert mock_handle_stream.called
+
+
 async def test_get_stream_from_camera(aiohttp_server: Any, hass: HomeAssistant) -> None:
     """Test getting a stream."""
 
@@ -268,12 +459,16 @@ async def test_get_stream_from_camera(aiohttp_server: Any, hass: HomeAssistant)
     await hass.async_block_till_done()
 
     # It won't actually get a stream from the dummy handler, so just catch
-    # the expected exception, then verify the right handler was called.
-    with pytest.raises(HTTPBadGateway):
+    # the expected exception, then verify the right handler was called. Streams
+    # are kept off the capped connection pool.
+    with patch(
+        "custom_components.motioneye.camera.get_client_session"
+    ) as mock_get_client_session, pytest.raises(HTTPBadGateway):
         await async_get_mjpeg_stream(
             hass, cast(web.Request, None), TEST_CAMERA_ENTITY_ID
         )
     assert stream_handler.called
+    assert not mock_get_client_session.called
 
 
 async def test_state_attributes(hass: HomeAssistant) -> None:
@@ -360,6 +555,41 @@ async def test_camera_option_stream_url_template(
     assert not client.get_camera_stream_url.called
 
 
+async def test_camera_options_update(hass: HomeAssistant) -> None:
+    """Verify options are applied without reloading, other changes reload."""
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    entity = hass.data[CAMERA_DOMAIN].get_entity(TEST_CAMERA_ENTITY_ID)
+    assert entity
+    client.get_camera_stream_url.reset_mock()
+
+    hass.config_entries.async_update_entry(
+        config_entry,
+        options={CONF_STREAM_URL_TEMPLATE: "http://stream/{{ name }}/{{ id }}"},
+    )
+    await hass.async_block_till_done()
+    assert hass.data[CAMERA_DOMAIN].get_entity(TEST_CAMERA_ENTITY_ID) is entity
+    assert entity._mjpeg_url == f"http://stream/{TEST_CAMERA_NAME}/{TEST_CAMERA_ID}"
+    assert not client.get_camera_stream_url.called
+    assert not client.async_client_close.called
+
+    # Changes to the URL require a reload.
+    with patch(
+        "custom_components.motioneye.MotionEyeClient",
+        return_value=client,
+    ):
+        hass.config_entries.async_update_entry(
+            config_entry,
+            data={**config_entry.data, CONF_URL: "http://other:8765"},
+        )
+        await hass.async_block_till_done()
+    assert client.async_client_close.called
+    new_entity = hass.data[CAMERA_DOMAIN].get_entity(TEST_CAMERA_ENTITY_ID)
+    assert new_entity
+    assert new_entity is not entity
+    assert new_entity._mjpeg_url == entity._mjpeg_url
+
+
 async def test_get_stream_from_camera_with_broken_host(
     aiohttp_server: Any, hass: HomeAssistant
 ) -> None:
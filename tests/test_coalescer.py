@@ -0,0 +1,154 @@
+"""Test the motionEye motion event coalescer."""
+from datetime import timedelta
+import logging
+from typing import Any
+from unittest.mock import Mock, call
+
+from motioneye_client.const import (
+    KEY_WEB_HOOK_CS_CHANGED_PIXELS,
+    KEY_WEB_HOOK_CS_MOTION_CENTER_X,
+    KEY_WEB_HOOK_CS_MOTION_CENTER_Y,
+    KEY_WEB_HOOK_CS_MOTION_HEIGHT,
+    KEY_WEB_HOOK_CS_MOTION_WIDTH,
+)
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+
+from custom_components.motioneye.coalescer import MotionEyeEventCoalescer
+from custom_components.motioneye.const import (
+    ATTR_CHANGED_PIXELS_PEAK,
+    ATTR_COALESCED_EVENTS,
+    ATTR_MOTION_BOUNDING_BOX,
+    DOMAIN,
+    EVENT_FILE_STORED,
+    EVENT_MOTION_DETECTED,
+    SIGNAL_CAMERA_EVENT,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+import homeassistant.util.dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+TEST_DEVICE_ID = "device"
+
+
+def _create_motion_event(
+    changed_pixels: str, center_x: str, center_y: str, width: str, height: str
+) -> dict[str, Any]:
+    """Create the data of a motion detected event."""
+    return {
+        KEY_WEB_HOOK_CS_CHANGED_PIXELS: changed_pixels,
+        KEY_WEB_HOOK_CS_MOTION_CENTER_X: center_x,
+        KEY_WEB_HOOK_CS_MOTION_CENTER_Y: center_y,
+        KEY_WEB_HOOK_CS_MOTION_WIDTH: width,
+        KEY_WEB_HOOK_CS_MOTION_HEIGHT: height,
+    }
+
+
+async def test_coalescer_disabled(hass: HomeAssistant) -> None:
+    """Test every event is fired without a window."""
+    events = async_capture_events(hass, f"{DOMAIN}.{EVENT_MOTION_DETECTED}")
+    coalescer = MotionEyeEventCoalescer(hass, 0)
+
+    for changed_pixels in ("1", "2", "3"):
+        coalescer.async_fire_event(
+            TEST_DEVICE_ID,
+            EVENT_MOTION_DETECTED,
+            {KEY_WEB_HOOK_CS_CHANGED_PIXELS: changed_pixels},
+        )
+    await hass.async_block_till_done()
+    assert [event.data for event in events] == [
+        {KEY_WEB_HOOK_CS_CHANGED_PIXELS: changed_pixels}
+        for changed_pixels in ("1", "2", "3")
+    ]
+
+
+async def test_coalescer_window(hass: HomeAssistant) -> None:
+    """Test events within a window are folded into a summary."""
+    events = async_capture_events(hass, f"{DOMAIN}.{EVENT_MOTION_DETECTED}")
+    coalescer = MotionEyeEventCoalescer(hass, 10)
+
+    first_event = _create_motion_event("100", "50", "50", "20", "10")
+    coalescer.async_fire_event(TEST_DEVICE_ID, EVENT_MOTION_DETECTED, first_event)
+    coalescer.async_fire_event(
+        TEST_DEVICE_ID,
+        EVENT_MOTION_DETECTED,
+        _create_motion_event("300", "100", "60", "40", "20"),
+    )
+    last_event = _create_motion_event("200", "30", "80", "10", "30")
+    coalescer.async_fire_event(TEST_DEVICE_ID, EVENT_MOTION_DETECTED, last_event)
+    coalescer.async_fire_event("other", EVENT_MOTION_DETECTED, first_event)
+    await hass.async_block_till_done()
+    assert [event.data for event in events] == [first_event, first_event]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert len(events) == 3
+    assert events[-1].data == {
+        **last_event,
+        ATTR_COALESCED_EVENTS: 2,
+        ATTR_CHANGED_PIXELS_PEAK: 300,
+        ATTR_MOTION_BOUNDING_BOX: {"x": 25, "y": 50, "width": 95, "height": 45},
+    }
+
+    # Events without valid values are still counted.
+    coalescer.async_fire_event(TEST_DEVICE_ID, EVENT_MOTION_DETECTED, first_event)
+    coalescer.async_fire_event(
+        TEST_DEVICE_ID, EVENT_MOTION_DETECTED, {"other": "value"}
+    )
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=20))
+    await hass.async_block_till_done()
+    assert len(events) == 5
+    assert events[-1].data == {
+        "other": "value",
+        ATTR_COALESCED_EVENTS: 1,
+        ATTR_CHANGED_PIXELS_PEAK: None,
+        ATTR_MOTION_BOUNDING_BOX: None,
+    }
+
+    # A changed window applies from the next window opened.
+    coalescer.async_set_window(0)
+    coalescer.async_fire_event(TEST_DEVICE_ID, EVENT_MOTION_DETECTED, first_event)
+    coalescer.async_fire_event(TEST_DEVICE_ID, EVENT_MOTION_DETECTED, first_event)
+    await hass.async_block_till_done()
+    assert len(events) == 7
+
+
+async def test_coalescer_shutdown(hass: HomeAssistant) -> None:
+    """Test shutting down fires the summaries of open windows."""
+    events = async_capture_events(hass, f"{DOMAIN}.{EVENT_MOTION_DETECTED}")
+    coalescer = MotionEyeEventCoalescer(hass, 10)
+
+    event = _create_motion_event("100", "50", "50", "20", "10")
+    for _ in range(3):
+        coalescer.async_fire_event(TEST_DEVICE_ID, EVENT_MOTION_DETECTED, event)
+    coalescer.async_fire_event("other", EVENT_MOTION_DETECTED, event)
+    coalescer.async_shutdown()
+    await hass.async_block_till_done()
+    assert len(events) == 3
+    assert events[-1].data[ATTR_COALESCED_EVENTS] == 2
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert len(events) == 3
+
+
+async def test_coalescer_signals_device(hass: HomeAssistant) -> None:
+    """Test events are signalled to the entities of their device only."""
+    events = async_capture_events(hass, f"{DOMAIN}.{EVENT_FILE_STORED}")
+    coalescer = MotionEyeEventCoalescer(hass, 10)
+    handler = Mock()
+    async_dispatcher_connect(
+        hass, SIGNAL_CAMERA_EVENT.format(EVENT_FILE_STORED, TEST_DEVICE_ID), handler
+    )
+
+    # Only motion detected events are coalesced.
+    for _ in range(2):
+        coalescer.async_fire_event(TEST_DEVICE_ID, EVENT_FILE_STORED, {"one": "1"})
+    coalescer.async_fire_event("other", EVENT_FILE_STORED, {"one": "1"})
+    await hass.async_block_till_done()
+    assert len(events) == 3
+    assert handler.call_args_list == [call({"one": "1"})] * 2
@@ -1,30 +1,55 @@
 """Test the motionEye config flow."""
+from datetime import timedelta
 import logging
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, call, patch
 
 from motioneye_client.client import (
     MotionEyeClientConnectionError,
     MotionEyeClientInvalidAuthError,
     MotionEyeClientRequestError,
 )
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from motioneye_client.const import KEY_WEB_HOOK_CS_CAMERA_ID
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
+from custom_components.motioneye.breaker import CIRCUIT_BREAKER_FAILURE_THRESHOLD
 from custom_components.motioneye.const import (
     CONF_ADMIN_PASSWORD,
     CONF_ADMIN_USERNAME,
+    CONF_CLIENT,
+    CONF_COORDINATOR,
     CONF_EVENT_DURATION,
+    CONF_EVENT_QUEUE_POLICY,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_MOTION_EVENT_WINDOW,
+    CONF_OFFLINE_SETUP,
     CONF_STREAM_URL_TEMPLATE,
     CONF_SURVEILLANCE_PASSWORD,
     CONF_SURVEILLANCE_USERNAME,
+    CONF_WEBHOOK_FILE_STORED_KEYS,
+    CONF_WEBHOOK_MOTION_DETECTED_KEYS,
     CONF_WEBHOOK_SET,
     CONF_WEBHOOK_SET_OVERWRITE,
     DOMAIN,
+    EVENT_QUEUE_POLICY_REJECT,
 )
+from custom_components.motioneye.routing import get_webhook_routes
+from custom_components.motioneye.session import get_client_session
 from homeassistant import config_entries, data_entry_flow, setup
+from homeassistant.components.camera import DOMAIN as CAMERA_DOMAIN
 from homeassistant.const import CONF_URL, CONF_WEBHOOK_ID
 from homeassistant.core import HomeAssistant
-
-from . import TEST_URL, create_mock_motioneye_client, create_mock_motioneye_config_entry
+import homeassistant.util.dt as dt_util
+
+from . import (
+    TEST_CAMERA_ENTITY_ID,
+    TEST_URL,
+    create_mock_motioneye_client,
+    create_mock_motioneye_config_entry,
+    setup_mock_motioneye_config_entry,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -279,6 +304,73 @@ async def test_user_request_error(hass: HomeAssistant) -> None:
     assert mock_client.async_client_close.called
 
 
+async def test_reauth_loaded(hass: HomeAssistant) -> None:
+    """Test a reauth of a loaded entry swaps in a client with the new credentials."""
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+    entity = hass.data[CAMERA_DOMAIN].get_entity(TEST_CAMERA_ENTITY_ID)
+    assert entity
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        coordinator.circuit_breaker.record_failure()
+    client.async_get_cameras.reset_mock()
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN,
+        context={
+            "source": config_entries.SOURCE_REAUTH,
+            "entry_id": config_entry.entry_id,
+        },
+    )
+    new_data = {
+        CONF_URL: TEST_URL,
+        CONF_ADMIN_USERNAME: "admin-username",
+        CONF_ADMIN_PASSWORD: "admin-password",
+        CONF_SURVEILLANCE_USERNAME: "surveillance-username",
+        CONF_SURVEILLANCE_PASSWORD: "surveillance-password",
+    }
+    new_client = create_mock_motioneye_client()
+    with patch(
+        "custom_components.motioneye.MotionEyeClient",
+        return_value=new_client,
+    ) as mock_client_cls, patch(
+        "custom_components.motioneye.async_setup_entry"
+    ) as mock_setup_entry:
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], new_data
+        )
+        await hass.async_block_till_done()
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+        await hass.async_block_till_done()
+
+    assert result["type"] == data_entry_flow.RESULT_TYPE_ABORT
+    assert result["reason"] == "reauth_successful"
+    assert not mock_setup_entry.called
+    assert config_entry.state == config_entries.ConfigEntryState.LOADED
+    assert not client.async_client_close.called
+    assert hass.data[CAMERA_DOMAIN].get_entity(TEST_CAMERA_ENTITY_ID) is entity
+
+    assert mock_client_cls.call_args == call(
+        TEST_URL,
+        admin_username="admin-username",
+        admin_password="admin-password",
+        surveillance_username="surveillance-username",
+        surveillance_password="surveillance-password",
+        session=get_client_session(hass),
+    )
+    assert hass.data[DOMAIN][config_entry.entry_id][CONF_CLIENT] is new_client
+    routes = get_webhook_routes(hass)
+    assert routes
+    assert all(route.client is new_client for route in routes.values())
+    assert entity._client is new_client
+    assert entity._username == "surveillance-username"
+    assert entity._password == "surveillance-password"
+    assert coordinator.circuit_breaker.state == "closed"
+    assert new_client.async_client_login.called
+    assert new_client.async_get_cameras.called
+    assert not client.async_get_cameras.called
+
+
 async def test_reauth(hass: HomeAssistant) -> None:
     """Test a reauth."""
     config_data = {
@@ -517,6 +609,12 @@ async def test_options(hass: HomeAssistant) -> None:
         assert result["data"][CONF_WEBHOOK_SET_OVERWRITE]
         assert CONF_STREAM_URL_TEMPLATE not in result["data"]
         assert CONF_EVENT_DURATION not in result["data"]
+        assert CONF_MAX_SCAN_INTERVAL not in result["data"]
+        assert CONF_MOTION_EVENT_WINDOW not in result["data"]
+        assert CONF_EVENT_QUEUE_POLICY not in result["data"]
+        assert CONF_OFFLINE_SETUP not in result["data"]
+        assert CONF_WEBHOOK_MOTION_DETECTED_KEYS not in result["data"]
+        assert CONF_WEBHOOK_FILE_STORED_KEYS not in result["data"]
         assert len(mock_setup.mock_calls) == 0
         assert len(mock_setup_entry.mock_calls) == 0
 
@@ -541,14 +639,35 @@ async def test_advanced_options(hass: HomeAssistant) -> None:
         result = await hass.config_entries.options.async_init(
             config_entry.entry_id, context={"show_advanced_options": True}
         )
+        user_input = {
+            CONF_WEBHOOK_SET: True,
+            CONF_WEBHOOK_SET_OVERWRITE: True,
+            CONF_STREAM_URL_TEMPLATE: "http://moo",
+            CONF_EVENT_DURATION: 15,
+            CONF_MAX_SCAN_INTERVAL: 300,
+            CONF_MOTION_EVENT_WINDOW: 5,
+            CONF_EVENT_QUEUE_POLICY: EVENT_QUEUE_POLICY_REJECT,
+            CONF_OFFLINE_SETUP: True,
+            CONF_WEBHOOK_MOTION_DETECTED_KEYS: [KEY_WEB_HOOK_CS_CAMERA_ID],
+            CONF_WEBHOOK_FILE_STORED_KEYS: [],
+        }
+
+        # A motion event window longer than the event duration is rejected, and
+        # the input shown again.
         result = await hass.config_entries.options.async_configure(
             result["flow_id"],
-            user_input={
-                CONF_WEBHOOK_SET: True,
-                CONF_WEBHOOK_SET_OVERWRITE: True,
-                CONF_STREAM_URL_TEMPLATE: "http://moo",
-                CONF_EVENT_DURATION: 15,
-            },
+            user_input={**user_input, CONF_MOTION_EVENT_WINDOW: 20},
+        )
+        assert result["type"] == data_entry_flow.RESULT_TYPE_FORM
+        assert result["errors"] == {
+            CONF_MOTION_EVENT_WINDOW: "motion_event_window_too_long"
+        }
+        defaults = {str(key): key.default() for key in result["data_schema"].schema}
+        assert defaults[CONF_MOTION_EVENT_WINDOW] == 20
+        assert defaults[CONF_STREAM_URL_TEMPLATE] == "http://moo"
+
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"], user_input=user_input
         )
         await hass.async_block_till_done()
         assert result["type"] == data_entry_flow.RESULT_TYPE_CREATE_ENTRY
@@ -556,5 +675,13 @@ async def test_advanced_options(hass: HomeAssistant) -> None:
         assert result["data"][CONF_WEBHOOK_SET_OVERWRITE]
         assert result["data"][CONF_STREAM_URL_TEMPLATE] == "http://moo"
         assert result["data"][CONF_EVENT_DURATION] == 15
+        assert result["data"][CONF_MAX_SCAN_INTERVAL] == 300
+        assert result["data"][CONF_MOTION_EVENT_WINDOW] == 5
+        assert result["data"][CONF_EVENT_QUEUE_POLICY] == EVENT_QUEUE_POLICY_REJECT
+        assert result["data"][CONF_OFFLINE_SETUP]
+        assert result["data"][CONF_WEBHOOK_MOTION_DETECTED_KEYS] == [
+            KEY_WEB_HOOK_CS_CAMERA_ID
+        ]
+        assert result["data"][CONF_WEBHOOK_FILE_STORED_KEYS] == []
         assert len(mock_setup.mock_calls) == 0
         assert len(mock_setup_entry.mock_calls) == 0
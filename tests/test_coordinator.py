@@ -0,0 +1,611 @@
+"""Test the motionEye data update coordinator."""
+import asyncio
+import copy
+from datetime import timedelta
+import logging
+from typing import Any
+from unittest.mock import AsyncMock, Mock, call, patch
+
+from motioneye_client.client import (
+    MotionEyeClientError,
+    MotionEyeClientInvalidAuthError,
+)
+from motioneye_client.const import (
+    KEY_CAMERAS,
+    KEY_ID,
+    KEY_MOTION_DETECTION,
+    KEY_NAME,
+    KEY_WEB_HOOK_NOTIFICATIONS_URL,
+)
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.motioneye.const import (
+    CONF_COORDINATOR,
+    CONF_MAX_SCAN_INTERVAL,
+    CONF_OFFLINE_SETUP,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    SERVICE_SET_TEXT_OVERLAY,
+    STORAGE_KEY,
+)
+from custom_components.motioneye.coordinator import (
+    CACHE_SAVE_DELAY,
+    DIRTY_CAMERA_REFRESH_COOLDOWN,
+    REQUEST_REFRESH_MAX_DELAY,
+    REQUEST_REFRESH_QUIET_PERIOD,
+    get_changed_camera_keys,
+    index_cameras,
+    redact_camera,
+)
+from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
+from homeassistant.config import async_process_ha_core_config
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from . import (
+    TEST_CAMERA,
+    TEST_CAMERA_ENTITY_ID,
+    TEST_CAMERA_ID,
+    TEST_CAMERA_NAME,
+    TEST_CAMERAS,
+    TEST_CONFIG_ENTRY_ID,
+    TEST_SWITCH_MOTION_DETECTION_ENTITY_ID,
+    create_mock_motioneye_client,
+    create_mock_motioneye_config_entry,
+    setup_mock_motioneye_config_entry,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def test_index_cameras() -> None:
+    """Test cameras are indexed by camera id."""
+    other_camera = copy.deepcopy(TEST_CAMERA)
+    other_camera[KEY_ID] = TEST_CAMERA_ID + 1
+    no_id_camera = copy.deepcopy(TEST_CAMERA)
+    del no_id_camera[KEY_ID]
+
+    assert index_cameras(None) == {}
+    assert index_cameras({}) == {}
+    assert index_cameras({KEY_CAMERAS: [TEST_CAMERA, other_camera, no_id_camera]}) == {
+        TEST_CAMERA_ID: TEST_CAMERA,
+        TEST_CAMERA_ID + 1: other_camera,
+    }
+
+
+async def test_coordinator_camera_index(hass: HomeAssistant) -> None:
+    """Test the coordinator camera index follows the latest data."""
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+
+    assert coordinator.get_camera(TEST_CAMERA_ID) == TEST_CAMERA
+    assert coordinator.get_camera(TEST_CAMERA_ID + 1) is None
+
+    # The index is reused while the data is unchanged.
+    assert coordinator.cameras is coordinator.cameras
+
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    cameras[KEY_CAMERAS][0][KEY_NAME] = "Renamed"
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+
+    camera = coordinator.get_camera(TEST_CAMERA_ID)
+    assert camera
+    assert camera[KEY_NAME] == "Renamed"
+
+
+async def test_get_changed_camera_keys() -> None:
+    """Test changed camera keys are detected."""
+    camera = copy.deepcopy(TEST_CAMERA)
+    assert get_changed_camera_keys(TEST_CAMERA, camera) == set()
+
+    camera["disk_used"] += 1
+    del camera[KEY_NAME]
+    camera["new_key"] = True
+    assert get_changed_camera_keys(TEST_CAMERA, camera) == {
+        "disk_used",
+        KEY_NAME,
+        "new_key",
+    }
+    assert get_changed_camera_keys(None, {KEY_ID: 1}) == {KEY_ID}
+    assert get_changed_camera_keys({KEY_ID: 1}, None) == {KEY_ID}
+
+
+async def test_coordinator_camera_listeners(hass: HomeAssistant) -> None:
+    """Test camera listeners are only called for changed cameras."""
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+
+    other_camera_id = TEST_CAMERA_ID + 1
+    listener = Mock()
+    other_listener = Mock()
+    unsub = coordinator.async_add_camera_listener(TEST_CAMERA_ID, listener)
+    unsub_other = coordinator.async_add_camera_listener(other_camera_id, other_listener)
+
+    async def refresh() -> None:
+        async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+        await hass.async_block_till_done()
+
+    # Identical data: nobody is notified.
+    client.async_get_cameras = AsyncMock(return_value=copy.deepcopy(TEST_CAMERAS))
+    await refresh()
+    assert not listener.called
+    assert not other_listener.called
+
+    # A changed camera notifies only its own listeners, with the changed keys.
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    cameras[KEY_CAMERAS][0][KEY_MOTION_DETECTION] = False
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    await refresh()
+    assert listener.call_args_list == [call({KEY_MOTION_DETECTION})]
+    assert not other_listener.called
+
+    # A new camera notifies its listeners with every key.
+    other_camera = copy.deepcopy(TEST_CAMERA)
+    other_camera[KEY_ID] = other_camera_id
+    cameras = copy.deepcopy(cameras)
+    cameras[KEY_CAMERAS].append(other_camera)
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    listener.reset_mock()
+    await refresh()
+    assert not listener.called
+    assert other_listener.call_args == call(set(other_camera.keys()))
+
+    # Availability changes notify everybody.
+    client.async_get_cameras = AsyncMock(side_effect=MotionEyeClientError)
+    listener.reset_mock()
+    other_listener.reset_mock()
+    await refresh()
+    assert listener.call_args_list == [call(None)]
+    assert other_listener.call_args_list == [call(None)]
+
+    # Removed listeners are not called.
+    unsub_other()
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    listener.reset_mock()
+    other_listener.reset_mock()
+    await refresh()
+    assert listener.call_args_list == [call(None)]
+    assert not other_listener.called
+
+    unsub()
+
+
+async def test_coordinator_adaptive_update_interval(hass: HomeAssistant) -> None:
+    """Test the update interval backs off while cameras are unchanged."""
+    client = create_mock_motioneye_client()
+    client.async_get_camera = AsyncMock(return_value=copy.deepcopy(TEST_CAMERA))
+    config_entry = create_mock_motioneye_config_entry(
+        hass, options={CONF_MAX_SCAN_INTERVAL: 100}
+    )
+    await setup_mock_motioneye_config_entry(
+        hass, config_entry=config_entry, client=client
+    )
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+
+    async def refresh(delay: timedelta) -> None:
+        async_fire_time_changed(hass, dt_util.utcnow() + delay)
+        await hass.async_block_till_done()
+
+    # Unchanged data doubles the interval, up to the configured maximum.
+    await refresh(DEFAULT_SCAN_INTERVAL)
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    client.async_get_cameras.reset_mock()
+    await refresh(DEFAULT_SCAN_INTERVAL)
+    assert not client.async_get_cameras.called
+
+    await refresh(timedelta(seconds=60))
+    assert client.async_get_cameras.called
+    assert coordinator.update_interval == timedelta(seconds=100)
+
+    # Changed data returns to the fastest interval.
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    cameras[KEY_CAMERAS][0][KEY_NAME] = "Renamed"
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    await refresh(timedelta(seconds=100))
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+
+    # As does a switch write...
+    await refresh(DEFAULT_SCAN_INTERVAL)
+    assert coordinator.update_interval == timedelta(seconds=60)
+    cameras = copy.deepcopy(cameras)
+    cameras[KEY_CAMERAS][0][KEY_MOTION_DETECTION] = False
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: TEST_SWITCH_MOTION_DETECTION_ENTITY_ID},
+        blocking=True,
+    )
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+
+    # ... or a service call that changes a camera.
+    await refresh(DEFAULT_SCAN_INTERVAL)
+    assert coordinator.update_interval == timedelta(seconds=60)
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_SET_TEXT_OVERLAY,
+        {ATTR_ENTITY_ID: TEST_CAMERA_ENTITY_ID, "left_text": "timestamp"},
+        blocking=True,
+    )
+    assert coordinator.update_interval == DEFAULT_SCAN_INTERVAL
+
+    client.async_get_cameras.reset_mock()
+    await refresh(DEFAULT_SCAN_INTERVAL)
+    assert client.async_get_cameras.called
+    assert coordinator.update_interval > timedelta(seconds=40)
+
+    # The maximum is changed in place when the options change.
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MAX_SCAN_INTERVAL: 40}
+    )
+    await hass.async_block_till_done()
+    assert hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR] is coordinator
+    assert coordinator.max_update_interval == timedelta(seconds=40)
+    assert coordinator.update_interval == timedelta(seconds=40)
+
+    client.async_get_cameras.reset_mock()
+    await refresh(timedelta(seconds=40))
+    assert client.async_get_cameras.called
+
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MAX_SCAN_INTERVAL: 100}
+    )
+    await hass.async_block_till_done()
+    assert coordinator.max_update_interval == timedelta(seconds=100)
+    assert coordinator.update_interval == timedelta(seconds=40)
+
+
+async def test_coordinator_dirty_cameras(hass: HomeAssistant) -> None:
+    """Test dirty cameras are refreshed between polls."""
+    client = create_mock_motioneye_client()
+    config_entry = create_mock_motioneye_config_entry(hass)
+
+    # Keep scheduled refreshes out of the way of the dirty camera refreshes.
+    config_entry.pref_disable_polling = True
+    await setup_mock_motioneye_config_entry(
+        hass, config_entry=config_entry, client=client
+    )
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+
+    async def refresh_dirty_cameras() -> None:
+        async_fire_time_changed(
+            hass,
+            dt_util.utcnow() + timedelta(seconds=DIRTY_CAMERA_REFRESH_COOLDOWN),
+        )
+        await hass.async_block_till_done()
+
+    camera = copy.deepcopy(TEST_CAMERA)
+    camera[KEY_NAME] = "Renamed"
+    client.async_get_camera = AsyncMock(return_value=camera)
+
+    # Dirty cameras are gathered, unknown cameras are ignored.
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID)
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID)
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID + 1)
+    await hass.async_block_till_done()
+    assert not client.async_get_camera.called
+
+    client.async_get_cameras.reset_mock()
+    await refresh_dirty_cameras()
+    assert client.async_get_camera.call_args_list == [call(TEST_CAMERA_ID)]
+    assert not client.async_get_cameras.called
+    assert coordinator.get_camera(TEST_CAMERA_ID) == camera
+
+    # Failed or empty camera fetches leave the data untouched.
+    data = coordinator.data
+    for side_effect in (MotionEyeClientError, [None], [{}]):
+        client.async_get_camera = AsyncMock(side_effect=side_effect)
+        coordinator.async_mark_camera_dirty(TEST_CAMERA_ID)
+        await refresh_dirty_cameras()
+        assert client.async_get_camera.called
+        assert coordinator.data is data
+
+    # A full refresh covers the dirty cameras.
+    client.async_get_camera = AsyncMock(return_value=camera)
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID)
+    await coordinator.async_refresh()
+    await refresh_dirty_cameras()
+    assert not client.async_get_camera.called
+
+    # A dirty camera is fetched once a full refresh in progress has finished.
+    release = asyncio.Event()
+
+    async def get_cameras() -> dict[str, Any]:
+        await release.wait()
+        return {KEY_CAMERAS: [camera]}
+
+    client.async_get_cameras = AsyncMock(side_effect=get_cameras)
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0)
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID)
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DIRTY_CAMERA_REFRESH_COOLDOWN)
+    )
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert not client.async_get_camera.called
+    release.set()
+    await refresh
+    await hass.async_block_till_done()
+    assert client.async_get_camera.call_count == 1
+
+    # Unless a full refresh queued meanwhile has covered it.
+    release.clear()
+    client.async_get_camera.reset_mock()
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0)
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID)
+    hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0)
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=DIRTY_CAMERA_REFRESH_COOLDOWN)
+    )
+    release.set()
+    await hass.async_block_till_done()
+    assert not client.async_get_camera.called
+
+    # Several dirty cameras are fetched with a single request.
+    other_camera = copy.deepcopy(TEST_CAMERA)
+    other_camera[KEY_ID] = TEST_CAMERA_ID + 1
+    client.async_get_cameras = AsyncMock(
+        return_value={KEY_CAMERAS: [camera, other_camera]}
+    )
+    await coordinator.async_refresh()
+    client.async_get_camera.reset_mock()
+    client.async_get_cameras.reset_mock()
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID)
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID + 1)
+    await refresh_dirty_cameras()
+    assert client.async_get_cameras.call_count == 1
+    assert not client.async_get_camera.called
+
+    # Cameras are not refreshed while the coordinator is failing.
+    client.async_get_cameras = AsyncMock(side_effect=MotionEyeClientError)
+    await coordinator.async_refresh()
+    client.async_get_cameras.reset_mock()
+    coordinator.async_mark_camera_dirty(TEST_CAMERA_ID)
+    await refresh_dirty_cameras()
+    assert not client.async_get_camera.called
+    assert not client.async_get_cameras.called
+
+
+async def test_coordinator_request_refresh(hass: HomeAssistant) -> None:
+    """Test requested refreshes are coalesced and converge."""
+    client = create_mock_motioneye_client()
+    config_entry = create_mock_motioneye_config_entry(hass)
+
+    # Keep scheduled refreshes out of the way of the requested refreshes.
+    config_entry.pref_disable_polling = True
+    await setup_mock_motioneye_config_entry(
+        hass, config_entry=config_entry, client=client
+    )
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+
+    async def wait_quiet_period(seconds: float = REQUEST_REFRESH_QUIET_PERIOD) -> None:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+        await hass.async_block_till_done()
+
+    # A burst of requests results in a single refresh.
+    client.async_get_cameras.reset_mock()
+    for _ in range(3):
+        await coordinator.async_request_refresh()
+    await hass.async_block_till_done()
+    assert not client.async_get_cameras.called
+
+    await wait_quiet_period()
+    assert client.async_get_cameras.call_count == 1
+
+    # A steady stream of requests cannot delay the refresh indefinitely.
+    client.async_get_cameras.reset_mock()
+    with patch(
+        "custom_components.motioneye.coordinator.monotonic",
+        side_effect=[100, 100 + REQUEST_REFRESH_MAX_DELAY - 0.1],
+    ):
+        await coordinator.async_request_refresh()
+        await coordinator.async_request_refresh()
+    await wait_quiet_period(0.2)
+    assert client.async_get_cameras.call_count == 1
+
+    # A refresh started after a request covers it.
+    client.async_get_cameras.reset_mock()
+    await coordinator.async_request_refresh()
+    await coordinator.async_refresh()
+    await wait_quiet_period()
+    assert client.async_get_cameras.call_count == 1
+
+    # A request made while a refresh is in progress results in another refresh,
+    # as the refresh in progress may not reflect the request.
+    release = asyncio.Event()
+
+    async def get_cameras() -> dict[str, Any]:
+        await release.wait()
+        return copy.deepcopy(TEST_CAMERAS)
+
+    client.async_get_cameras = AsyncMock(side_effect=get_cameras)
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    await asyncio.sleep(0)
+    await coordinator.async_request_refresh()
+    release.set()
+    await refresh
+    assert client.async_get_cameras.call_count == 1
+    await wait_quiet_period()
+    assert client.async_get_cameras.call_count == 2
+
+    # Pending requests are dropped on unload.
+    client.async_get_cameras.reset_mock()
+    await coordinator.async_request_refresh()
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await wait_quiet_period()
+    assert not client.async_get_cameras.called
+
+
+async def test_redact_camera() -> None:
+    """Test secrets are removed from cameras."""
+    camera = redact_camera(
+        {
+            **TEST_CAMERA,
+            KEY_WEB_HOOK_NOTIFICATIONS_URL: "http://hass/api/webhook/secret",
+        }
+    )
+    assert camera[KEY_NAME] == TEST_CAMERA_NAME
+    assert camera[KEY_ID] == TEST_CAMERA_ID
+    for key in (
+        "network_password",
+        "upload_password",
+        "upload_username",
+        "upload_authorization_key",
+        "device_url",
+        KEY_WEB_HOOK_NOTIFICATIONS_URL,
+    ):
+        assert key not in camera
+
+
+async def test_coordinator_cache(hass: HomeAssistant, hass_storage: Any) -> None:
+    """Test the cameras are cached, without secrets."""
+    storage_key = STORAGE_KEY.format(TEST_CONFIG_ENTRY_ID)
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    assert storage_key not in hass_storage
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=CACHE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert hass_storage[storage_key]["data"] == {
+        KEY_CAMERAS: [redact_camera(TEST_CAMERA)]
+    }
+
+    # Pending changes are saved on unload.
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    cameras[KEY_CAMERAS][0][KEY_NAME] = "Renamed"
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+    await coordinator.async_refresh()
+    assert hass_storage[storage_key]["data"][KEY_CAMERAS][0][KEY_NAME] != "Renamed"
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass_storage[storage_key]["data"][KEY_CAMERAS][0][KEY_NAME] == "Renamed"
+
+    # The cache is removed with the config entry.
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert storage_key not in hass_storage
+
+
+async def test_setup_from_cache(hass: HomeAssistant, hass_storage: Any) -> None:
+    """Test entities are created from the cache before motionEye responds."""
+    cached_camera = redact_camera(TEST_CAMERA)
+    cached_camera[KEY_NAME] = "Cached"
+    hass_storage[STORAGE_KEY.format(TEST_CONFIG_ENTRY_ID)] = {
+        "version": 1,
+        "key": STORAGE_KEY.format(TEST_CONFIG_ENTRY_ID),
+        "data": {KEY_CAMERAS: [cached_camera]},
+    }
+
+    # The entity ids are based on the cached camera name.
+    entity_id = "switch.cached_motion_detection"
+    release = asyncio.Event()
+
+    async def get_cameras() -> dict[str, Any]:
+        await release.wait()
+        return copy.deepcopy(TEST_CAMERAS)
+
+    client = create_mock_motioneye_client()
+    client.async_get_cameras = AsyncMock(side_effect=get_cameras)
+    config_entry = create_mock_motioneye_config_entry(hass)
+    await async_process_ha_core_config(hass, {"external_url": "https://example.com"})
+
+    with patch(
+        "custom_components.motioneye.MotionEyeClient",
+        return_value=client,
+    ):
+        await hass.config_entries.async_setup(config_entry.entry_id)
+        for _ in range(100):
+            entity_state = hass.states.get(entity_id)
+            if entity_state:
+                break
+            await asyncio.sleep(0)
+        release.set()
+        await hass.async_block_till_done()
+
+    assert entity_state
+    assert entity_state.name == "Cached Motion Detection"
+
+    entity_state = hass.states.get(entity_id)
+    assert entity_state
+    assert entity_state.name == f"{TEST_CAMERA_NAME} Motion Detection"
+
+    # Redacted cameras are never written back to motionEye, web hooks are set
+    # once the cameras are fetched.
+    assert client.async_set_camera.call_count == 1
+
+
+async def test_offline_setup(hass: HomeAssistant, hass_storage: Any) -> None:
+    """Test setup completes while motionEye is unreachable."""
+    hass_storage[STORAGE_KEY.format(TEST_CONFIG_ENTRY_ID)] = {
+        "version": 1,
+        "key": STORAGE_KEY.format(TEST_CONFIG_ENTRY_ID),
+        "data": {KEY_CAMERAS: [redact_camera(TEST_CAMERA)]},
+    }
+    client = create_mock_motioneye_client()
+    client.async_client_login = AsyncMock(side_effect=MotionEyeClientError)
+    config_entry = create_mock_motioneye_config_entry(
+        hass, options={CONF_OFFLINE_SETUP: True}
+    )
+    await setup_mock_motioneye_config_entry(
+        hass, config_entry=config_entry, client=client
+    )
+    assert config_entry.state == ConfigEntryState.LOADED
+    assert not client.async_get_cameras.called
+
+    # Cached entities are unavailable until motionEye responds.
+    entity_state = hass.states.get(TEST_CAMERA_ENTITY_ID)
+    assert entity_state
+    assert entity_state.state == STATE_UNAVAILABLE
+
+    # Login is retried with the next refresh.
+    client.async_client_login = AsyncMock(return_value={})
+    async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    assert client.async_client_login.call_count == 1
+    entity_state = hass.states.get(TEST_CAMERA_ENTITY_ID)
+    assert entity_state
+    assert entity_state.state == "idle"
+
+    # Later refreshes do not log in again, and invalid auth is only a failed
+    # refresh.
+    client.async_get_cameras = AsyncMock(side_effect=MotionEyeClientInvalidAuthError)
+    async_fire_time_changed(hass, dt_util.utcnow() + 2 * DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    assert client.async_client_login.call_count == 1
+    assert not hass.config_entries.flow.async_progress()
+    entity_state = hass.states.get(TEST_CAMERA_ENTITY_ID)
+    assert entity_state
+    assert entity_state.state == STATE_UNAVAILABLE
+
+
+async def test_offline_setup_auth_fail(hass: HomeAssistant) -> None:
+    """Test offline setup with invalid credentials starts a reauth."""
+    client = create_mock_motioneye_client()
+    client.async_client_login = AsyncMock(side_effect=MotionEyeClientInvalidAuthError)
+    config_entry = create_mock_motioneye_config_entry(
+        hass, options={CONF_OFFLINE_SETUP: True}
+    )
+    await setup_mock_motioneye_config_entry(
+        hass, config_entry=config_entry, client=client
+    )
+    assert config_entry.state == ConfigEntryState.LOADED
+    assert not hass.states.get(TEST_CAMERA_ENTITY_ID)
+
+    flows = hass.config_entries.flow.async_progress()
+    assert len(flows) == 1
+    assert flows[0]["context"]["source"] == "reauth"
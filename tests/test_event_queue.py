@@ -0,0 +1,76 @@
+"""Test the motionEye web hook event queue."""
+from unittest.mock import Mock, patch
+
+import pytest
+
+from custom_components.motioneye.const import (
+    EVENT_QUEUE_POLICY_DROP_OLDEST,
+    EVENT_QUEUE_POLICY_REJECT,
+)
+from custom_components.motioneye.event_queue import MotionEyeEventQueue
+from homeassistant.core import HomeAssistant
+
+
+@patch("custom_components.motioneye.event_queue.EVENT_QUEUE_MAX_SIZE", 2)
+async def test_event_queue_policies(hass: HomeAssistant) -> None:
+    """Test a full queue drops the oldest event, or rejects the new one."""
+    event_queue = MotionEyeEventQueue(hass, EVENT_QUEUE_POLICY_DROP_OLDEST)
+    jobs = [Mock() for _ in range(4)]
+
+    assert all(event_queue.async_put(job) for job in jobs[:3])
+    assert event_queue.get_diagnostics() == {
+        "policy": EVENT_QUEUE_POLICY_DROP_OLDEST,
+        "depth": 2,
+        "max_depth": 2,
+        "processed": 0,
+        "dropped": 1,
+        "rejected": 0,
+    }
+
+    event_queue.async_set_policy(EVENT_QUEUE_POLICY_REJECT)
+    assert not event_queue.async_put(jobs[3])
+    await hass.async_block_till_done()
+    assert [job.called for job in jobs] == [False, True, True, False]
+    assert event_queue.get_diagnostics() == {
+        "policy": EVENT_QUEUE_POLICY_REJECT,
+        "depth": 0,
+        "max_depth": 2,
+        "processed": 2,
+        "dropped": 1,
+        "rejected": 1,
+    }
+
+    # A new worker is started once the previous one is done.
+    assert event_queue.async_put(jobs[3])
+    await hass.async_block_till_done()
+    assert jobs[3].called
+    assert event_queue.get_diagnostics()["processed"] == 3
+
+
+async def test_event_queue_error(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test an event failing to be processed does not stop the queue."""
+    event_queue = MotionEyeEventQueue(hass, EVENT_QUEUE_POLICY_DROP_OLDEST)
+    job = Mock()
+    event_queue.async_put(Mock(side_effect=ValueError("Boom")))
+    event_queue.async_put(job)
+    await hass.async_block_till_done()
+
+    assert job.called
+    assert "Error processing motionEye web hook event" in caplog.text
+    assert event_queue.get_diagnostics()["processed"] == 2
+
+
+async def test_event_queue_shutdown(hass: HomeAssistant) -> None:
+    """Test shutting down processes the queued events."""
+    event_queue = MotionEyeEventQueue(hass, EVENT_QUEUE_POLICY_DROP_OLDEST)
+    await event_queue.async_shutdown()
+
+    jobs = [Mock() for _ in range(3)]
+    for job in jobs:
+        event_queue.async_put(job)
+    await event_queue.async_shutdown()
+
+    assert all(job.call_count == 1 for job in jobs)
+    assert event_queue.get_diagnostics()["depth"] == 0
@@ -0,0 +1,256 @@
+"""Test the motionEye web hook provisioner."""
+import asyncio
+import copy
+from datetime import timedelta
+import logging
+from typing import Any
+from unittest.mock import AsyncMock, call
+
+from motioneye_client.client import MotionEyeClientError
+from motioneye_client.const import KEY_NAME, KEY_WEB_HOOK_STORAGE_URL
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.motioneye.breaker import MotionEyeCircuitBreaker
+from custom_components.motioneye.provisioner import (
+    MAX_CONCURRENT_PROVISIONS,
+    PROVISION_MAX_ATTEMPTS,
+    PROVISION_RETRY_BASE_DELAY,
+    STATUS_FAILED,
+    STATUS_PENDING,
+    STATUS_PROVISIONED,
+    MotionEyeWebhookProvisioner,
+)
+from custom_components.motioneye.tasks import MotionEyeTaskTracker
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from . import TEST_CAMERA, TEST_CAMERA_ID, create_mock_motioneye_client
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def test_provisioner_concurrency(hass: HomeAssistant) -> None:
+    """Test cameras are written with bounded concurrency."""
+    client = create_mock_motioneye_client()
+    provisioner = MotionEyeWebhookProvisioner(
+        hass, client, MotionEyeCircuitBreaker(), MotionEyeTaskTracker(hass)
+    )
+    release = asyncio.Event()
+    writing = 0
+    max_writing = 0
+
+    async def set_camera(camera_id: int, camera: dict[str, Any]) -> None:
+        nonlocal writing, max_writing
+        writing += 1
+        max_writing = max(writing, max_writing)
+        await release.wait()
+        writing -= 1
+
+    client.async_set_camera = AsyncMock(side_effect=set_camera)
+    camera_ids = range(MAX_CONCURRENT_PROVISIONS + 2)
+    for camera_id in camera_ids:
+        provisioner.async_queue_camera(camera_id, {"id": camera_id})
+
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert client.async_set_camera.call_count == MAX_CONCURRENT_PROVISIONS
+    assert provisioner.get_diagnostics()[0]["status"] == STATUS_PENDING
+
+    release.set()
+    await hass.async_block_till_done()
+    assert max_writing == MAX_CONCURRENT_PROVISIONS
+    assert client.async_set_camera.call_count == len(camera_ids)
+    assert provisioner.get_diagnostics() == {
+        camera_id: {"status": STATUS_PROVISIONED, "attempts": 1, "last_error": None}
+        for camera_id in camera_ids
+    }
+
+
+async def test_provisioner_retry(hass: HomeAssistant) -> None:
+    """Test failed writes are retried with backoff, and eventually given up."""
+    client = create_mock_motioneye_client()
+    client.async_set_camera = AsyncMock(side_effect=MotionEyeClientError("Boom"))
+    provisioner = MotionEyeWebhookProvisioner(
+        hass, client, MotionEyeCircuitBreaker(), MotionEyeTaskTracker(hass)
+    )
+
+    async def retry(attempts: int) -> None:
+        async_fire_time_changed(
+            hass,
+            dt_util.utcnow()
+            + timedelta(seconds=PROVISION_RETRY_BASE_DELAY * 2 ** (attempts - 1)),
+        )
+        await hass.async_block_till_done()
+
+    provisioner.async_queue_camera(TEST_CAMERA_ID, TEST_CAMERA)
+    await hass.async_block_till_done()
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID] == {
+        "status": STATUS_PENDING,
+        "attempts": 1,
+        "last_error": "Boom",
+    }
+
+    # The camera is only marked provisioned once written.
+    provisioner.async_set_provisioned(TEST_CAMERA_ID)
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID]["status"] == STATUS_PENDING
+
+    # Retries write the latest version of the web hooks over the current
+    # configuration of the camera, a camera queued again keeps its backoff.
+    current_camera = copy.deepcopy(TEST_CAMERA)
+    current_camera[KEY_NAME] = "Renamed"
+    client.async_get_camera = AsyncMock(return_value=current_camera)
+    queued_camera = copy.deepcopy(TEST_CAMERA)
+    queued_camera[KEY_WEB_HOOK_STORAGE_URL] = "http://hass"
+    provisioner.async_queue_camera(TEST_CAMERA_ID, queued_camera)
+    await hass.async_block_till_done()
+    assert client.async_set_camera.call_count == 1
+
+    client.async_set_camera = AsyncMock()
+    await retry(1)
+    assert client.async_get_camera.call_args == call(TEST_CAMERA_ID)
+    assert client.async_set_camera.call_args_list == [
+        call(
+            TEST_CAMERA_ID, {**current_camera, KEY_WEB_HOOK_STORAGE_URL: "http://hass"}
+        )
+    ]
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID] == {
+        "status": STATUS_PROVISIONED,
+        "attempts": 2,
+        "last_error": None,
+    }
+
+    # Writes are given up after the maximum number of attempts.
+    client.async_set_camera = AsyncMock(side_effect=MotionEyeClientError("Boom"))
+    provisioner.async_queue_camera(TEST_CAMERA_ID, TEST_CAMERA)
+    await hass.async_block_till_done()
+    for attempts in range(1, PROVISION_MAX_ATTEMPTS):
+        await retry(attempts)
+    status = provisioner.get_diagnostics()[TEST_CAMERA_ID]
+    assert status["status"] == STATUS_FAILED
+    assert status["attempts"] == PROVISION_MAX_ATTEMPTS
+
+    await retry(PROVISION_MAX_ATTEMPTS)
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID]["attempts"] == (
+        PROVISION_MAX_ATTEMPTS
+    )
+
+    # A camera given up on is not queued again.
+    client.async_set_camera.reset_mock()
+    provisioner.async_queue_camera(TEST_CAMERA_ID, TEST_CAMERA)
+    await hass.async_block_till_done()
+    assert not client.async_set_camera.called
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID]["status"] == STATUS_FAILED
+
+    # Cameras removed meanwhile are not written again.
+    other_camera_id = TEST_CAMERA_ID + 1
+    client.async_get_camera = AsyncMock(return_value=None)
+    provisioner.async_queue_camera(other_camera_id, TEST_CAMERA)
+    await hass.async_block_till_done()
+    client.async_set_camera.reset_mock()
+    await retry(1)
+    assert not client.async_set_camera.called
+    assert provisioner.get_diagnostics()[other_camera_id]["last_error"] == (
+        f"Camera {other_camera_id} not found"
+    )
+
+
+async def test_provisioner_requeue(hass: HomeAssistant) -> None:
+    """Test a camera queued again while pending keeps its attempts and backoff."""
+    client = create_mock_motioneye_client()
+    provisioner = MotionEyeWebhookProvisioner(
+        hass, client, MotionEyeCircuitBreaker(), MotionEyeTaskTracker(hass)
+    )
+    release = asyncio.Event()
+
+    async def set_camera(camera_id: int, camera: dict[str, Any]) -> None:
+        await release.wait()
+        if camera["version"] == 1:
+            raise MotionEyeClientError("Stale")
+
+    # A camera queued again while written is written again straight away.
+    client.async_set_camera = AsyncMock(side_effect=set_camera)
+    provisioner.async_queue_camera(TEST_CAMERA_ID, {"version": 1})
+    await asyncio.sleep(0)
+    provisioner.async_queue_camera(TEST_CAMERA_ID, {"version": 2})
+    release.set()
+    await hass.async_block_till_done()
+
+    assert client.async_set_camera.call_args_list[-1].args == (
+        TEST_CAMERA_ID,
+        {"version": 2},
+    )
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID] == {
+        "status": STATUS_PROVISIONED,
+        "attempts": 2,
+        "last_error": None,
+    }
+
+    # Likewise after a successful write, which restarts the attempts.
+    release.clear()
+    provisioner.async_queue_camera(TEST_CAMERA_ID, {"version": 2})
+    await asyncio.sleep(0)
+    provisioner.async_queue_camera(TEST_CAMERA_ID, {"version": 1})
+    release.set()
+    await hass.async_block_till_done()
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID] == {
+        "status": STATUS_PENDING,
+        "attempts": 2,
+        "last_error": "Stale",
+    }
+
+    # While a retry is scheduled, the retry writes the newer version.
+    client.async_set_camera.reset_mock()
+    client.async_get_camera = AsyncMock(return_value={"version": 2})
+    provisioner.async_queue_camera(
+        TEST_CAMERA_ID, {"version": 2, KEY_WEB_HOOK_STORAGE_URL: "http://hass"}
+    )
+    await hass.async_block_till_done()
+    assert not client.async_set_camera.called
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PROVISION_RETRY_BASE_DELAY * 2)
+    )
+    await hass.async_block_till_done()
+    assert client.async_set_camera.call_args_list == [
+        call(TEST_CAMERA_ID, {"version": 2, KEY_WEB_HOOK_STORAGE_URL: "http://hass"})
+    ]
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID] == {
+        "status": STATUS_PROVISIONED,
+        "attempts": 3,
+        "last_error": None,
+    }
+
+
+async def test_provisioner_shutdown(hass: HomeAssistant) -> None:
+    """Test shutting down cancels retries, leaving writes in flight to drain."""
+    client = create_mock_motioneye_client()
+    task_tracker = MotionEyeTaskTracker(hass)
+    provisioner = MotionEyeWebhookProvisioner(
+        hass, client, MotionEyeCircuitBreaker(), task_tracker
+    )
+    client.async_set_camera = AsyncMock(side_effect=MotionEyeClientError)
+    provisioner.async_queue_camera(TEST_CAMERA_ID, TEST_CAMERA)
+    await hass.async_block_till_done()
+
+    async def set_camera(camera_id: int, camera: dict[str, Any]) -> None:
+        await asyncio.Event().wait()
+
+    client.async_set_camera = AsyncMock(side_effect=set_camera)
+    provisioner.async_queue_camera(TEST_CAMERA_ID + 1, TEST_CAMERA)
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert client.async_set_camera.called
+
+    await provisioner.async_shutdown()
+    assert task_tracker.get_diagnostics() == [
+        f"set web hooks of camera {TEST_CAMERA_ID + 1}"
+    ]
+    assert await task_tracker.async_drain(0) == [
+        f"set web hooks of camera {TEST_CAMERA_ID + 1}"
+    ]
+    client.async_set_camera.reset_mock()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PROVISION_RETRY_BASE_DELAY)
+    )
+    await hass.async_block_till_done()
+    assert not client.async_set_camera.called
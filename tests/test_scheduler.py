@@ -0,0 +1,137 @@
+"""Test the motionEye poll scheduler."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+from unittest.mock import Mock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.motioneye.const import (
+    CONF_COORDINATOR,
+    CONF_POLL_SCHEDULER,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+)
+from custom_components.motioneye.scheduler import (
+    MAX_CONCURRENT_REFRESHES,
+    MotionEyePollScheduler,
+)
+from homeassistant.const import CONF_URL
+from homeassistant.core import HomeAssistant
+
+from . import (
+    TEST_CONFIG_ENTRY_ID,
+    create_mock_motioneye_client,
+    setup_mock_motioneye_config_entry,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def test_scheduler_slots() -> None:
+    """Test slots are spread evenly across the scan interval."""
+    scheduler = MotionEyePollScheduler()
+    coordinator_1 = Mock()
+    coordinator_2 = Mock()
+    reschedule_1 = Mock()
+    reschedule_2 = Mock()
+
+    unsub_1 = scheduler.async_add_coordinator(coordinator_1, reschedule_1)
+    assert scheduler.get_slot_offset(coordinator_1) == 0
+    assert reschedule_1.call_count == 1
+
+    unsub_2 = scheduler.async_add_coordinator(coordinator_2, reschedule_2)
+    assert scheduler.get_slot_offset(coordinator_1) == 0
+    assert scheduler.get_slot_offset(coordinator_2) == 15
+    assert reschedule_1.call_count == 2
+    assert reschedule_2.call_count == 1
+
+    now = datetime(2021, 1, 1, 0, 0, 7, tzinfo=timezone.utc)
+    with patch(
+        "custom_components.motioneye.scheduler.dt_util.utcnow", return_value=now
+    ):
+        # Refreshes land on the latest slot time within the update interval.
+        assert scheduler.get_next_refresh(
+            coordinator_1, DEFAULT_SCAN_INTERVAL
+        ) == datetime(2021, 1, 1, 0, 0, 30, tzinfo=timezone.utc)
+        assert scheduler.get_next_refresh(
+            coordinator_2, DEFAULT_SCAN_INTERVAL
+        ) == datetime(2021, 1, 1, 0, 0, 15, tzinfo=timezone.utc)
+        assert scheduler.get_next_refresh(
+            coordinator_2, timedelta(seconds=60)
+        ) == datetime(2021, 1, 1, 0, 0, 45, tzinfo=timezone.utc)
+
+    # Removing a coordinator re-spreads the remaining slots.
+    unsub_1()
+    assert scheduler.get_slot_offset(coordinator_2) == 0
+    assert reschedule_1.call_count == 2
+    assert reschedule_2.call_count == 2
+    assert scheduler.get_diagnostics(coordinator_1) == {
+        "slot": None,
+        "slots": 1,
+        "slot_offset": 0,
+        "last_refresh_duration": None,
+    }
+    unsub_2()
+
+
+async def test_scheduler_limits_concurrent_refreshes() -> None:
+    """Test the number of concurrent refreshes is capped."""
+    scheduler = MotionEyePollScheduler()
+    coordinators = [Mock() for _ in range(MAX_CONCURRENT_REFRESHES + 1)]
+    for coordinator in coordinators:
+        scheduler.async_add_coordinator(coordinator, Mock())
+
+    release = asyncio.Event()
+    running = 0
+    max_running = 0
+
+    async def refresh(coordinator: Mock) -> None:
+        nonlocal running, max_running
+        async with scheduler.async_limit_refresh(coordinator):
+            running += 1
+            max_running = max(max_running, running)
+            await release.wait()
+            running -= 1
+
+    tasks = [asyncio.create_task(refresh(coordinator)) for coordinator in coordinators]
+    await asyncio.sleep(0)
+    assert running == MAX_CONCURRENT_REFRESHES
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert max_running == MAX_CONCURRENT_REFRESHES
+
+    diagnostics = scheduler.get_diagnostics(coordinators[1])
+    assert diagnostics["slot"] == 1
+    assert diagnostics["slots"] == MAX_CONCURRENT_REFRESHES + 1
+    assert diagnostics["last_refresh_duration"] >= 0
+
+
+async def test_scheduler_shared_across_entries(hass: HomeAssistant) -> None:
+    """Test config entries share the scheduler and get their own slots."""
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+    scheduler = hass.data[DOMAIN][CONF_POLL_SCHEDULER]
+    assert coordinator.scheduler is scheduler
+
+    other_config_entry = MockConfigEntry(
+        entry_id=f"{TEST_CONFIG_ENTRY_ID}-other",
+        domain=DOMAIN,
+        data={CONF_URL: "http://other:8765"},
+    )
+    other_config_entry.add_to_hass(hass)
+    await setup_mock_motioneye_config_entry(
+        hass, config_entry=other_config_entry, client=client
+    )
+    other_coordinator = hass.data[DOMAIN][other_config_entry.entry_id][CONF_COORDINATOR]
+    assert other_coordinator.scheduler is scheduler
+    assert scheduler.get_slot_offset(coordinator) == 0
+    assert scheduler.get_slot_offset(other_coordinator) == 15
+
+    # Unloading an entry gives up its slot.
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert scheduler.get_diagnostics(other_coordinator)["slots"] == 1
+    assert scheduler.get_slot_offset(other_coordinator) == 0
@@ -3,10 +3,16 @@ import copy
 from datetime import timedelta
 from unittest.mock import AsyncMock, patch
 
+from motioneye_client.client import MotionEyeClientConnectionError
 from motioneye_client.const import KEY_ACTIONS
 from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.motioneye import get_motioneye_device_identifier
+from custom_components.motioneye.breaker import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    STATE_CLOSED,
+    STATE_OPEN,
+)
 from custom_components.motioneye.const import (
     DEFAULT_SCAN_INTERVAL,
     TYPE_MOTIONEYE_ACTION_SENSOR,
@@ -26,6 +32,8 @@ from . import (
     setup_mock_motioneye_config_entry,
 )
 
+TEST_SENSOR_STATUS_ENTITY_ID = "sensor.http_test_8766_status"
+
 
 async def test_sensor_actions(hass: HomeAssistant) -> None:
     """Test the actions sensor."""
@@ -58,7 +66,9 @@ async def test_sensor_actions(hass: HomeAssistant) -> None:
     assert entity_state.state == "1"
     assert entity_state.attributes.get(KEY_ACTIONS) == ["one"]
 
+    updated_camera = copy.deepcopy(updated_camera)
     del updated_camera[KEY_ACTIONS]
+    client.async_get_cameras = AsyncMock(return_value={"cameras": [updated_camera]})
     async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
     await hass.async_block_till_done()
 
@@ -129,3 +139,54 @@ async def test_sensor_actions_can_be_enabled(hass: HomeAssistant) -> None:
 
     entity_state = hass.states.get(TEST_SENSOR_ACTION_ENTITY_ID)
     assert entity_state
+
+
+async def test_sensor_status(hass: HomeAssistant) -> None:
+    """Test the status sensor of a motionEye server."""
+    client = create_mock_motioneye_client()
+    await setup_mock_motioneye_config_entry(hass, client=client)
+
+    # The sensor is checked on every refresh.
+    async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+
+    entity_state = hass.states.get(TEST_SENSOR_STATUS_ENTITY_ID)
+    assert entity_state
+    assert entity_state.state == STATE_CLOSED
+    assert entity_state.attributes == {
+        "friendly_name": entity_state.attributes["friendly_name"],
+        "last_update_success": True,
+        "update_interval": 30,
+        "poll_schedule": {"slot": 0, "slots": 1, "slot_offset": 0},
+        "circuit_breaker": {"consecutive_failures": 0, "failed_probes": 0},
+        "requests_in_flight": 0,
+        "webhooks": {"provisioned": 1},
+        "event_queue": {
+            "policy": "drop_oldest",
+            "max_depth": 0,
+            "dropped": 0,
+            "rejected": 0,
+        },
+    }
+
+    # ... but only written when the status changes.
+    with patch(
+        "custom_components.motioneye.sensor.MotionEyeStatusSensor"
+        ".async_write_ha_state"
+    ) as mock_write_ha_state:
+        async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL * 2)
+        await hass.async_block_till_done()
+    assert client.async_get_cameras.call_count == 3
+    assert not mock_write_ha_state.called
+
+    # The sensor stays available, and reports the open circuit, while the server
+    # is unreachable.
+    client.async_get_cameras = AsyncMock(side_effect=MotionEyeClientConnectionError)
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+        await hass.async_block_till_done()
+
+    entity_state = hass.states.get(TEST_SENSOR_STATUS_ENTITY_ID)
+    assert entity_state
+    assert entity_state.state == STATE_OPEN
+    assert not entity_state.attributes["last_update_success"]
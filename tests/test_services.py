@@ -3,6 +3,7 @@ import copy
 import logging
 from unittest.mock import AsyncMock, call
 
+from motioneye_client.client import MotionEyeClientRequestError
 from motioneye_client.const import (
     KEY_TEXT_OVERLAY_CUSTOM_TEXT,
     KEY_TEXT_OVERLAY_CUSTOM_TEXT_RIGHT,
@@ -13,8 +14,13 @@ from motioneye_client.const import (
 import pytest
 import voluptuous as vol
 
+from custom_components.motioneye.breaker import (
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    STATE_CLOSED,
+)
 from custom_components.motioneye.const import (
     CONF_ACTION,
+    CONF_COORDINATOR,
     DOMAIN,
     SERVICE_ACTION,
     SERVICE_SET_TEXT_OVERLAY,
@@ -192,6 +198,14 @@ async def test_action(hass: HomeAssistant) -> None:
     await hass.async_block_till_done()
     assert client.async_action.call_args == call(TEST_CAMERA_ID, data[CONF_ACTION])
 
+    # Actions rejected by motionEye do not open the circuit of the server.
+    client.async_action = AsyncMock(side_effect=MotionEyeClientRequestError)
+    coordinator = hass.data[DOMAIN][TEST_CONFIG_ENTRY_ID][CONF_COORDINATOR]
+    for _ in range(CIRCUIT_BREAKER_FAILURE_THRESHOLD):
+        with pytest.raises(MotionEyeClientRequestError):
+            await hass.services.async_call(DOMAIN, SERVICE_ACTION, data, blocking=True)
+    assert coordinator.circuit_breaker.state == STATE_CLOSED
+
 
 async def test_snapshot(hass: HomeAssistant) -> None:
     """Test snapshot."""
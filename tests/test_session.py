@@ -0,0 +1,49 @@
+"""Test the motionEye shared client session."""
+import logging
+from unittest.mock import patch
+
+from custom_components.motioneye import create_motioneye_client
+from custom_components.motioneye.const import CONF_CLIENT_SESSION, DOMAIN
+from custom_components.motioneye.session import (
+    CONNECTION_LIMIT_PER_HOST,
+    KEEPALIVE_TIMEOUT,
+    get_client_session,
+)
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import HomeAssistant
+
+from . import setup_mock_motioneye_config_entry
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def test_client_session_shared(hass: HomeAssistant) -> None:
+    """Test every client is given the same tuned session."""
+    with patch(
+        "custom_components.motioneye.create_motioneye_client",
+        wraps=create_motioneye_client,
+    ) as mock_create_client:
+        await setup_mock_motioneye_config_entry(hass)
+
+    session = hass.data[DOMAIN][CONF_CLIENT_SESSION]
+    assert mock_create_client.call_args.kwargs["session"] is session
+    assert get_client_session(hass) is session
+    assert session.connector.limit_per_host == CONNECTION_LIMIT_PER_HOST
+    assert session.connector._keepalive_timeout == KEEPALIVE_TIMEOUT
+
+
+async def test_client_session_closed(hass: HomeAssistant) -> None:
+    """Test the session is closed when Home Assistant stops."""
+    session = get_client_session(hass)
+    assert not session.closed
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_CLOSE)
+    await hass.async_block_till_done()
+    assert session.closed
+
+
+async def test_client_session_kept_by_setup(hass: HomeAssistant) -> None:
+    """Test setting up the integration keeps a session created beforehand."""
+    # E.g. by a config flow, which runs before the integration is set up.
+    session = get_client_session(hass)
+    await setup_mock_motioneye_config_entry(hass)
+    assert get_client_session(hass) is session
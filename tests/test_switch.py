@@ -1,8 +1,11 @@
 """Tests for the motionEye switch platform."""
+import asyncio
 import copy
-from unittest.mock import AsyncMock, call
+from typing import Any
+from unittest.mock import AsyncMock, call, patch
 
 from motioneye_client.const import (
+    KEY_CAMERAS,
     KEY_MOTION_DETECTION,
     KEY_MOVIES,
     KEY_STILL_IMAGES,
@@ -14,6 +17,7 @@ from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.motioneye import get_motioneye_device_identifier
 from custom_components.motioneye.const import DEFAULT_SCAN_INTERVAL
+from custom_components.motioneye.switch import MotionEyeSwitch
 from homeassistant.components.switch import DOMAIN as SWITCH_DOMAIN
 from homeassistant.const import ATTR_ENTITY_ID, SERVICE_TURN_OFF, SERVICE_TURN_ON
 from homeassistant.core import HomeAssistant
@@ -23,6 +27,7 @@ import homeassistant.util.dt as dt_util
 from . import (
     TEST_CAMERA,
     TEST_CAMERA_ID,
+    TEST_CAMERAS,
     TEST_SWITCH_ENTITY_ID_BASE,
     TEST_SWITCH_MOTION_DETECTION_ENTITY_ID,
     create_mock_motioneye_client,
@@ -40,7 +45,7 @@ async def test_switch_turn_on_off(hass: HomeAssistant) -> None:
     assert entity_state
     assert entity_state.state == "on"
 
-    client.async_get_camera = AsyncMock(return_value=TEST_CAMERA)
+    client.async_get_camera = AsyncMock(return_value=copy.deepcopy(TEST_CAMERA))
 
     expected_camera = copy.deepcopy(TEST_CAMERA)
     expected_camera[KEY_MOTION_DETECTION] = False
@@ -90,6 +95,31 @@ async def test_switch_turn_on_off(hass: HomeAssistant) -> None:
     assert entity_state.state == "on"
 
 
+async def test_switch_only_writes_relevant_changes(hass: HomeAssistant) -> None:
+    """Test switches only write state when their own key changes."""
+    client = create_mock_motioneye_client()
+    await setup_mock_motioneye_config_entry(hass, client=client)
+
+    async def refresh_and_get_written_entity_ids(cameras: dict) -> set[str]:
+        client.async_get_cameras = AsyncMock(return_value=cameras)
+        with patch.object(
+            MotionEyeSwitch, "async_write_ha_state", autospec=True
+        ) as mock_write:
+            async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+            await hass.async_block_till_done()
+        return {mock_call.args[0].entity_id for mock_call in mock_write.mock_calls}
+
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    cameras[KEY_CAMERAS][0]["disk_used"] += 1
+    assert not await refresh_and_get_written_entity_ids(cameras)
+
+    cameras = copy.deepcopy(cameras)
+    cameras[KEY_CAMERAS][0][KEY_MOTION_DETECTION] = False
+    assert await refresh_and_get_written_entity_ids(cameras) == {
+        TEST_SWITCH_MOTION_DETECTION_ENTITY_ID
+    }
+
+
 async def test_switch_has_correct_entities(hass: HomeAssistant) -> None:
     """Test that the correct switch entities are created."""
     client = create_mock_motioneye_client()
@@ -128,3 +158,60 @@ async def test_switch_device_info(hass: HomeAssistant) -> None:
         for entry in er.async_entries_for_device(entity_registry, device.id)
     ]
     assert TEST_SWITCH_MOTION_DETECTION_ENTITY_ID in entities_from_device
+
+
+async def test_switch_camera_not_found(hass: HomeAssistant) -> None:
+    """Test a switch is not written if its camera cannot be fetched."""
+    client = create_mock_motioneye_client()
+    await setup_mock_motioneye_config_entry(hass, client=client)
+    client.async_get_camera = AsyncMock(return_value=None)
+    client.async_set_camera.reset_mock()
+
+    await hass.services.async_call(
+        SWITCH_DOMAIN,
+        SERVICE_TURN_OFF,
+        {ATTR_ENTITY_ID: TEST_SWITCH_MOTION_DETECTION_ENTITY_ID},
+        blocking=True,
+    )
+    assert client.async_get_camera.called
+    assert not client.async_set_camera.called
+
+
+async def test_switch_write_drained_on_unload(hass: HomeAssistant) -> None:
+    """Test a switch write in flight is finished before the client is closed."""
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    client.async_get_camera = AsyncMock(return_value=copy.deepcopy(TEST_CAMERA))
+
+    release = asyncio.Event()
+    client_closed_before_write = None
+
+    async def set_camera(camera_id: int, camera: dict[str, Any]) -> None:
+        nonlocal client_closed_before_write
+        await release.wait()
+        client_closed_before_write = client.async_client_close.called
+
+    client.async_set_camera = AsyncMock(side_effect=set_camera)
+    hass.async_create_task(
+        hass.services.async_call(
+            SWITCH_DOMAIN,
+            SERVICE_TURN_OFF,
+            {ATTR_ENTITY_ID: TEST_SWITCH_MOTION_DETECTION_ENTITY_ID},
+            blocking=True,
+        )
+    )
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert client.async_set_camera.called
+
+    unload = hass.async_create_task(
+        hass.config_entries.async_unload(config_entry.entry_id)
+    )
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert not unload.done()
+
+    release.set()
+    assert await unload
+    assert client_closed_before_write is False
+    assert client.async_client_close.called
@@ -0,0 +1,54 @@
+"""Test the motionEye task tracker."""
+import asyncio
+import logging
+
+import pytest
+
+from custom_components.motioneye.tasks import MotionEyeTaskTracker
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def test_task_tracker_run(hass: HomeAssistant) -> None:
+    """Test tracked tasks outlive the cancellation of their caller."""
+    task_tracker = MotionEyeTaskTracker(hass)
+    assert await task_tracker.async_run(asyncio.sleep(0, "result"), "sleep") == (
+        "result"
+    )
+    assert task_tracker.get_diagnostics() == []
+
+    release = asyncio.Event()
+
+    async def write() -> str:
+        await release.wait()
+        return "written"
+
+    caller = asyncio.create_task(task_tracker.async_run(write(), "write"))
+    await asyncio.sleep(0)
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert task_tracker.get_diagnostics() == ["write"]
+
+    release.set()
+    assert await task_tracker.async_drain() == []
+    assert task_tracker.get_diagnostics() == []
+
+
+async def test_task_tracker_drain(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test draining cancels and reports the tasks still running."""
+    task_tracker = MotionEyeTaskTracker(hass)
+    assert await task_tracker.async_drain() == []
+
+    never = asyncio.Event()
+    caller = asyncio.create_task(task_tracker.async_run(never.wait(), "stuck"))
+    await asyncio.sleep(0)
+
+    assert await task_tracker.async_drain(0.01) == ["stuck"]
+    assert "still running after 0.01 seconds: stuck" in caplog.text
+    assert task_tracker.get_diagnostics() == []
+    with pytest.raises(asyncio.CancelledError):
+        await caller
@@ -1,13 +1,20 @@
 """Test the motionEye camera web hooks."""
+from collections.abc import AsyncIterator
 import copy
+from datetime import timedelta
+from http import HTTPStatus
+import json
 import logging
 from typing import Any
 from unittest.mock import AsyncMock, Mock, call, patch
 
+from aiohttp import hdrs
+from motioneye_client.client import MotionEyeClientRequestError
 from motioneye_client.const import (
     KEY_CAMERAS,
     KEY_HTTP_METHOD_POST_JSON,
     KEY_ROOT_DIRECTORY,
+    KEY_WEB_HOOK_CS_CAMERA_ID,
     KEY_WEB_HOOK_NOTIFICATIONS_ENABLED,
     KEY_WEB_HOOK_NOTIFICATIONS_HTTP_METHOD,
     KEY_WEB_HOOK_NOTIFICATIONS_URL,
@@ -20,21 +27,40 @@ from pytest_homeassistant_custom_component.common import (
     async_fire_time_changed,
 )
 
+from custom_components.motioneye import WEBHOOK_MAX_BODY_SIZE
 from custom_components.motioneye.const import (
+    ATTR_COALESCED_EVENTS,
     ATTR_EVENT_TYPE,
+    CONF_COORDINATOR,
+    CONF_EVENT_COALESCER,
+    CONF_EVENT_QUEUE,
+    CONF_EVENT_QUEUE_POLICY,
+    CONF_MOTION_EVENT_WINDOW,
+    CONF_WEBHOOK_FILE_STORED_KEYS,
+    CONF_WEBHOOK_MOTION_DETECTED_KEYS,
+    CONF_WEBHOOK_PROVISIONER,
     CONF_WEBHOOK_SET_OVERWRITE,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
     EVENT_FILE_STORED,
     EVENT_MOTION_DETECTED,
+    EVENT_QUEUE_POLICY_REJECT,
+)
+from custom_components.motioneye.provisioner import (
+    PROVISION_MAX_ATTEMPTS,
+    STATUS_FAILED,
+    STATUS_UNMANAGED,
+)
+from custom_components.motioneye.routing import (
+    MotionEyeWebhookRoute,
+    get_webhook_routes,
 )
 from homeassistant.components.webhook import URL_WEBHOOK_PATH
 from homeassistant.const import (
     ATTR_DEVICE_ID,
     CONF_URL,
     CONF_WEBHOOK_ID,
-    HTTP_BAD_REQUEST,
-    HTTP_OK,
+    CONTENT_TYPE_JSON,
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import device_registry as dr
@@ -120,8 +146,10 @@ async def test_setup_camera_with_wrong_webhook(
         client=client,
     )
     assert not client.async_set_camera.called
+    provisioner = hass.data[DOMAIN][config_entry.entry_id][CONF_WEBHOOK_PROVISIONER]
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID]["status"] == STATUS_UNMANAGED
 
-    # Update the options, which will trigger a reload with the new behavior.
+    # Update the options, which are applied to the cameras straight away.
     with patch(
         "custom_components.motioneye.MotionEyeClient",
         return_value=client,
@@ -210,6 +238,41 @@ async def test_setup_camera_with_old_webhook(
     assert client.async_set_camera.call_args == call(TEST_CAMERA_ID, expected_camera)
 
 
+async def test_setup_camera_with_minimal_webhook(hass: HomeAssistant) -> None:
+    """Test web hooks only request the configured values."""
+    client = create_mock_motioneye_client()
+    config_entry = create_mock_motioneye_config_entry(
+        hass,
+        options={
+            CONF_WEBHOOK_MOTION_DETECTED_KEYS: [KEY_WEB_HOOK_CS_CAMERA_ID],
+            CONF_WEBHOOK_FILE_STORED_KEYS: [],
+        },
+    )
+    await setup_mock_motioneye_config_entry(
+        hass, config_entry=config_entry, client=client
+    )
+
+    device_registry = await dr.async_get_registry(hass)
+    device = device_registry.async_get_device(
+        identifiers={TEST_CAMERA_DEVICE_IDENTIFIER}
+    )
+    assert device
+
+    camera = client.async_set_camera.call_args[0][1]
+    assert camera[KEY_WEB_HOOK_NOTIFICATIONS_URL] == (
+        "https://example.com"
+        + URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID])
+        + "?camera_id=%t&src=hass-motioneye&event_type=motion_detected"
+        + f"&device_id={device.id}"
+    )
+    assert camera[KEY_WEB_HOOK_STORAGE_URL] == (
+        "https://example.com"
+        + URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID])
+        + "?file_path=%f&file_type=%n&src=hass-motioneye&event_type=file_stored"
+        + f"&device_id={device.id}"
+    )
+
+
 async def test_setup_camera_with_correct_webhook(
     hass: HomeAssistant,
 ) -> None:
@@ -287,7 +350,7 @@ async def test_good_query(hass: HomeAssistant, aiohttp_client: Any) -> None:
                 ATTR_EVENT_TYPE: event,
             },
         )
-        assert resp.status == HTTP_OK
+        assert resp.status == HTTPStatus.OK
 
         assert len(events) == 1
         assert events[0].data == {
@@ -299,6 +362,36 @@ async def test_good_query(hass: HomeAssistant, aiohttp_client: Any) -> None:
         }
 
 
+async def test_event_refreshes_camera(hass: HomeAssistant, aiohttp_client: Any) -> None:
+    """Test a file stored event marks the camera for a refresh."""
+    await async_setup_component(hass, "http", {"http": {}})
+
+    device_registry = await dr.async_get_registry(hass)
+    config_entry = await setup_mock_motioneye_config_entry(hass)
+    coordinator = hass.data[DOMAIN][config_entry.entry_id][CONF_COORDINATOR]
+
+    device = device_registry.async_get_device(
+        identifiers={TEST_CAMERA_DEVICE_IDENTIFIER}
+    )
+    assert device
+
+    client = await aiohttp_client(hass.http.app)
+
+    with patch.object(coordinator, "async_mark_camera_dirty") as mock_mark_dirty:
+        for event_type in (EVENT_MOTION_DETECTED, EVENT_FILE_STORED):
+            resp = await client.post(
+                URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID]),
+                json={
+                    ATTR_DEVICE_ID: device.id,
+                    ATTR_EVENT_TYPE: event_type,
+                },
+            )
+            assert resp.status == HTTPStatus.OK
+        await hass.async_block_till_done()
+    # Only stored files change what is polled.
+    assert mock_mark_dirty.call_args_list == [call(TEST_CAMERA_ID)]
+
+
 async def test_bad_query_missing_parameters(
     hass: HomeAssistant, aiohttp_client: Any
 ) -> None:
@@ -311,7 +404,7 @@ async def test_bad_query_missing_parameters(
     resp = await client.post(
         URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID]), json={}
     )
-    assert resp.status == HTTP_BAD_REQUEST
+    assert resp.status == HTTPStatus.BAD_REQUEST
 
 
 async def test_bad_query_no_such_device(
@@ -330,7 +423,7 @@ async def test_bad_query_no_such_device(
             ATTR_DEVICE_ID: "not-a-real-device",
         },
     )
-    assert resp.status == HTTP_BAD_REQUEST
+    assert resp.status == HTTPStatus.BAD_REQUEST
 
 
 async def test_bad_query_cannot_decode(
@@ -345,13 +438,73 @@ async def test_bad_query_cannot_decode(
     motion_events = async_capture_events(hass, f"{DOMAIN}.{EVENT_MOTION_DETECTED}")
     storage_events = async_capture_events(hass, f"{DOMAIN}.{EVENT_FILE_STORED}")
 
+    for body in (b"this is not json", b"\xff", b'["not", "an", "object"]'):
+        resp = await client.post(
+            URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID]),
+            data=body,
+            headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON},
+        )
+        assert resp.status == HTTPStatus.BAD_REQUEST
+    assert not motion_events
+    assert not storage_events
+
+
+async def test_bad_query_content_type(hass: HomeAssistant, aiohttp_client: Any) -> None:
+    """Test a query that is not JSON is rejected without being read."""
+    await async_setup_component(hass, "http", {"http": {}})
+    config_entry = await setup_mock_motioneye_config_entry(hass)
+
+    client = await aiohttp_client(hass.http.app)
+
     resp = await client.post(
         URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID]),
-        data=b"this is not json",
+        data={ATTR_EVENT_TYPE: EVENT_MOTION_DETECTED},
     )
-    assert resp.status == HTTP_BAD_REQUEST
+    assert resp.status == HTTPStatus.UNSUPPORTED_MEDIA_TYPE
+
+
+async def test_bad_query_too_large(hass: HomeAssistant, aiohttp_client: Any) -> None:
+    """Test a query larger than the maximum size is rejected."""
+    await async_setup_component(hass, "http", {"http": {}})
+    config_entry = await setup_mock_motioneye_config_entry(hass)
+    device_registry = await dr.async_get_registry(hass)
+    device = device_registry.async_get_device(
+        identifiers={TEST_CAMERA_DEVICE_IDENTIFIER}
+    )
+    assert device
+
+    client = await aiohttp_client(hass.http.app)
+    motion_events = async_capture_events(hass, f"{DOMAIN}.{EVENT_MOTION_DETECTED}")
+    data = {
+        ATTR_DEVICE_ID: device.id,
+        ATTR_EVENT_TYPE: EVENT_MOTION_DETECTED,
+        "padding": "x" * WEBHOOK_MAX_BODY_SIZE,
+    }
+
+    async def chunked_body() -> AsyncIterator[bytes]:
+        body = json.dumps(data).encode()
+        for index in range(0, len(body), 1024):
+            yield body[index : index + 1024]
+
+    # Rejected on the declared length, and on the length read when undeclared.
+    for body in (json.dumps(data).encode(), chunked_body()):
+        resp = await client.post(
+            URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID]),
+            data=body,
+            headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON},
+        )
+        assert resp.status == HTTPStatus.REQUEST_ENTITY_TOO_LARGE
     assert not motion_events
-    assert not storage_events
+
+    # Bodies within the limit are read whole, even in chunks.
+    data["padding"] = "x" * (WEBHOOK_MAX_BODY_SIZE - 1024)
+    resp = await client.post(
+        URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID]),
+        data=chunked_body(),
+        headers={hdrs.CONTENT_TYPE: CONTENT_TYPE_JSON},
+    )
+    assert resp.status == HTTPStatus.OK
+    assert len(motion_events) == 1
 
 
 async def test_event_media_data(hass: HomeAssistant, aiohttp_client: Any) -> None:
@@ -385,7 +538,7 @@ async def test_event_media_data(hass: HomeAssistant, aiohttp_client: Any) -> Non
             "file_type": "8",
         },
     )
-    assert resp.status == HTTP_OK
+    assert resp.status == HTTPStatus.OK
     assert len(events) == 1
     assert events[-1].data["file_url"] == "http://movie-url"
     assert (
@@ -405,7 +558,7 @@ async def test_event_media_data(hass: HomeAssistant, aiohttp_client: Any) -> Non
             "file_type": "4",
         },
     )
-    assert resp.status == HTTP_OK
+    assert resp.status == HTTPStatus.OK
     assert len(events) == 2
     assert events[-1].data["file_url"] == "http://image-url"
     assert (
@@ -424,7 +577,7 @@ async def test_event_media_data(hass: HomeAssistant, aiohttp_client: Any) -> Non
             "file_type": "NOT_AN_INT",
         },
     )
-    assert resp.status == HTTP_OK
+    assert resp.status == HTTPStatus.OK
     assert len(events) == 3
     assert "file_url" not in events[-1].data
     assert "media_content_id" not in events[-1].data
@@ -439,7 +592,7 @@ async def test_event_media_data(hass: HomeAssistant, aiohttp_client: Any) -> Non
             "file_type": "8",
         },
     )
-    assert resp.status == HTTP_OK
+    assert resp.status == HTTPStatus.OK
     assert len(events) == 4
     assert "file_url" not in events[-1].data
     assert "media_content_id" not in events[-1].data
@@ -457,7 +610,7 @@ async def test_event_media_data(hass: HomeAssistant, aiohttp_client: Any) -> Non
             "file_type": "8",
         },
     )
-    assert resp.status == HTTP_OK
+    assert resp.status == HTTPStatus.OK
     assert len(events) == 5
     assert "file_url" not in events[-1].data
     assert "media_content_id" not in events[-1].data
@@ -478,7 +631,7 @@ async def test_event_media_data(hass: HomeAssistant, aiohttp_client: Any) -> Non
             "file_type": "8",
         },
     )
-    assert resp.status == HTTP_OK
+    assert resp.status == HTTPStatus.OK
     assert len(events) == 6
     assert "file_url" not in events[-1].data
     assert "media_content_id" not in events[-1].data
@@ -496,7 +649,209 @@ async def test_event_media_data(hass: HomeAssistant, aiohttp_client: Any) -> Non
             "file_type": "8",
         },
     )
-    assert resp.status == HTTP_OK
+    assert resp.status == HTTPStatus.OK
     assert len(events) == 7
     assert "file_url" not in events[-1].data
     assert "media_content_id" not in events[-1].data
+
+
+async def test_webhook_drift(hass: HomeAssistant) -> None:
+    """Verify that web hooks changed in motionEye are set again."""
+    client = create_mock_motioneye_client()
+    cameras = copy.deepcopy(TEST_CAMERAS)
+    client.async_get_cameras = AsyncMock(return_value=cameras)
+    await setup_mock_motioneye_config_entry(hass, client=client)
+    assert client.async_set_camera.call_count == 1
+    expected_camera = copy.deepcopy(client.async_set_camera.call_args[0][1])
+
+    # Cameras with unchanged web hooks are not set again.
+    async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    assert client.async_set_camera.call_count == 1
+
+    cameras = copy.deepcopy(expected_camera)
+    cameras[KEY_WEB_HOOK_NOTIFICATIONS_URL] = "http://edited-url?src=hass-motioneye"
+    client.async_get_cameras = AsyncMock(return_value={KEY_CAMERAS: [cameras]})
+    async_fire_time_changed(hass, dt_util.utcnow() + 2 * DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    assert client.async_set_camera.call_count == 2
+    assert client.async_set_camera.call_args == call(TEST_CAMERA_ID, expected_camera)
+
+    # Web hooks edited to point elsewhere are respected without the overwrite
+    # option, and not checked again until changed.
+    cameras = copy.deepcopy(expected_camera)
+    cameras[KEY_WEB_HOOK_NOTIFICATIONS_URL] = "http://other-url"
+    client.async_get_cameras = AsyncMock(return_value={KEY_CAMERAS: [cameras]})
+    for interval in (3, 4):
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + interval * DEFAULT_SCAN_INTERVAL
+        )
+        await hass.async_block_till_done()
+    assert client.async_set_camera.call_count == 2
+
+
+async def test_webhook_write_failures(hass: HomeAssistant) -> None:
+    """Verify that polls leave failing web hook writes to their backoff."""
+    client = create_mock_motioneye_client()
+    client.async_set_camera = AsyncMock(side_effect=MotionEyeClientRequestError)
+    # motionEye keeps reporting the old web hooks while the writes fail.
+    client.async_get_cameras = AsyncMock(
+        side_effect=lambda: copy.deepcopy(TEST_CAMERAS)
+    )
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    provisioner = hass.data[DOMAIN][config_entry.entry_id][CONF_WEBHOOK_PROVISIONER]
+    assert client.async_set_camera.call_count == 1
+
+    for interval in range(1, 21):
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + interval * DEFAULT_SCAN_INTERVAL
+        )
+        await hass.async_block_till_done()
+    assert client.async_set_camera.call_count == PROVISION_MAX_ATTEMPTS
+    assert provisioner.get_diagnostics()[TEST_CAMERA_ID] == {
+        "status": STATUS_FAILED,
+        "attempts": PROVISION_MAX_ATTEMPTS,
+        "last_error": "",
+    }
+
+
+async def test_webhook_routes(hass: HomeAssistant) -> None:
+    """Test web hook routes follow the cameras of loaded config entries."""
+    device_registry = await dr.async_get_registry(hass)
+    client = create_mock_motioneye_client()
+    config_entry = await setup_mock_motioneye_config_entry(hass, client=client)
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    device = device_registry.async_get_device(
+        identifiers={TEST_CAMERA_DEVICE_IDENTIFIER}
+    )
+    assert device
+
+    routes = get_webhook_routes(hass)
+    assert routes == {
+        device.id: MotionEyeWebhookRoute(
+            config_entry_id=TEST_CONFIG_ENTRY_ID,
+            device_name=TEST_CAMERA_NAME,
+            client=client,
+            coordinator=entry_data[CONF_COORDINATOR],
+            coalescer=entry_data[CONF_EVENT_COALESCER],
+            event_queue=entry_data[CONF_EVENT_QUEUE],
+            camera_id=TEST_CAMERA_ID,
+            root_directory=TEST_CAMERA[KEY_ROOT_DIRECTORY],
+        )
+    }
+
+    # Routes are rebuilt from refreshed cameras and renamed devices.
+    camera = copy.deepcopy(TEST_CAMERA)
+    camera[KEY_ROOT_DIRECTORY] = "/var/lib/other"
+    client.async_get_cameras = AsyncMock(return_value={KEY_CAMERAS: [camera]})
+    async_fire_time_changed(hass, dt_util.utcnow() + DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    assert routes[device.id].root_directory == "/var/lib/other"
+
+    device_registry.async_update_device(device.id, name="Renamed")
+    await hass.async_block_till_done()
+    assert routes[device.id].device_name == "Renamed"
+
+    # Routes of other entries are left alone.
+    other_route = routes[device.id]._replace(config_entry_id="other")
+    routes["other_device"] = other_route
+    device_registry.async_remove_device(device.id)
+    await hass.async_block_till_done()
+    assert routes == {"other_device": other_route}
+
+    # Removed devices are not routed again.
+    client.async_get_cameras = AsyncMock(return_value={KEY_CAMERAS: [TEST_CAMERA]})
+    async_fire_time_changed(hass, dt_util.utcnow() + 2 * DEFAULT_SCAN_INTERVAL)
+    await hass.async_block_till_done()
+    assert routes == {"other_device": other_route}
+
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert routes == {"other_device": other_route}
+
+
+async def test_motion_events_coalesced(
+    hass: HomeAssistant, aiohttp_client: Any
+) -> None:
+    """Test motion detected events are coalesced per camera when configured."""
+    await async_setup_component(hass, "http", {"http": {}})
+    config_entry = create_mock_motioneye_config_entry(
+        hass, options={CONF_MOTION_EVENT_WINDOW: 10}
+    )
+    await setup_mock_motioneye_config_entry(hass, config_entry=config_entry)
+    device_registry = await dr.async_get_registry(hass)
+    device = device_registry.async_get_device(
+        identifiers={TEST_CAMERA_DEVICE_IDENTIFIER}
+    )
+    assert device
+
+    client = await aiohttp_client(hass.http.app)
+    motion_events = async_capture_events(hass, f"{DOMAIN}.{EVENT_MOTION_DETECTED}")
+    storage_events = async_capture_events(hass, f"{DOMAIN}.{EVENT_FILE_STORED}")
+
+    async def post_events(*events: str) -> None:
+        for event in events:
+            resp = await client.post(
+                URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID]),
+                json={ATTR_DEVICE_ID: device.id, ATTR_EVENT_TYPE: event},
+            )
+            assert resp.status == HTTPStatus.OK
+        await hass.async_block_till_done()
+
+    await post_events(*(EVENT_MOTION_DETECTED,) * 3, *(EVENT_FILE_STORED,) * 2)
+    assert len(motion_events) == 1
+    assert len(storage_events) == 2
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+    await hass.async_block_till_done()
+    assert len(motion_events) == 2
+    assert motion_events[-1].data[ATTR_COALESCED_EVENTS] == 2
+
+    # The window is changed without reloading the entry.
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MOTION_EVENT_WINDOW: 0}
+    )
+    await hass.async_block_till_done()
+    await post_events(EVENT_MOTION_DETECTED, EVENT_MOTION_DETECTED)
+    assert len(motion_events) == 4
+
+    # Summaries still pending are fired on unload.
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_MOTION_EVENT_WINDOW: 10}
+    )
+    await hass.async_block_till_done()
+    await post_events(EVENT_MOTION_DETECTED, EVENT_MOTION_DETECTED)
+    assert len(motion_events) == 5
+    await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert len(motion_events) == 6
+
+
+async def test_event_queue_full(hass: HomeAssistant, aiohttp_client: Any) -> None:
+    """Test events are rejected once the event queue is full, if configured."""
+    await async_setup_component(hass, "http", {"http": {}})
+    config_entry = await setup_mock_motioneye_config_entry(hass)
+    event_queue = hass.data[DOMAIN][config_entry.entry_id][CONF_EVENT_QUEUE]
+    device_registry = await dr.async_get_registry(hass)
+    device = device_registry.async_get_device(
+        identifiers={TEST_CAMERA_DEVICE_IDENTIFIER}
+    )
+    assert device
+
+    # The policy is changed without reloading the entry.
+    hass.config_entries.async_update_entry(
+        config_entry, options={CONF_EVENT_QUEUE_POLICY: EVENT_QUEUE_POLICY_REJECT}
+    )
+    await hass.async_block_till_done()
+
+    client = await aiohttp_client(hass.http.app)
+    events = async_capture_events(hass, f"{DOMAIN}.{EVENT_MOTION_DETECTED}")
+    with patch("custom_components.motioneye.event_queue.EVENT_QUEUE_MAX_SIZE", 0):
+        resp = await client.post(
+            URL_WEBHOOK_PATH.format(webhook_id=config_entry.data[CONF_WEBHOOK_ID]),
+            json={ATTR_DEVICE_ID: device.id, ATTR_EVENT_TYPE: EVENT_MOTION_DETECTED},
+        )
+        await hass.async_block_till_done()
+    assert resp.status == HTTPStatus.SERVICE_UNAVAILABLE
+    assert not events
+    assert event_queue.get_diagnostics()["rejected"] == 1